@@ -0,0 +1,33 @@
+"""add_user_data_versions
+
+Revision ID: 4f7b2c9e8d36
+Revises: 9a4d6e2b7c15
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "4f7b2c9e8d36"
+down_revision = "9a4d6e2b7c15"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # No backfill: a missing row is version 0 and the first write creates it
+    op.create_table(
+        "user_data_versions",
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("version", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_data_versions")
@@ -0,0 +1,29 @@
+"""add_category_catalog_versions
+
+Revision ID: 9a4d6e2b7c15
+Revises: e7c3a9d5b182
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "9a4d6e2b7c15"
+down_revision = "e7c3a9d5b182"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "category_catalog_versions",
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("version", sa.BigInteger(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("category_catalog_versions")
@@ -0,0 +1,97 @@
+"""partition_transactions_by_month
+
+Revision ID: a8c3e5f1b720
+Revises: f5b2d8e4a613
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from datetime import date, datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a8c3e5f1b720"
+down_revision = "f5b2d8e4a613"
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+INDEXES = [
+    ("ix_transactions_user_id_date_id", "user_id, date DESC, id DESC"),
+    ("ix_transactions_user_id_category_id_date", "user_id, category_id, date"),
+    ("ix_transactions_user_id_type_date", "user_id, type, date"),
+]
+
+
+def _next_month(month: date) -> date:
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1, day=1)
+    return month.replace(month=month.month + 1, day=1)
+
+
+def _rebuild(partitioned: bool) -> None:
+    """Copy transactions into a new table, partitioned by month or plain."""
+    op.execute("ALTER TABLE transactions RENAME TO transactions_old")
+    op.execute("ALTER TABLE transactions_old RENAME CONSTRAINT transactions_pkey TO transactions_old_pkey")
+    for name, _ in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    partition_clause = " PARTITION BY RANGE (date)" if partitioned else ""
+    op.execute(
+        "CREATE TABLE transactions (LIKE transactions_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        + partition_clause
+    )
+    primary_key = "id, date" if partitioned else "id"
+    op.execute(f"ALTER TABLE transactions ADD CONSTRAINT transactions_pkey PRIMARY KEY ({primary_key})")
+    op.execute(
+        "ALTER TABLE transactions ADD CONSTRAINT transactions_user_id_fkey "
+        "FOREIGN KEY (user_id) REFERENCES users (id)"
+    )
+    op.execute(
+        "ALTER TABLE transactions ADD CONSTRAINT transactions_category_id_fkey "
+        "FOREIGN KEY (category_id) REFERENCES categories (id)"
+    )
+
+    if partitioned:
+        # One partition per UTC month from the oldest transaction to a few
+        # months ahead; anything else lands in the DEFAULT partition
+        oldest = op.get_bind().execute(
+            sa.text("SELECT min(date AT TIME ZONE 'UTC') FROM transactions_old")
+        ).scalar()
+        current = datetime.now(timezone.utc).date().replace(day=1)
+        month = oldest.date().replace(day=1) if oldest is not None else current
+        last = current
+        for _ in range(MONTHS_AHEAD):
+            last = _next_month(last)
+        while month <= last:
+            upper = _next_month(month)
+            op.execute(
+                f"CREATE TABLE transactions_p{month:%Y_%m} PARTITION OF transactions "
+                f"FOR VALUES FROM ('{month:%Y-%m-%d} 00:00:00+00') TO ('{upper:%Y-%m-%d} 00:00:00+00')"
+            )
+            month = upper
+        op.execute("CREATE TABLE transactions_default PARTITION OF transactions DEFAULT")
+
+    op.execute("INSERT INTO transactions SELECT * FROM transactions_old")
+    op.execute("DROP TABLE transactions_old")
+
+    # Indexes on a partitioned table are created on every partition
+    # (CONCURRENTLY isn't supported on the partitioned parent)
+    for name, columns in INDEXES:
+        op.execute(f"CREATE INDEX {name} ON transactions ({columns})")
+
+
+def upgrade() -> None:
+    # SQLite (tests) keeps a plain table
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    _rebuild(partitioned=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    _rebuild(partitioned=False)
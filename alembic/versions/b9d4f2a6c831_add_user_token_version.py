@@ -0,0 +1,32 @@
+"""add_user_token_version
+
+Revision ID: b9d4f2a6c831
+Revises: a8c3e5f1b720
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b9d4f2a6c831"
+down_revision = "a8c3e5f1b720"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column(
+            "token_version",
+            sa.Integer(),
+            server_default="0",
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "token_version")
@@ -0,0 +1,33 @@
+"""add_users_token_version_updated_at
+
+Revision ID: c2e8f4a6b913
+Revises: 4f7b2c9e8d36
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c2e8f4a6b913"
+down_revision = "4f7b2c9e8d36"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("token_version_updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        op.f("ix_users_token_version_updated_at"), "users", ["token_version_updated_at"], unique=False
+    )
+    # Revocations made before the column existed are picked up by the first refresh
+    op.execute("UPDATE users SET token_version_updated_at = now() WHERE token_version > 0")
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_users_token_version_updated_at"), table_name="users")
+    op.drop_column("users", "token_version_updated_at")
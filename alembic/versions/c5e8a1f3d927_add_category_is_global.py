@@ -0,0 +1,50 @@
+"""add_category_is_global
+
+Revision ID: c5e8a1f3d927
+Revises: b9d4f2a6c831
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c5e8a1f3d927"
+down_revision = "b9d4f2a6c831"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "categories",
+        sa.Column(
+            "is_global",
+            sa.Boolean(),
+            server_default=sa.false(),
+            nullable=False,
+        ),
+    )
+
+    # Until now a category linked to no user was global (the seeded defaults)
+    categories = sa.table("categories", sa.column("id"), sa.column("is_global", sa.Boolean()))
+    user_categories = sa.table("user_categories", sa.column("category_id"))
+    op.execute(
+        categories.update()
+        .where(~sa.exists().where(user_categories.c.category_id == categories.c.id))
+        .values(is_global=True)
+    )
+
+    op.create_index(
+        "ix_categories_global_id",
+        "categories",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("is_global = true"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_categories_global_id", table_name="categories")
+    op.drop_column("categories", "is_global")
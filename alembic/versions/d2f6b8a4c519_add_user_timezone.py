@@ -0,0 +1,33 @@
+"""add_user_timezone
+
+Revision ID: d2f6b8a4c519
+Revises: c5e8a1f3d927
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d2f6b8a4c519"
+down_revision = "c5e8a1f3d927"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing users stay on UTC, which is what their daily rollups were built with
+    op.add_column(
+        "users",
+        sa.Column("timezone", sa.String(), server_default="UTC", nullable=False),
+    )
+    op.add_column(
+        "users",
+        sa.Column("week_start", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "week_start")
+    op.drop_column("users", "timezone")
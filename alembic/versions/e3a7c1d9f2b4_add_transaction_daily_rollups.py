@@ -0,0 +1,66 @@
+"""add_transaction_daily_rollups
+
+Revision ID: e3a7c1d9f2b4
+Revises: d481217ccf7a
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "e3a7c1d9f2b4"
+down_revision = "d481217ccf7a"
+branch_labels = None
+depends_on = None
+
+UNCATEGORIZED_ID = "ffffffff-ffff-ffff-ffff-ffffffffffff"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "transaction_daily_rollups",
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("category_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("type", sa.String(), nullable=False),
+        sa.Column("sum", sa.Numeric(14, 2), server_default="0", nullable=False),
+        sa.Column("count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("max_updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "day", "category_id", "type"),
+    )
+
+    # Backfill from existing transactions (days are UTC calendar dates)
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        day_expr = "(date AT TIME ZONE 'UTC')::date"
+        uncategorized = f"'{UNCATEGORIZED_ID}'::uuid"
+    else:
+        day_expr = "date(date)"
+        uncategorized = f"'{UNCATEGORIZED_ID.replace('-', '')}'"
+
+    op.execute(
+        sa.text(
+            f"""
+            INSERT INTO transaction_daily_rollups
+                (user_id, day, category_id, type, sum, count, max_updated_at)
+            SELECT
+                user_id,
+                {day_expr},
+                COALESCE(category_id, {uncategorized}),
+                type,
+                SUM(amount),
+                COUNT(*),
+                MAX(COALESCE(updated_at, created_at))
+            FROM transactions
+            GROUP BY user_id, {day_expr}, COALESCE(category_id, {uncategorized}), type
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("transaction_daily_rollups")
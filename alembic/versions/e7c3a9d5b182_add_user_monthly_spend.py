@@ -0,0 +1,58 @@
+"""add_user_monthly_spend
+
+Revision ID: e7c3a9d5b182
+Revises: d2f6b8a4c519
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "e7c3a9d5b182"
+down_revision = "d2f6b8a4c519"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_monthly_spend",
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("expense", sa.Numeric(14, 2), server_default="0", nullable=False),
+        sa.Column("count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "month"),
+    )
+
+    # Backfill from the daily rollups (already on each user's local days)
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        month_expr = "date_trunc('month', day)::date"
+    else:
+        month_expr = "date(day, 'start of month')"
+
+    op.execute(
+        sa.text(
+            f"""
+            INSERT INTO user_monthly_spend (user_id, month, expense, count, updated_at)
+            SELECT
+                user_id,
+                {month_expr},
+                SUM(sum),
+                SUM(count),
+                MAX(max_updated_at)
+            FROM transaction_daily_rollups
+            WHERE type = 'expense'
+            GROUP BY user_id, {month_expr}
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_monthly_spend")
@@ -0,0 +1,63 @@
+"""add_transaction_access_path_indexes
+
+Revision ID: f5b2d8e4a613
+Revises: e3a7c1d9f2b4
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "f5b2d8e4a613"
+down_revision = "e3a7c1d9f2b4"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_transactions_user_id_date_id", ["user_id", sa.text("date DESC"), sa.text("id DESC")]),
+    ("ix_transactions_user_id_category_id_date", ["user_id", "category_id", "date"]),
+    ("ix_transactions_user_id_type_date", ["user_id", "type", "date"]),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block; building
+    # the indexes concurrently keeps the table writable on Postgres
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(
+                name,
+                "transactions",
+                columns,
+                unique=False,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+        # Duplicates the primary key index
+        op.drop_index(
+            "ix_transactions_id",
+            table_name="transactions",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_transactions_id",
+            "transactions",
+            ["id"],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+        for name, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name="transactions",
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
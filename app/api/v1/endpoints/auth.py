@@ -1,29 +1,73 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
+from typing import Optional
 from app.core.database import get_db
 from app.core.security import (
     create_access_token,
     create_refresh_token,
     decode_access_token,
     decode_refresh_token,
+    get_token_data,
     is_expired,
 )
+from app.core.cache import principal_cache
 from app.core.config import settings
-from app.crud import user as crud_user
+from app.core.rate_limit import parse_rate_limit, rate_limiter, retry_after_header
+from app.core.token_versions import token_versions
+from app.crud.aio import user as crud_user
 from app.schemas.token import Token, TokenRefreshRequest
-from app.schemas.user import User
+from app.schemas.user import Principal, User
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
+def get_client_ip(request: Request) -> str:
+    """Client address used for per-IP limits"""
+    return request.client.host if request.client else "unknown"
+
+
+async def enforce_rate_limit(scope: str, identity: str, limit: str) -> None:
+    """Reject the attempt with 429 when identity has spent its budget in scope"""
+    retry_after = await rate_limiter.hit(scope, identity, parse_rate_limit(limit))
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many attempts, please try again later",
+            headers={"Retry-After": retry_after_header(retry_after)},
+        )
+
+
+async def _get_cached_user(db: AsyncSession, username: str) -> Optional[User]:
+    """Load a user by token subject through the principal cache."""
+    # Read the version before loading, so a concurrent update invalidates what we cache
+    version = await principal_cache.get_version_async(username)
+    user = principal_cache.get(username, version)
+    if user is not None:
+        return user
+    
+    db_user = await crud_user.get_user_by_username(db, username=username)
+    if db_user is None:
+        return None
+    
+    user = User.model_validate(db_user)
+    principal_cache.set(username, user, version)
+    return user
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user"""
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
+    """
+    Get current authenticated user.
+
+    The principal is built from the access token claims; the database is only
+    read to refresh the revoked token versions in bulk (see
+    app.core.token_versions) or for tokens issued without claims.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -38,20 +82,65 @@ async def get_current_user(
     if username is None:
         raise credentials_exception
     
-    db_user = crud_user.get_user_by_username(db, username=username)
-    if db_user is None:
+    if "uid" not in payload:
+        # Token issued before claims were added
+        user = await _get_cached_user(db, username)
+        if user is None:
+            raise credentials_exception
+        return Principal.model_validate(user)
+    
+    token_version = payload.get("tv")
+    if not isinstance(token_version, int):
+        raise credentials_exception
+    try:
+        principal = Principal(
+            id=payload["uid"],
+            username=username,
+            role=payload.get("role"),
+            is_active=payload.get("act", True),
+            is_superuser=payload.get("su", False),
+        )
+    except ValueError:
         raise credentials_exception
     
-    return User.model_validate(db_user)
+    await token_versions.refresh_if_stale(db)
+    if not token_versions.is_current(principal.id, token_version):
+        raise credentials_exception
+    return principal
+
+
+async def get_current_user_profile(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """
+    Get the current user's full profile (e.g. timezone preferences).
+
+    Read through the principal cache, so it usually costs no query.
+    """
+    user = await _get_cached_user(db, current_user.username)
+    if user is None or user.id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
 
 
 @router.post("/login", response_model=Token)
 async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Login endpoint"""
-    user = crud_user.authenticate_user(db, form_data.username, form_data.password)
+    # Throttle before spending a bcrypt round on the attempt
+    await enforce_rate_limit("login:ip", get_client_ip(request), settings.LOGIN_RATE_LIMIT_PER_IP)
+    await enforce_rate_limit(
+        "login:username", form_data.username.strip().lower(), settings.LOGIN_RATE_LIMIT_PER_USERNAME
+    )
+    user = await crud_user.authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -62,11 +151,12 @@ async def login(
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     refresh_token_expires = timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
 
+    token_data = get_token_data(user)
     access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data=token_data, expires_delta=access_token_expires
     )
     refresh_token = create_refresh_token(
-        data={"sub": user.username}, expires_delta=refresh_token_expires
+        data=token_data, expires_delta=refresh_token_expires
     )
     return {
         "access_token": access_token,
@@ -76,7 +166,7 @@ async def login(
 
 
 @router.get("/me", response_model=User)
-async def read_users_me(current_user: User = Depends(get_current_user)):
+async def read_users_me(current_user: User = Depends(get_current_user_profile)):
     """Get current user information"""
     return current_user
 
@@ -84,7 +174,7 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
 @router.post("/refresh", response_model=Token)
 async def refresh_token(
     token_request: TokenRefreshRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Issue a new access/refresh token pair using a valid refresh token"""
     payload = decode_refresh_token(token_request.refresh_token)
@@ -110,7 +200,7 @@ async def refresh_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = crud_user.get_user_by_username(db, username=username)
+    user = await crud_user.get_user_by_username(db, username=username)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -118,14 +208,22 @@ async def refresh_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    if payload.get("tv", 0) < (user.token_version or 0):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     refresh_token_expires = timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES)
 
+    token_data = get_token_data(user)
     new_access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data=token_data, expires_delta=access_token_expires
     )
     new_refresh_token = create_refresh_token(
-        data={"sub": user.username}, expires_delta=refresh_token_expires
+        data=token_data, expires_delta=refresh_token_expires
     )
 
     return {
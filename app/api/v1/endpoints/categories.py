@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from uuid import UUID
 from app.core.database import get_db
-from app.crud import category as crud_category
+from app.core.pagination import InvalidCursorError
+from app.crud.aio import category as crud_category
 from app.schemas.category import (
     Category, 
     CategoryCreate, 
@@ -11,31 +12,31 @@ from app.schemas.category import (
     PaginatedCategories
 )
 from app.api.v1.endpoints.auth import get_current_user
-from app.schemas.user import User
+from app.schemas.user import Principal
 from app.models.enums import CategoryType
 
 router = APIRouter()
 
 
 @router.post("/", response_model=Category, status_code=status.HTTP_201_CREATED)
-def create_category(
+async def create_category(
     category: CategoryCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Create a new category"""
-    return crud_category.create_category(
+    return await crud_category.create_category(
         db=db, category=category, user_id=current_user.id
     )
 
 
 @router.get("/", response_model=PaginatedCategories)
-def read_categories(
+async def read_categories(
     limit: int = Query(20, ge=1, le=100, description="Number of items per page"),
-    cursor: Optional[UUID] = Query(None, description="UUID7 cursor from previous page"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor (next_cursor) from previous page"),
     type: Optional[CategoryType] = Query(None, description="Filter by category type"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get categories (global and user-specific) with cursor-based pagination.
@@ -43,13 +44,19 @@ def read_categories(
     - First page: Don't provide cursor
     - Next page: Use next_cursor from previous response
     """
-    items, next_cursor, has_next = crud_category.get_categories_cursor(
-        db=db,
-        user_id=current_user.id,
-        type=type,
-        limit=limit,
-        cursor=cursor
-    )
+    try:
+        items, next_cursor, has_next = await crud_category.get_categories_cursor(
+            db=db,
+            user_id=current_user.id,
+            type=type,
+            limit=limit,
+            cursor=cursor
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
     
     return PaginatedCategories(
         items=items,
@@ -60,13 +67,13 @@ def read_categories(
 
 
 @router.get("/{category_id}", response_model=Category)
-def read_category(
+async def read_category(
     category_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get category by ID"""
-    db_category = crud_category.get_category(
+    db_category = await crud_category.get_category(
         db, category_id=category_id, user_id=current_user.id
     )
     if db_category is None:
@@ -78,14 +85,14 @@ def read_category(
 
 
 @router.put("/{category_id}", response_model=Category)
-def update_category(
+async def update_category(
     category_id: UUID,
     category_update: CategoryUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Update a category"""
-    db_category = crud_category.update_category(
+    db_category = await crud_category.update_category(
         db, category_id=category_id, category_update=category_update, user_id=current_user.id
     )
     if db_category is None:
@@ -97,13 +104,13 @@ def update_category(
 
 
 @router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_category(
+async def delete_category(
     category_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Delete a category"""
-    success = crud_category.delete_category(
+    success = await crud_category.delete_category(
         db, category_id=category_id, user_id=current_user.id
     )
     if not success:
@@ -1,10 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import Optional
-from datetime import datetime
+import csv
+import io
+import json
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import date, datetime
 from uuid import UUID
+from app.core.config import settings
+from app.core.cache import summary_cache, seconds_until_next_day
+from app.core.category_catalog import category_catalog
 from app.core.database import get_db
-from app.crud import transaction as crud_transaction
+from app.core.date_utils import get_zone
+from app.core.export import EXPORT_FORMATS, iter_csv, iter_ndjson
+from app.core.http_cache import make_weak_etag, etag_matches, not_modified, set_etag
+from app.core.pagination import InvalidCursorError
+from app.crud.aio import transaction as crud_transaction
 from app.schemas.transaction import (
     Transaction, 
     TransactionCreate, 
@@ -12,29 +24,35 @@ from app.schemas.transaction import (
     PaginatedTransactions,
     TransactionGroupedResponse,
     TransactionPeriodSummary,
+    TransactionSeries,
+    TransactionImportResult,
+    TransactionBatchRequest,
+    TransactionBatchResponse,
 )
-from app.api.v1.endpoints.auth import get_current_user
-from app.schemas.user import User
+from app.api.v1.endpoints.auth import get_current_user, get_current_user_profile
+from app.schemas.user import Principal, User
 
 router = APIRouter()
 
 
 @router.post("/", response_model=Transaction, status_code=status.HTTP_201_CREATED)
-def create_transaction(
+async def create_transaction(
     transaction: TransactionCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Create a new transaction"""
-    return crud_transaction.create_transaction(
+    return await crud_transaction.create_transaction(
         db=db, transaction=transaction, user_id=current_user.id
     )
 
 
 @router.get("/", response_model=PaginatedTransactions)
-def read_transactions(
+async def read_transactions(
+    request: Request,
+    response: Response,
     limit: int = Query(20, ge=1, le=100, description="Number of items per page"),
-    cursor: Optional[UUID] = Query(None, description="UUID7 cursor from previous page"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor (next_cursor) from previous page"),
     start_date: Optional[datetime] = Query(
         None, 
         description="Filter by start date (will be normalized to start of day: 00:00:00)"
@@ -49,8 +67,8 @@ def read_transactions(
         description="Filter by transaction type: 'income' or 'expense'"
     ),
     category_id: Optional[UUID] = Query(None, description="Filter by category ID"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get transactions for current user with cursor-based pagination.
@@ -58,18 +76,18 @@ def read_transactions(
     **Cursor pagination works correctly with all filters including date ranges:**
     - Date filters are applied BEFORE cursor filter
     - Composite ordering (date DESC, id DESC) ensures consistent pagination
-    - UUID7 is time-ordered, maintaining correct order within date range
+    - The cursor encodes the (date, id) of the last item, so back-dated entries are never skipped or repeated
     
     **Filters:**
-    - `start_date`: Filter from this date (normalized to start of day)
-    - `end_date`: Filter until this date (normalized to end of day)
+    - `start_date`: Filter from this date (normalized to start of day, in the user's `timezone`)
+    - `end_date`: Filter until this date (normalized to end of day, in the user's `timezone`)
     - `type`: Filter by 'income' or 'expense'
     - `category_id`: Filter by category UUID
     - `user_id`: Automatically filtered by current user
     
     **Pagination:**
     - First page: Don't provide cursor
-    - Next page: Use `next_cursor` from previous response
+    - Next page: Use `next_cursor` from previous response (opaque, signed token)
     - Check `has_next` to know if more pages exist
     
     **Examples:**
@@ -77,19 +95,43 @@ def read_transactions(
     - Get transactions for a date range: `GET /transactions/?start_date=2024-01-01&end_date=2024-01-31`
     - Get income transactions: `GET /transactions/?type=income`
     - Get next page: `GET /transactions/?limit=20&cursor=<next_cursor_from_previous_response>`
+    
+    **Conditional requests:** responses carry a weak `ETag`; send it back in
+    `If-None-Match` to get `304 Not Modified` while the data is unchanged.
     """
-    items, next_cursor, has_next = crud_transaction.get_transactions_cursor(
-        db=db,
-        user_id=current_user.id,
-        limit=limit,
-        cursor=cursor,
-        start_date=start_date,
-        end_date=end_date,
-        type=type,
-        category_id=category_id,
-        normalize_dates=True,  # Automatically normalize dates to start/end of day
-        load_category=True  # Eager load category relationship
+    etag = make_weak_etag(
+        "transactions",
+        current_user.id,
+        await crud_transaction.get_data_version(db, current_user.id),
+        await category_catalog.version_tag_async(db, current_user.id),
+        limit,
+        cursor,
+        start_date,
+        end_date,
+        type,
+        category_id,
     )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    try:
+        items, next_cursor, has_next = await crud_transaction.get_transaction_list_cursor(
+            db=db,
+            user_id=current_user.id,
+            limit=limit,
+            cursor=cursor,
+            start_date=start_date,
+            end_date=end_date,
+            type=type,
+            category_id=category_id,
+            normalize_dates=True,  # Automatically normalize dates to start/end of day
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
     
     return PaginatedTransactions(
         items=items,
@@ -99,8 +141,138 @@ def read_transactions(
     )
 
 
-@router.get("/summary", response_model=TransactionGroupedResponse)
-def read_transaction_summary(
+IMPORT_FIELDS = ["amount", "name", "type", "description", "date", "category_id"]
+
+
+def _parse_import_rows(content_type: str, body: bytes) -> List[dict]:
+    """Parse an import payload (JSON array or CSV with a header row) into raw rows."""
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ValueError("Import data must be UTF-8 encoded")
+
+    if "json" in content_type:
+        try:
+            rows = json.loads(text)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid JSON: {exc.msg}")
+        if not isinstance(rows, list):
+            raise ValueError("JSON import data must be an array of transactions")
+        return rows
+
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames:
+        return []
+    rows = []
+    for record in reader:
+        # Empty cells mean "not provided" so optional fields fall back to their defaults
+        rows.append({
+            field: value
+            for field, value in record.items()
+            if field in IMPORT_FIELDS and value not in (None, "")
+        })
+    return rows
+
+
+@router.post("/import", response_model=TransactionImportResult)
+async def import_transactions(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    Bulk import transactions from CSV or a JSON array in a single request.
+
+    Accepted bodies:
+    - `application/json`: array of `TransactionCreate` objects
+    - `text/csv`: header row with `amount,name,type,description,date,category_id`
+    - `multipart/form-data`: a CSV or JSON file in the `file` field
+
+    Rows are parsed and validated in a worker thread, then inserted with
+    multi-row INSERTs in one DB transaction. Invalid rows are skipped and reported in `errors` with their
+    1-based row number.
+    """
+    content_type = request.headers.get("content-type", "").lower()
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Missing 'file' field in multipart upload",
+            )
+        content_type = (upload.content_type or "").lower()
+        if (upload.filename or "").lower().endswith(".json"):
+            content_type = "application/json"
+        body = await upload.read()
+    else:
+        body = await request.body()
+
+    try:
+        # Decoding/parsing a large payload is CPU-bound: keep it off the event loop
+        rows = await run_in_threadpool(_parse_import_rows, content_type, body)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+
+    if len(rows) > settings.IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many rows ({len(rows)}); at most {settings.IMPORT_MAX_ROWS} per import",
+        )
+
+    return await crud_transaction.import_transactions(
+        db=db,
+        rows=rows,
+        user_id=current_user.id,
+    )
+
+
+@router.post("/batch", response_model=TransactionBatchResponse)
+async def batch_transactions(
+    batch: TransactionBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    """
+    Apply a list of create/update/delete operations in one DB transaction.
+
+    Each operation is `{"op": "create", "data": {...}}`,
+    `{"op": "update", "id": ..., "data": {...}}` or `{"op": "delete", "id": ...}`.
+    Operations run in order; `results` has one entry per operation with the
+    transaction id and a status (`created`, `updated`, `deleted` or `not_found`).
+    An invalid operation rejects the whole batch.
+    """
+    if len(batch.operations) > settings.BATCH_MAX_OPERATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Too many operations ({len(batch.operations)}); "
+                f"at most {settings.BATCH_MAX_OPERATIONS} per batch"
+            ),
+        )
+
+    try:
+        results = await crud_transaction.apply_transaction_batch(
+            db=db, operations=batch.operations, user_id=current_user.id
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+    return TransactionBatchResponse(results=results)
+
+
+@router.get("/export")
+async def export_transactions(
+    format: str = Query(
+        "csv",
+        regex="^(csv|ndjson)$",
+        description="Export format: 'csv' or 'ndjson'",
+    ),
     start_date: Optional[datetime] = Query(
         None,
         description="Filter by start date (normalized to start of day: 00:00:00)",
@@ -115,18 +287,18 @@ def read_transaction_summary(
         description="Filter by transaction type: 'income' or 'expense'",
     ),
     category_id: Optional[UUID] = Query(None, description="Filter by category ID"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     """
-    Get transactions grouped by timeframe (today, yesterday, this week, this month, this year).
+    Export all of the current user's transactions as a streamed CSV or NDJSON file.
 
-    Each timeframe contains days, categories, and totals:
-    - `total`: Sum of transaction amounts in the scope
-    - `lasted_update_at`: Latest update timestamp among the transactions in the scope
-    - `days`: Day buckets with category totals and transaction lists
+    Accepts the same filters as `GET /transactions/` (dates are the user's
+    days, in their `timezone`). Rows are streamed from a
+    server-side cursor (newest first), so memory use is constant no matter
+    how many transactions are exported.
     """
-    return crud_transaction.get_grouped_transactions(
+    batches = crud_transaction.iter_transactions_for_export(
         db=db,
         user_id=current_user.id,
         start_date=start_date,
@@ -134,23 +306,255 @@ def read_transaction_summary(
         type=type,
         category_id=category_id,
     )
+    encoder = iter_csv if format == "csv" else iter_ndjson
+    return StreamingResponse(
+        encoder(batches, crud_transaction.EXPORT_COLUMNS),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{format}"'},
+    )
+
+
+@router.get("/summary", response_model=TransactionGroupedResponse)
+async def read_transaction_summary(
+    request: Request,
+    response: Response,
+    start_date: Optional[datetime] = Query(
+        None,
+        description="Filter by start date (normalized to start of day: 00:00:00)",
+    ),
+    end_date: Optional[datetime] = Query(
+        None,
+        description="Filter by end date (normalized to end of day: 23:59:59)",
+    ),
+    type: Optional[str] = Query(
+        None,
+        regex="^(income|expense)$",
+        description="Filter by transaction type: 'income' or 'expense'",
+    ),
+    category_id: Optional[UUID] = Query(None, description="Filter by category ID"),
+    include_breakdown: bool = Query(
+        False,
+        description="Also return the nested timeframe/day/category groups (slower)",
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_profile),
+):
+    """
+    Get totals for transactions in the current year's timeframes
+    (today, yesterday, this week, this month, this year), in the user's
+    `timezone`, with weeks starting on their `week_start`.
+
+    - `total`: Sum of transaction amounts in the scope
+    - `lasted_update_at`: Latest update timestamp among the transactions in the scope
+    - `timeframes`: Only with `include_breakdown=true`; each timeframe contains
+      day buckets with category totals and transaction lists
+    - `budget`: This month's spend against the user's `limit_amount`
+
+    Supports `If-None-Match` with the weak `ETag` of a previous response.
+    """
+    now = datetime.now(get_zone(current_user.timezone))
+    # Part of the cache key too: summary_cache versions may be per worker
+    data_version = await crud_transaction.get_data_version(db, current_user.id)
+    catalog_version = await category_catalog.version_tag_async(db, current_user.id)
+    etag = make_weak_etag(
+        "grouped_summary",
+        current_user.id,
+        data_version,
+        catalog_version,
+        now.date(),
+        current_user.timezone,
+        current_user.week_start,
+        current_user.limit_amount,
+        start_date,
+        end_date,
+        type,
+        category_id,
+        include_breakdown,
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    return await summary_cache.get_or_compute_async(
+        user_id=current_user.id,
+        name="grouped_summary",
+        params={
+            "day": now.date(),
+            "data_version": data_version,
+            "timezone": current_user.timezone,
+            "week_start": current_user.week_start,
+            "limit_amount": current_user.limit_amount,
+            "catalog": catalog_version,
+            "start_date": start_date,
+            "end_date": end_date,
+            "type": type,
+            "category_id": category_id,
+            "include_breakdown": include_breakdown,
+        },
+        model=TransactionGroupedResponse,
+        compute=lambda: crud_transaction.get_grouped_transactions(
+            db=db,
+            user_id=current_user.id,
+            start_date=start_date,
+            end_date=end_date,
+            type=type,
+            category_id=category_id,
+            include_breakdown=include_breakdown,
+            timezone=current_user.timezone,
+            week_start=current_user.week_start,
+            limit_amount=current_user.limit_amount,
+        ),
+        ttl=seconds_until_next_day(now),
+    )
 
 
 @router.get("/summary/timeframes/{timeframe}", response_model=TransactionPeriodSummary)
-def read_transaction_period_summary(
+async def read_transaction_period_summary(
     timeframe: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_profile),
 ):
     """
     Get totals and category breakdown for a timeframe keyword:
-    today, yesterday, this_week, this_month, this_year.
+    today, yesterday, this_week, this_month, this_year (in the user's
+    `timezone`, weeks starting on their `week_start`), plus this month's
+    `budget` status.
+
+    Supports `If-None-Match` with the weak `ETag` of a previous response.
     """
+    now = datetime.now(get_zone(current_user.timezone))
+    # Part of the cache key too: summary_cache versions may be per worker
+    data_version = await crud_transaction.get_data_version(db, current_user.id)
+    catalog_version = await category_catalog.version_tag_async(db, current_user.id)
+    etag = make_weak_etag(
+        "period_summary",
+        current_user.id,
+        data_version,
+        catalog_version,
+        now.date(),
+        current_user.timezone,
+        current_user.week_start,
+        current_user.limit_amount,
+        timeframe.lower(),
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
     try:
-        return crud_transaction.get_transaction_period_summary(
-            db=db,
+        return await summary_cache.get_or_compute_async(
+            user_id=current_user.id,
+            name="period_summary",
+            params={
+                "day": now.date(),
+                "data_version": data_version,
+                "timezone": current_user.timezone,
+                "week_start": current_user.week_start,
+                "limit_amount": current_user.limit_amount,
+                "catalog": catalog_version,
+                "timeframe": timeframe.lower(),
+            },
+            model=TransactionPeriodSummary,
+            compute=lambda: crud_transaction.get_transaction_period_summary(
+                db=db,
+                user_id=current_user.id,
+                timeframe=timeframe,
+                now=now,
+                timezone=current_user.timezone,
+                week_start=current_user.week_start,
+                limit_amount=current_user.limit_amount,
+            ),
+            ttl=seconds_until_next_day(now),
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+
+
+@router.get("/series", response_model=TransactionSeries)
+async def read_transaction_series(
+    request: Request,
+    response: Response,
+    granularity: str = Query(
+        "day",
+        regex="^(day|week|month)$",
+        description="Bucket size: 'day', 'week' (starting on the user's week_start) or 'month'",
+    ),
+    start: Optional[date] = Query(None, description="First day (default: 30 days / 12 weeks / 12 months back)"),
+    end: Optional[date] = Query(None, description="Last day (default: today)"),
+    type: Optional[str] = Query(
+        None,
+        regex="^(income|expense)$",
+        description="Filter by transaction type: 'income' or 'expense'",
+    ),
+    category_id: Optional[UUID] = Query(None, description="Filter by category ID"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_profile),
+):
+    """
+    Get income/expense totals per day, week or month, for charts.
+
+    Every bucket in the range is returned, oldest first, with zeros for
+    buckets without transactions. Days are calendar days in the user's
+    `timezone`.
+
+    Example: `GET /transactions/series?granularity=month&start=2024-01-01&end=2024-12-31`
+
+    Supports `If-None-Match` with the weak `ETag` of a previous response.
+    """
+    now = datetime.now(get_zone(current_user.timezone))
+    # Part of the cache key too: summary_cache versions may be per worker
+    data_version = await crud_transaction.get_data_version(db, current_user.id)
+    etag = make_weak_etag(
+        "series",
+        current_user.id,
+        data_version,
+        now.date(),
+        current_user.timezone,
+        current_user.week_start,
+        granularity,
+        start,
+        end,
+        type,
+        category_id,
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    try:
+        return await summary_cache.get_or_compute_async(
             user_id=current_user.id,
-            timeframe=timeframe,
+            name="series",
+            params={
+                "day": now.date(),
+                "data_version": data_version,
+                "timezone": current_user.timezone,
+                "week_start": current_user.week_start,
+                "granularity": granularity,
+                "start": start,
+                "end": end,
+                "type": type,
+                "category_id": category_id,
+            },
+            model=TransactionSeries,
+            compute=lambda: crud_transaction.get_transaction_series(
+                db=db,
+                user_id=current_user.id,
+                granularity=granularity,
+                start_date=start,
+                end_date=end,
+                type=type,
+                category_id=category_id,
+                today=now.date(),
+                timezone=current_user.timezone,
+                week_start=current_user.week_start,
+            ),
+            ttl=seconds_until_next_day(now),
         )
     except ValueError as exc:
         raise HTTPException(
@@ -160,13 +564,13 @@ def read_transaction_period_summary(
 
 
 @router.get("/{transaction_id}", response_model=Transaction)
-def read_transaction(
+async def read_transaction(
     transaction_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get transaction by ID"""
-    db_transaction = crud_transaction.get_transaction(
+    db_transaction = await crud_transaction.get_transaction(
         db, transaction_id=transaction_id, user_id=current_user.id
     )
     if db_transaction is None:
@@ -178,14 +582,14 @@ def read_transaction(
 
 
 @router.put("/{transaction_id}", response_model=Transaction)
-def update_transaction(
+async def update_transaction(
     transaction_id: UUID,
     transaction_update: TransactionUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Update a transaction"""
-    db_transaction = crud_transaction.update_transaction(
+    db_transaction = await crud_transaction.update_transaction(
         db, transaction_id=transaction_id, transaction_update=transaction_update, user_id=current_user.id
     )
     if db_transaction is None:
@@ -197,13 +601,13 @@ def update_transaction(
 
 
 @router.delete("/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_transaction(
+async def delete_transaction(
     transaction_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Delete a transaction"""
-    success = crud_transaction.delete_transaction(
+    success = await crud_transaction.delete_transaction(
         db, transaction_id=transaction_id, user_id=current_user.id
     )
     if not success:
@@ -1,55 +1,83 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from uuid import UUID
+from app.core.config import settings
 from app.core.database import get_db
-from app.crud import user as crud_user
-from app.schemas.user import User, UserCreate, UserUpdate
-from app.api.v1.endpoints.auth import get_current_user
+from app.crud.aio import transaction as crud_transaction, user as crud_user
+from app.schemas.budget import BudgetStatus
+from app.schemas.user import Principal, User, UserCreate, UserUpdate
+from app.api.v1.endpoints.auth import (
+    enforce_rate_limit,
+    get_client_ip,
+    get_current_user,
+    get_current_user_profile,
+)
 
 router = APIRouter()
 
 
 @router.post("/", response_model=User, status_code=status.HTTP_201_CREATED)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
+async def create_user(user: UserCreate, request: Request, db: AsyncSession = Depends(get_db)):
     """Create a new user"""
-    db_user = crud_user.get_user_by_email(db, email=user.email)
+    await enforce_rate_limit("register:ip", get_client_ip(request), settings.REGISTER_RATE_LIMIT_PER_IP)
+    
+    db_user = await crud_user.get_user_by_email(db, email=user.email)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    db_user = crud_user.get_user_by_username(db, username=user.username)
+    db_user = await crud_user.get_user_by_username(db, username=user.username)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already taken"
         )
     
-    return crud_user.create_user(db=db, user=user)
+    return await crud_user.create_user(db=db, user=user)
 
 
 @router.get("/", response_model=List[User])
-def read_users(
+async def read_users(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get all users (requires authentication)"""
-    users = crud_user.get_users(db, skip=skip, limit=limit)
+    users = await crud_user.get_users(db, skip=skip, limit=limit)
     return users
 
 
+@router.get("/me/budget", response_model=BudgetStatus)
+async def read_my_budget(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user_profile),
+):
+    """
+    Get this month's spend against the current user's `limit_amount`.
+
+    The month is the user's (in their `timezone`). `thresholds_reached` lists
+    the alert thresholds (80% and 100% of the limit) already reached.
+    """
+    return await crud_transaction.get_budget_status(
+        db,
+        user_id=current_user.id,
+        limit_amount=current_user.limit_amount,
+        timezone=current_user.timezone,
+    )
+
+
 @router.get("/{user_id}", response_model=User)
-def read_user(
+async def read_user(
     user_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get user by ID"""
-    db_user = crud_user.get_user(db, user_id=user_id)
+    db_user = await crud_user.get_user(db, user_id=user_id)
     if db_user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -59,11 +87,11 @@ def read_user(
 
 
 @router.put("/{user_id}", response_model=User)
-def update_user(
+async def update_user(
     user_id: UUID,
     user_update: UserUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Update user information"""
     if user_id != current_user.id and not current_user.is_superuser:
@@ -72,7 +100,7 @@ def update_user(
             detail="Not enough permissions"
         )
     
-    db_user = crud_user.update_user(db, user_id=user_id, user_update=user_update)
+    db_user = await crud_user.update_user(db, user_id=user_id, user_update=user_update)
     if db_user is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -82,10 +110,10 @@ def update_user(
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(
+async def delete_user(
     user_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Delete a user"""
     if user_id != current_user.id and not current_user.is_superuser:
@@ -94,7 +122,7 @@ def delete_user(
             detail="Not enough permissions"
         )
     
-    success = crud_user.delete_user(db, user_id=user_id)
+    success = await crud_user.delete_user(db, user_id=user_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,105 @@
+"""
+Spend-vs-limit thresholds and their hooks.
+
+Each user's expenses per month are kept in a running counter
+(``user_monthly_spend``), updated as a delta in the same DB transaction as
+every transaction write. The upsert returns the new total, so whether a
+write crossed a threshold (80% or 100% of ``User.limit_amount``) is a
+comparison of the totals before and after it, never a rescan of the month.
+
+Crossings are collected on the session while writing and handed to the
+registered hooks after the commit::
+
+    @budget_alerts.register
+    def notify(alert: BudgetAlert) -> None:
+        ...
+
+Hooks run inline on the request's event loop, so they should only hand the
+alert off (e.g. queue a push notification), not do I/O themselves.
+"""
+import logging
+from decimal import Decimal
+from typing import Any, Callable, Iterable, List, Optional
+from app.schemas.budget import BudgetAlert
+
+logger = logging.getLogger(__name__)
+
+# Percentages of limit_amount that raise an alert when monthly spend crosses them
+BUDGET_THRESHOLDS = (80, 100)
+
+_PENDING_KEY = "budget_alerts"
+
+BudgetHook = Callable[[BudgetAlert], Any]
+
+
+def get_threshold_amount(limit_amount: Decimal, threshold: int) -> Decimal:
+    return limit_amount * threshold / 100
+
+
+def get_reached_thresholds(spent: Decimal, limit_amount: Optional[Decimal]) -> List[int]:
+    """Thresholds at or below spent (none without a positive limit)."""
+    if not limit_amount or limit_amount <= 0:
+        return []
+    return [
+        threshold
+        for threshold in BUDGET_THRESHOLDS
+        if spent >= get_threshold_amount(limit_amount, threshold)
+    ]
+
+
+def get_crossed_thresholds(
+    previous: Decimal,
+    current: Decimal,
+    limit_amount: Optional[Decimal],
+) -> List[int]:
+    """Thresholds that spent went up across, from previous to current."""
+    if current <= previous:
+        return []
+    reached_before = set(get_reached_thresholds(previous, limit_amount))
+    return [
+        threshold
+        for threshold in get_reached_thresholds(current, limit_amount)
+        if threshold not in reached_before
+    ]
+
+
+class BudgetAlerts:
+    """Registry of hooks called with every BudgetAlert after its write commits."""
+
+    def __init__(self):
+        self._hooks: List[BudgetHook] = []
+
+    def register(self, hook: BudgetHook) -> BudgetHook:
+        """Add a hook (usable as a decorator)."""
+        self._hooks.append(hook)
+        return hook
+
+    def unregister(self, hook: BudgetHook) -> None:
+        if hook in self._hooks:
+            self._hooks.remove(hook)
+
+    def add_pending(self, db: Any, alerts: Iterable[BudgetAlert]) -> None:
+        """Hold alerts on the session (sync or async) until its transaction commits."""
+        db.info.setdefault(_PENDING_KEY, []).extend(alerts)
+
+    def dispatch_pending(self, db: Any) -> List[BudgetAlert]:
+        """
+        Run the hooks for the alerts held on the session; call after commit.
+
+        A failing hook is logged and does not affect the others (the write has
+        already committed).
+
+        Returns:
+            The dispatched alerts
+        """
+        alerts = db.info.pop(_PENDING_KEY, [])
+        for alert in alerts:
+            for hook in list(self._hooks):
+                try:
+                    hook(alert)
+                except Exception:
+                    logger.exception("Budget alert hook %r failed", hook)
+        return alerts
+
+
+budget_alerts = BudgetAlerts()
@@ -0,0 +1,430 @@
+"""
+Pluggable cache for per-user summary responses and authenticated principals.
+
+Entries are keyed by ``(user_id, version, name, params)``. Every transaction
+write bumps the user's data version, so stale entries are never read again and
+simply age out. Two backends are available:
+
+- ``LRUCacheBackend``: in-process, bounded, for single-process deployments
+- ``RedisCacheBackend``: any client speaking the Redis ``GET``/``SET``/``INCR``
+  commands (redis-py or a compatible stand-in), shared across workers
+
+Async code (endpoints, app.crud.aio) uses the ``*_async`` methods, which
+never block the event loop on a network round trip.
+"""
+import hashlib
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, time as dt_time, timedelta, timezone as dt_timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type, TypeVar
+from uuid import UUID
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+from app.core.config import settings
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def _new_version_base() -> int:
+    # Versions restart from the current time when a counter is missing (first use,
+    # restart or eviction), so they never collide with versions issued earlier.
+    return time.time_ns()
+
+
+class CacheBackend(ABC):
+    """Interface implemented by cache backends."""
+
+    # Whether every worker sees the same entries and versions
+    shared = False
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        ...
+
+    @abstractmethod
+    def get_version(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    def bump_version(self, key: str) -> int:
+        ...
+
+    # In-process backends don't block, so the async variants default to the
+    # sync methods; network backends override them.
+
+    async def get_async(self, key: str) -> Optional[str]:
+        return self.get(key)
+
+    async def set_async(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        self.set(key, value, ttl=ttl)
+
+    async def get_version_async(self, key: str) -> int:
+        return self.get_version(key)
+
+    async def bump_version_async(self, key: str) -> int:
+        return self.bump_version(key)
+
+
+class LRUCacheBackend(CacheBackend):
+    """Thread-safe in-process LRU cache with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._versions: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_version(self, key: str) -> int:
+        with self._lock:
+            return self._get_version_locked(key)
+
+    def bump_version(self, key: str) -> int:
+        with self._lock:
+            version = self._get_version_locked(key) + 1
+            self._versions[key] = version
+            return version
+
+    def _get_version_locked(self, key: str) -> int:
+        version = self._versions.get(key)
+        if version is None:
+            version = _new_version_base()
+            self._versions[key] = version
+        self._versions.move_to_end(key)
+        while len(self._versions) > self.max_entries:
+            self._versions.popitem(last=False)
+        return version
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache backend on top of a Redis-protocol client (GET/SET/INCR).
+
+    ``client`` is a blocking client (e.g. redis.Redis) and ``async_client``
+    its asyncio counterpart (redis.asyncio.Redis). The ``*_async`` methods use
+    the async client. The sync methods are also called from CRUD functions
+    running inside AsyncSession.run_sync, i.e. on the event loop: there the
+    command is awaited through SQLAlchemy's greenlet instead of blocking.
+    Without an async client, async callers run the blocking call in a thread.
+    """
+
+    shared = True
+
+    def __init__(self, client: Any, prefix: str = "fm:", async_client: Any = None):
+        self.client = client
+        self.async_client = async_client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "fm:") -> "RedisCacheBackend":
+        """Create a backend using redis-py (optional dependency)."""
+        try:
+            import redis
+            import redis.asyncio
+        except ImportError as exc:  # pragma: no cover - depends on environment
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from exc
+        return cls(redis.Redis.from_url(url), prefix=prefix, async_client=redis.asyncio.Redis.from_url(url))
+
+    def _call(self, command: str, *args: Any, **kwargs: Any) -> Any:
+        if self.async_client is not None and in_greenlet():
+            return await_only(getattr(self.async_client, command)(*args, **kwargs))
+        return getattr(self.client, command)(*args, **kwargs)
+
+    async def _call_async(self, command: str, *args: Any, **kwargs: Any) -> Any:
+        if self.async_client is not None:
+            return await getattr(self.async_client, command)(*args, **kwargs)
+        return await run_in_threadpool(getattr(self.client, command), *args, **kwargs)
+
+    @staticmethod
+    def _decode(value: Any) -> Optional[str]:
+        if isinstance(value, bytes):
+            return value.decode("utf-8")
+        return value
+
+    @staticmethod
+    def _ex(ttl: Optional[float]) -> Optional[int]:
+        return max(int(ttl), 1) if ttl is not None else None
+
+    def get(self, key: str) -> Optional[str]:
+        return self._decode(self._call("get", self.prefix + key))
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        self._call("set", self.prefix + key, value, ex=self._ex(ttl))
+
+    def get_version(self, key: str) -> int:
+        name = self.prefix + key
+        value = self._call("get", name)
+        if value is None:
+            self._call("set", name, _new_version_base(), nx=True)
+            value = self._call("get", name)
+        return int(value)
+
+    def bump_version(self, key: str) -> int:
+        name = self.prefix + key
+        # Initialize a missing counter first so INCR does not restart from 1
+        if self._call("get", name) is None:
+            self._call("set", name, _new_version_base(), nx=True)
+        return int(self._call("incr", name))
+
+    async def get_async(self, key: str) -> Optional[str]:
+        return self._decode(await self._call_async("get", self.prefix + key))
+
+    async def set_async(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        await self._call_async("set", self.prefix + key, value, ex=self._ex(ttl))
+
+    async def get_version_async(self, key: str) -> int:
+        name = self.prefix + key
+        value = await self._call_async("get", name)
+        if value is None:
+            await self._call_async("set", name, _new_version_base(), nx=True)
+            value = await self._call_async("get", name)
+        return int(value)
+
+    async def bump_version_async(self, key: str) -> int:
+        name = self.prefix + key
+        if await self._call_async("get", name) is None:
+            await self._call_async("set", name, _new_version_base(), nx=True)
+        return int(await self._call_async("incr", name))
+
+
+def seconds_until_next_day(now: Optional[datetime] = None) -> float:
+    """
+    Seconds until the next midnight in now's timezone (UTC if naive or omitted).
+
+    Pass the user's local time to expire at the end of their day; days on
+    which the clocks change are 23 or 25 hours long.
+    """
+    now = now or datetime.now(dt_timezone.utc)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=dt_timezone.utc)
+    midnight = datetime.combine(now.date() + timedelta(days=1), dt_time.min, tzinfo=now.tzinfo)
+    # Aware datetimes in one zone subtract as wall times; compare in UTC
+    remaining = midnight.astimezone(dt_timezone.utc) - now.astimezone(dt_timezone.utc)
+    return max(remaining.total_seconds(), 1.0)
+
+
+class SummaryCache:
+    """
+    Versioned per-user cache for summary responses.
+
+    Entries are only valid for the user's current data version; bump_user()
+    must be called after every committed write to that user's transactions.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend], default_ttl: Optional[float] = None):
+        self.backend = backend
+        self.default_ttl = default_ttl
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def _version_key(self, user_id: UUID) -> str:
+        return f"ver:{user_id}"
+
+    def _entry_key(self, user_id: UUID, version: int, name: str, params: Dict[str, Any]) -> str:
+        raw = json.dumps(params, sort_keys=True, default=str, separators=(",", ":"))
+        digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+        return f"summary:{user_id}:{version}:{name}:{digest}"
+
+    def get_user_version(self, user_id: UUID) -> int:
+        return self.backend.get_version(self._version_key(user_id))
+
+    def bump_user(self, user_id: UUID) -> None:
+        """Invalidate all cached entries of a user."""
+        if self.backend is not None:
+            self.backend.bump_version(self._version_key(user_id))
+
+    async def bump_user_async(self, user_id: UUID) -> None:
+        if self.backend is not None:
+            await self.backend.bump_version_async(self._version_key(user_id))
+
+    def _lookup(self, user_id: UUID, name: str, params: Dict[str, Any], model: Type[M]) -> Tuple[str, Optional[M]]:
+        version = self.get_user_version(user_id)
+        key = self._entry_key(user_id, version, name, params)
+        cached = self.backend.get(key)
+        return key, (model.model_validate_json(cached) if cached is not None else None)
+
+    async def _lookup_async(
+        self, user_id: UUID, name: str, params: Dict[str, Any], model: Type[M]
+    ) -> Tuple[str, Optional[M]]:
+        version = await self.backend.get_version_async(self._version_key(user_id))
+        key = self._entry_key(user_id, version, name, params)
+        cached = await self.backend.get_async(key)
+        return key, (model.model_validate_json(cached) if cached is not None else None)
+
+    def _entry_ttl(self, ttl: Optional[float]) -> Optional[float]:
+        if self.default_ttl is not None:
+            return min(ttl, self.default_ttl) if ttl is not None else self.default_ttl
+        return ttl
+
+    def _store(self, key: str, value: BaseModel, ttl: Optional[float]) -> None:
+        self.backend.set(key, value.model_dump_json(), ttl=self._entry_ttl(ttl))
+
+    async def _store_async(self, key: str, value: BaseModel, ttl: Optional[float]) -> None:
+        await self.backend.set_async(key, value.model_dump_json(), ttl=self._entry_ttl(ttl))
+
+    def get_or_compute(
+        self,
+        user_id: UUID,
+        name: str,
+        params: Dict[str, Any],
+        model: Type[M],
+        compute: Callable[[], M],
+        ttl: Optional[float] = None,
+    ) -> M:
+        """
+        Return the cached model for (user, name, params), computing it on a miss.
+
+        Args:
+            name: Logical name of the cached value (e.g. 'period_summary')
+            params: Parameters the value depends on (timeframe, filters, ...)
+            model: Pydantic model class used to (de)serialize the value
+            compute: Callable producing the value on a cache miss
+            ttl: Seconds the entry may live (capped by the default TTL)
+        """
+        if self.backend is None:
+            return compute()
+
+        key, cached = self._lookup(user_id, name, params, model)
+        if cached is not None:
+            return cached
+        value = compute()
+        self._store(key, value, ttl)
+        return value
+
+    async def get_or_compute_async(
+        self,
+        user_id: UUID,
+        name: str,
+        params: Dict[str, Any],
+        model: Type[M],
+        compute: Callable[[], Awaitable[M]],
+        ttl: Optional[float] = None,
+    ) -> M:
+        """Like get_or_compute, awaiting the backend and compute()."""
+        if self.backend is None:
+            return await compute()
+
+        key, cached = await self._lookup_async(user_id, name, params, model)
+        if cached is not None:
+            return cached
+        value = await compute()
+        await self._store_async(key, value, ttl)
+        return value
+
+
+def build_cache_backend() -> Optional[CacheBackend]:
+    """Create the cache backend configured by CACHE_BACKEND."""
+    backend = (settings.CACHE_BACKEND or "").lower()
+    if backend == "memory":
+        return LRUCacheBackend(max_entries=settings.CACHE_MAX_ENTRIES)
+    if backend == "redis":
+        return RedisCacheBackend.from_url(settings.CACHE_URL)
+    return None
+
+
+class PrincipalCache:
+    """
+    TTL + LRU cache of validated principals (schemas.User), keyed by token subject.
+
+    Entries are plain objects in process memory. Each one remembers the
+    subject's version in the shared backend at load time, and a hit requires
+    that version to be unchanged, so invalidate() from any worker retires
+    every worker's copy. That needs a shared backend (CACHE_BACKEND=redis):
+    with the in-process backend other workers would keep serving a changed
+    profile (e.g. timezone or limit_amount) until the TTL, so the cache is
+    disabled there.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend], ttl: float, max_entries: int = 10000):
+        self.backend = backend
+        self.ttl = ttl
+        self._entries = LRUCacheBackend(max_entries=max_entries)  # Values: (principal, version)
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None and self.backend.shared and self.ttl > 0
+
+    def _version_key(self, subject: str) -> str:
+        return f"principal:{subject}"
+
+    def get_version(self, subject: str) -> Optional[int]:
+        """Current version of a subject; read it before loading the principal."""
+        if not self.enabled:
+            return None
+        return self.backend.get_version(self._version_key(subject))
+
+    async def get_version_async(self, subject: str) -> Optional[int]:
+        if not self.enabled:
+            return None
+        return await self.backend.get_version_async(self._version_key(subject))
+
+    def get(self, subject: str, version: Optional[int]) -> Optional[Any]:
+        if not self.enabled or version is None:
+            return None
+        entry = self._entries.get(subject)
+        if entry is None or entry[1] != version:
+            return None
+        return entry[0]
+
+    def set(self, subject: str, principal: Any, version: Optional[int]) -> None:
+        if self.enabled and version is not None:
+            self._entries.set(subject, (principal, version), ttl=self.ttl)
+
+    def invalidate(self, *subjects: Optional[str]) -> None:
+        """Drop cached principals of the given subjects (e.g. old and new username)."""
+        if self.backend is None:
+            return
+        for subject in {subject for subject in subjects if subject}:
+            self.backend.bump_version(self._version_key(subject))
+
+    async def invalidate_async(self, *subjects: Optional[str]) -> None:
+        if self.backend is None:
+            return
+        for subject in {subject for subject in subjects if subject}:
+            await self.backend.bump_version_async(self._version_key(subject))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_cache_backend = build_cache_backend()
+summary_cache = SummaryCache(_cache_backend, default_ttl=settings.SUMMARY_CACHE_TTL_SECONDS)
+principal_cache = PrincipalCache(
+    _cache_backend,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_entries=settings.CACHE_MAX_ENTRIES,
+)
@@ -0,0 +1,261 @@
+"""
+Process-wide, versioned catalog of categories.
+
+Almost every category is one of the global rows (``is_global``), so the
+catalog keeps them in memory as schemas, plus a small per-user overlay of the
+categories linked to each user. A category is visible to a user when it is
+global or linked to that user, so ``visible()`` is the union of the two.
+
+Freshness is tracked with versions: ``catalog:global`` for the global
+categories and ``catalog:user:<id>`` for the categories linked to a user.
+Writes bump the global version for global categories and the version of
+every linked user for the others. With a shared backend
+(CACHE_BACKEND=redis) the versions live there and are bumped after the write
+commits. In-process bumps would never reach other workers, so otherwise they
+are rows of category_catalog_versions, bumped in the same DB transaction as
+the write and read by primary key. Lookups of ids missing from the catalog
+fall back to the database, so a category created moments ago is never
+rejected.
+"""
+import time
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+from uuid import UUID
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Select, select, true, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.cache import CacheBackend, LRUCacheBackend, _cache_backend
+from app.core.config import settings
+from app.models.category import Category as CategoryModel
+from app.models.category_catalog_version import CategoryCatalogVersion
+from app.models.user_category import UserCategory
+from app.schemas.category import Category
+
+Entries = Dict[UUID, Category]
+Versions = Tuple[int, int]  # (global version, user overlay version)
+
+GLOBAL_KEY = "catalog:global"
+_PENDING_KEY = "category_catalog_bumps"
+
+# Columns read for the catalog: one projected query, no ORM objects
+CATEGORY_COLUMNS = (
+    CategoryModel.id,
+    CategoryModel.name,
+    CategoryModel.description,
+    CategoryModel.type,
+    CategoryModel.color,
+    CategoryModel.icon,
+    CategoryModel.is_global,
+    CategoryModel.created_at,
+    CategoryModel.updated_at,
+)
+
+
+def _global_query() -> Select:
+    return select(*CATEGORY_COLUMNS).where(CategoryModel.is_global == true())
+
+
+def _overlay_query(user_id: UUID) -> Select:
+    return select(*CATEGORY_COLUMNS).join(
+        UserCategory, UserCategory.category_id == CategoryModel.id
+    ).where(UserCategory.user_id == user_id)
+
+
+def _ids_query(category_ids: Iterable[UUID]) -> Select:
+    return select(*CATEGORY_COLUMNS).where(CategoryModel.id.in_(category_ids))
+
+
+def _to_entries(rows: Iterable[Any]) -> Entries:
+    """Category schemas by id from CATEGORY_COLUMNS rows (CPU only)."""
+    return {row.id: Category.model_validate(row) for row in rows}
+
+
+async def _load_entries_async(db: AsyncSession, query: Select) -> Entries:
+    rows = (await db.execute(query)).all()
+    return await run_in_threadpool(_to_entries, rows)
+
+
+def _merge(entries: Entries, overlay: Entries) -> Entries:
+    return {**entries, **overlay} if overlay else entries
+
+
+def _split_found(visible: Entries, category_ids: Iterable[UUID]) -> Tuple[Entries, Set[UUID]]:
+    """(visible categories among category_ids, ids to look up in the database)."""
+    found = {}
+    missing = set()
+    for category_id in category_ids:
+        if category_id is None:
+            continue
+        category = visible.get(category_id)
+        if category is None:
+            missing.add(category_id)
+        else:
+            found[category_id] = category
+    return found, missing
+
+
+class CategoryCatalog:
+    """Global categories plus per-user overlays, reloaded when their version changes."""
+
+    def __init__(self, backend: Optional[CacheBackend], ttl: float, max_users: int = 10000):
+        # Only a shared backend can carry versions across workers
+        self.versions = backend if backend is not None and backend.shared else None
+        self.ttl = ttl
+        self._global: Optional[Tuple[int, float, Entries]] = None  # (version, loaded_at, entries)
+        self._overlays = LRUCacheBackend(max_entries=max_users)  # user_id -> (versions, entries)
+
+    def _user_key(self, user_id: UUID) -> str:
+        return f"catalog:user:{user_id}"
+
+    def get_versions(self, db: Session, user_id: UUID) -> Versions:
+        """(global version, user overlay version)."""
+        if self.versions is None:
+            return self._load_versions(db, user_id)
+        return self.versions.get_version(GLOBAL_KEY), self.versions.get_version(self._user_key(user_id))
+
+    async def get_versions_async(self, db: AsyncSession, user_id: UUID) -> Versions:
+        if self.versions is None:
+            return await db.run_sync(self._load_versions, user_id)
+        global_version = await self.versions.get_version_async(GLOBAL_KEY)
+        user_version = await self.versions.get_version_async(self._user_key(user_id))
+        return global_version, user_version
+
+    def _load_versions(self, db: Session, user_id: UUID) -> Versions:
+        """Versions from category_catalog_versions: two primary key lookups in one query."""
+        user_key = self._user_key(user_id)
+        rows = dict(db.execute(
+            select(CategoryCatalogVersion.key, CategoryCatalogVersion.version)
+            .where(CategoryCatalogVersion.key.in_((GLOBAL_KEY, user_key)))
+        ).all())
+        return rows.get(GLOBAL_KEY, 0), rows.get(user_key, 0)
+
+    def version_tag(self, db: Session, user_id: UUID) -> str:
+        """Compact token of the catalog state a user sees (for ETags and cache keys)."""
+        global_version, user_version = self.get_versions(db, user_id)
+        return f"{global_version}.{user_version}"
+
+    async def version_tag_async(self, db: AsyncSession, user_id: UUID) -> str:
+        global_version, user_version = await self.get_versions_async(db, user_id)
+        return f"{global_version}.{user_version}"
+
+    def _cached_global(self, version: int) -> Optional[Entries]:
+        cached = self._global
+        if cached is not None and cached[0] == version and time.monotonic() - cached[1] < self.ttl:
+            return cached[2]
+        return None
+
+    def _store_global(self, version: int, entries: Entries) -> Entries:
+        self._global = (version, time.monotonic(), entries)
+        return entries
+
+    def _cached_overlay(self, user_id: UUID, versions: Versions) -> Optional[Entries]:
+        cached = self._overlays.get(str(user_id))
+        if cached is not None and cached[0] == versions:
+            return cached[1]
+        return None
+
+    def _store_overlay(self, user_id: UUID, versions: Versions, entries: Entries) -> Entries:
+        self._overlays.set(str(user_id), (versions, entries), ttl=self.ttl)
+        return entries
+
+    def get_global(self, db: Session, version: int) -> Entries:
+        """Global categories by id, loaded with one query when stale."""
+        entries = self._cached_global(version)
+        if entries is None:
+            entries = self._store_global(version, _to_entries(db.execute(_global_query()).all()))
+        return entries
+
+    def get_overlay(self, db: Session, user_id: UUID, versions: Versions) -> Entries:
+        """Categories linked to the user, loaded with one query when stale."""
+        entries = self._cached_overlay(user_id, versions)
+        if entries is None:
+            entries = self._store_overlay(
+                user_id, versions, _to_entries(db.execute(_overlay_query(user_id)).all())
+            )
+        return entries
+
+    def visible(self, db: Session, user_id: UUID) -> Entries:
+        """Every category visible to the user, by id."""
+        versions = self.get_versions(db, user_id)
+        overlay = self.get_overlay(db, user_id, versions)
+        return _merge(self.get_global(db, versions[0]), overlay)
+
+    async def visible_async(self, db: AsyncSession, user_id: UUID) -> Entries:
+        """
+        Like visible; cold loads are awaited on the AsyncSession and the
+        schemas are built in a worker thread, off the event loop.
+        """
+        versions = await self.get_versions_async(db, user_id)
+        overlay = self._cached_overlay(user_id, versions)
+        if overlay is None:
+            overlay = self._store_overlay(user_id, versions, await _load_entries_async(db, _overlay_query(user_id)))
+        entries = self._cached_global(versions[0])
+        if entries is None:
+            entries = self._store_global(versions[0], await _load_entries_async(db, _global_query()))
+        return _merge(entries, overlay)
+
+    def resolve(self, db: Session, user_id: UUID, category_ids: Iterable[UUID]) -> Entries:
+        """
+        Categories for display (e.g. on transactions), by id.
+
+        Ids missing from the user's catalog are read from the database in one
+        query and not cached.
+        """
+        found, missing = _split_found(self.visible(db, user_id), category_ids)
+        if missing:
+            found.update(_to_entries(db.execute(_ids_query(missing)).all()))
+        return found
+
+    async def resolve_async(self, db: AsyncSession, user_id: UUID, category_ids: Iterable[UUID]) -> Entries:
+        """Like resolve, for the async CRUD layer (see visible_async)."""
+        found, missing = _split_found(await self.visible_async(db, user_id), category_ids)
+        if missing:
+            found.update(await _load_entries_async(db, _ids_query(missing)))
+        return found
+
+    def bump_global(self, db: Session) -> None:
+        """Record a change to global (or shared) categories; call before commit."""
+        self._bump(db, GLOBAL_KEY)
+
+    def bump_user(self, db: Session, user_id: UUID) -> None:
+        """Record a change to the categories linked to a user; call before commit."""
+        self._bump(db, self._user_key(user_id))
+
+    def _bump(self, db: Session, key: str) -> None:
+        if self.versions is not None:
+            # Published by publish_pending once the write is visible
+            db.info.setdefault(_PENDING_KEY, set()).add(key)
+            return
+        dialect = db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            stmt = insert(CategoryCatalogVersion).values(key=key, version=1)
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=["key"],
+                set_={"version": CategoryCatalogVersion.version + 1},
+            ))
+            return
+        bumped = db.execute(
+            update(CategoryCatalogVersion)
+            .where(CategoryCatalogVersion.key == key)
+            .values(version=CategoryCatalogVersion.version + 1)
+        ).rowcount
+        if not bumped:
+            db.add(CategoryCatalogVersion(key=key, version=1))
+
+    def publish_pending(self, db: Session) -> None:
+        """Bump the shared backend versions recorded on the session; call after commit."""
+        for key in db.info.pop(_PENDING_KEY, ()):
+            self.versions.bump_version(key)
+
+    def clear(self) -> None:
+        self._global = None
+        self._overlays.clear()
+
+
+category_catalog = CategoryCatalog(
+    _cache_backend,
+    ttl=settings.CATEGORY_CATALOG_TTL_SECONDS,
+    max_users=settings.CACHE_MAX_ENTRIES,
+)
@@ -39,12 +39,65 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
+    # Optional; derived from DATABASE_URL (asyncpg / aiosqlite) when empty
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")
     
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-here-change-in-production")
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     REFRESH_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_MINUTES", str(60 * 24 * 7)))
+    # bcrypt cost factor; existing hashes are upgraded on the next login
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    # Threads reserved for password hashing (per worker)
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    
+    # Cache ("memory" = in-process LRU, "redis" = shared Redis-protocol server, "none" = disabled)
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_URL: str = os.getenv("CACHE_URL", "redis://localhost:6379/0")
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    SUMMARY_CACHE_TTL_SECONDS: int = int(os.getenv("SUMMARY_CACHE_TTL_SECONDS", "3600"))
+    # Authenticated users cached per token subject (0 = disabled; needs CACHE_BACKEND=redis)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+    # Upper bound on how long the category catalog is kept before a reload (0 = always reload)
+    CATEGORY_CATALOG_TTL_SECONDS: int = int(os.getenv("CATEGORY_CATALOG_TTL_SECONDS", "300"))
+    # How often each worker loads token versions bumped since its last refresh
+    TOKEN_VERSION_REFRESH_SECONDS: int = int(os.getenv("TOKEN_VERSION_REFRESH_SECONDS", "30"))
+    
+    # Login / registration throttling ("memory" = per worker, "redis" = shared, "none" = disabled)
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    # Defaults to CACHE_URL
+    RATE_LIMIT_URL: str = os.getenv("RATE_LIMIT_URL", "")
+    # Token buckets as "<attempts>/<second|minute|hour|day>"; empty or 0 disables a bucket
+    LOGIN_RATE_LIMIT_PER_IP: str = os.getenv("LOGIN_RATE_LIMIT_PER_IP", "20/minute")
+    LOGIN_RATE_LIMIT_PER_USERNAME: str = os.getenv("LOGIN_RATE_LIMIT_PER_USERNAME", "5/minute")
+    REGISTER_RATE_LIMIT_PER_IP: str = os.getenv("REGISTER_RATE_LIMIT_PER_IP", "10/hour")
+    
+    # Bulk import
+    IMPORT_MAX_ROWS: int = int(os.getenv("IMPORT_MAX_ROWS", "50000"))
+    BATCH_MAX_OPERATIONS: int = int(os.getenv("BATCH_MAX_OPERATIONS", "1000"))
+    
+    # Monthly transaction partitions created ahead of time (PostgreSQL)
+    PARTITION_MONTHS_AHEAD: int = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+    
+    # Push notifications ("live" = FCM/APNs, "fake" = in-process fake provider, "none" = disabled)
+    PUSH_BACKEND: str = os.getenv("PUSH_BACKEND", "none")
+    # Users whose tokens are loaded per query, provider requests in flight, queued jobs
+    PUSH_BATCH_SIZE: int = int(os.getenv("PUSH_BATCH_SIZE", "1000"))
+    PUSH_CONCURRENCY: int = int(os.getenv("PUSH_CONCURRENCY", "200"))
+    PUSH_QUEUE_SIZE: int = int(os.getenv("PUSH_QUEUE_SIZE", "10000"))
+    # Retries of a failed send, backing off exponentially from PUSH_RETRY_BACKOFF_SECONDS
+    PUSH_MAX_RETRIES: int = int(os.getenv("PUSH_MAX_RETRIES", "2"))
+    PUSH_RETRY_BACKOFF_SECONDS: float = float(os.getenv("PUSH_RETRY_BACKOFF_SECONDS", "0.5"))
+    # Firebase Cloud Messaging (android, web): service account JSON; project defaults to the file's
+    FCM_PROJECT_ID: str = os.getenv("FCM_PROJECT_ID", "")
+    FCM_CREDENTIALS_FILE: str = os.getenv("FCM_CREDENTIALS_FILE", "")
+    # Apple Push Notification service (ios): token-based auth with a .p8 key
+    APNS_TEAM_ID: str = os.getenv("APNS_TEAM_ID", "")
+    APNS_KEY_ID: str = os.getenv("APNS_KEY_ID", "")
+    APNS_KEY_FILE: str = os.getenv("APNS_KEY_FILE", "")
+    APNS_TOPIC: str = os.getenv("APNS_TOPIC", "")  # App bundle id
+    APNS_USE_SANDBOX: bool = os.getenv("APNS_USE_SANDBOX", "false").lower() == "true"
     
     model_config = {
         "env_file": ".env",
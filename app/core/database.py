@@ -1,9 +1,28 @@
+from typing import AsyncIterator
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-# Tạo engine
+# Async drivers used by the API for each sync driver/dialect
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url(url: str) -> str:
+    """Turn a sync DATABASE_URL (e.g. postgresql://...) into its async-driver URL."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if parsed.get_driver_name() in ("asyncpg", "aiosqlite") or backend not in ASYNC_DRIVERS:
+        return url
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+# Tạo engine (sync: migrations, startup DDL và scripts bảo trì)
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
@@ -14,25 +33,37 @@ engine = create_engine(
 # Tạo SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine dùng cho API (asyncpg / aiosqlite)
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL),
+    pool_pre_ping=True,
+    pool_size=10,
+    max_overflow=20
+)
+
+# expire_on_commit=False: objects stay readable after commit without lazy
+# loads (which are not allowed outside the greenlet on an AsyncSession)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Base class cho models
 Base = declarative_base()
 
 
 # Dependency để lấy database session
-def get_db():
+async def get_db() -> AsyncIterator[AsyncSession]:
     """
-    Database session dependency với transaction management.
+    Async database session dependency với transaction management.
     - Tự động commit khi request thành công
     - Tự động rollback khi có exception
     - Luôn đóng connection trong finally block
     """
-    db = SessionLocal()
+    db = AsyncSessionLocal()
     try:
         yield db
-        db.commit()  # Commit nếu không có exception
+        await db.commit()  # Commit nếu không có exception
     except Exception:
-        db.rollback()  # Rollback nếu có exception
+        await db.rollback()  # Rollback nếu có exception
         raise
     finally:
-        db.close()  # Luôn đóng connection
+        await db.close()  # Luôn đóng connection
 
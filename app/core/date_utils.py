@@ -1,8 +1,38 @@
 """
 Date utility functions for filtering and pagination.
 """
-from datetime import datetime, time, timedelta, timezone as dt_timezone
+from datetime import datetime, time, timedelta, timezone as dt_timezone, tzinfo
+from functools import lru_cache
 from typing import Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+
+@lru_cache(maxsize=512)
+def get_zone(timezone: Optional[str] = None) -> tzinfo:
+    """
+    Resolve an IANA timezone name (e.g. 'Asia/Ho_Chi_Minh').
+    
+    Returns:
+        UTC when timezone is empty or 'UTC'
+    
+    Raises:
+        ValueError: If the timezone is unknown
+    """
+    if not timezone or timezone == "UTC":
+        return dt_timezone.utc
+    try:
+        return ZoneInfo(timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone: {timezone!r}")
+
+
+def _to_zone(dt: datetime, timezone: Optional[str]) -> datetime:
+    """Naive datetimes are taken as wall time in timezone; aware ones are converted to it."""
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=get_zone(timezone))
+    if timezone:
+        return dt.astimezone(get_zone(timezone))
+    return dt
 
 
 def get_start_of_day(dt: datetime, timezone: Optional[str] = None) -> datetime:
@@ -11,16 +41,14 @@ def get_start_of_day(dt: datetime, timezone: Optional[str] = None) -> datetime:
     
     Args:
         dt: Input datetime
-        timezone: Optional timezone string (e.g., 'UTC'). 
-                 If None and dt has no timezone, assumes UTC.
+        timezone: Optional timezone string (e.g., 'Asia/Ho_Chi_Minh'): the day
+                 is taken in that timezone. If None and dt has no timezone,
+                 assumes UTC.
     
     Returns:
-        Datetime at start of day (preserves timezone info)
+        Datetime at start of day (in timezone if given, else dt's own)
     """
-    # If datetime is naive (no timezone), assume UTC
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=dt_timezone.utc)
-    
+    dt = _to_zone(dt, timezone)
     return dt.replace(hour=0, minute=0, second=0, microsecond=0)
 
 
@@ -30,16 +58,14 @@ def get_end_of_day(dt: datetime, timezone: Optional[str] = None) -> datetime:
     
     Args:
         dt: Input datetime
-        timezone: Optional timezone string (e.g., 'UTC').
-                 If None and dt has no timezone, assumes UTC.
+        timezone: Optional timezone string (e.g., 'Asia/Ho_Chi_Minh'): the day
+                 is taken in that timezone. If None and dt has no timezone,
+                 assumes UTC.
     
     Returns:
-        Datetime at end of day (preserves timezone info)
+        Datetime at end of day (in timezone if given, else dt's own)
     """
-    # If datetime is naive (no timezone), assume UTC
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=dt_timezone.utc)
-    
+    dt = _to_zone(dt, timezone)
     return dt.replace(hour=23, minute=59, second=59, microsecond=999999)
 
 
@@ -0,0 +1,55 @@
+"""
+Chunked CSV / NDJSON encoders for streaming exports of plain row tuples.
+
+Rows arrive in batches (one server-side cursor fetch each) and every batch is
+encoded as one chunk of the response body.
+"""
+import csv
+import io
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterable, AsyncIterator, List, Sequence
+from uuid import UUID
+from app.core import responses
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _to_text(value: Any) -> Any:
+    """Convert a column value to the same text form the JSON API uses."""
+    if value is None:
+        return None
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    return value
+
+
+async def iter_csv(batches: AsyncIterable[Sequence[Sequence]], columns: List[str]) -> AsyncIterator[str]:
+    """Encode batches of rows as CSV (with a header line), yielding one chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for rows in batches:
+        for row in rows:
+            writer.writerow(["" if value is None else _to_text(value) for value in row])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()  # Header only: no rows
+
+
+async def iter_ndjson(batches: AsyncIterable[Sequence[Sequence]], columns: List[str]) -> AsyncIterator[str]:
+    """Encode batches of rows as newline-delimited JSON objects, yielding one chunk per batch."""
+    async for rows in batches:
+        if not rows:
+            continue
+        # orjson encodes datetime/UUID/Decimal natively (same text as _to_text)
+        yield b"\n".join(
+            responses.dumps(dict(zip(columns, row))) for row in rows
+        ).decode("utf-8") + "\n"
@@ -1,26 +1,43 @@
 """
 Cursor-based pagination utilities.
-Uses UUID7 (time-ordered) as cursor for efficient pagination.
+
+Cursors are opaque, signed tokens that encode the full ordering key of the last
+item on a page (e.g. ``(date, id)`` for transactions). The next page is fetched
+with a row-value comparison such as ``(date, id) < (:date, :id)``, which the
+database can answer directly from a matching composite index instead of
+re-scanning previous pages.
 """
-from typing import Generic, TypeVar, Optional, List, Tuple
+import base64
+import hashlib
+import hmac
+import json
+from datetime import date, datetime
+from typing import Any, Generic, TypeVar, Optional, List, Sequence, Tuple, Union
 from uuid import UUID
-from sqlalchemy.orm import Query
-from sqlalchemy import Column
+from sqlalchemy.orm import Query, Session
+from sqlalchemy import Column, Select, literal, tuple_
 from pydantic import BaseModel
+from app.core.config import settings
 
 T = TypeVar('T')
 
+_SIGNATURE_BYTES = 16
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed or has been tampered with."""
+
 
 class PaginationParams(BaseModel):
     """Pagination parameters"""
     limit: int = 20
-    cursor: Optional[UUID] = None  # UUID7 of the last item from previous page
+    cursor: Optional[str] = None  # Opaque cursor returned as next_cursor by the previous page
     
     class Config:
         json_schema_extra = {
             "example": {
                 "limit": 20,
-                "cursor": "019add06-2e71-77a3-af00-40499a09182b"
+                "cursor": "WyIyMDI0LTAxLTE1VDEyOjAwOjAwKzAwOjAwIiwiMDE5YWRkMDYtMmU3MS03N2EzLWFmMDAtNDA0OTlhMDkxODJiIl0.kq3Rr2d6QyqkN1Zs0C5mBg"
             }
         }
 
@@ -28,7 +45,7 @@ class PaginationParams(BaseModel):
 class PaginatedResponse(BaseModel, Generic[T]):
     """Paginated response with cursor"""
     items: List[T]
-    next_cursor: Optional[UUID] = None  # UUID7 of the last item in current page
+    next_cursor: Optional[str] = None  # Opaque cursor pointing after the last item in current page
     has_next: bool = False
     limit: int
     
@@ -36,79 +53,187 @@ class PaginatedResponse(BaseModel, Generic[T]):
         json_schema_extra = {
             "example": {
                 "items": [],
-                "next_cursor": "019add06-2e71-77a3-af00-40499a09182b",
+                "next_cursor": "WyIyMDI0LTAxLTE1VDEyOjAwOjAwKzAwOjAwIiwiMDE5YWRkMDYtMmU3MS03N2EzLWFmMDAtNDA0OTlhMDkxODJiIl0.kq3Rr2d6QyqkN1Zs0C5mBg",
                 "has_next": True,
                 "limit": 20
             }
         }
 
 
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+
+
+def _sign(payload: bytes) -> bytes:
+    digest = hmac.new(settings.SECRET_KEY.encode("utf-8"), payload, hashlib.sha256).digest()
+    return digest[:_SIGNATURE_BYTES]
+
+
+def _serialize_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _deserialize_value(value: Any, column: Column) -> Any:
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is UUID:
+        return UUID(value)
+    return python_type(value)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode the ordering key of an item into an opaque, signed cursor.
+
+    Args:
+        values: Ordering key values, in the same order as the key columns
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps(
+        [_serialize_value(value) for value in values], separators=(",", ":")
+    ).encode("utf-8")
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+
+
+def decode_cursor(cursor: str, columns: Sequence[Column]) -> Tuple:
+    """
+    Verify and decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string from a previous page
+        columns: Key columns the cursor was built from (used to restore value types)
+
+    Returns:
+        Tuple of ordering key values
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed, was not signed by this
+                            server, or does not match the key columns
+    """
+    try:
+        encoded_payload, encoded_signature = cursor.split(".", 1)
+        payload = _b64decode(encoded_payload)
+        signature = _b64decode(encoded_signature)
+    except (ValueError, TypeError):
+        raise InvalidCursorError("Invalid pagination cursor")
+
+    if not hmac.compare_digest(signature, _sign(payload)):
+        raise InvalidCursorError("Invalid pagination cursor")
+
+    try:
+        values = json.loads(payload)
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor key length mismatch")
+        return tuple(_deserialize_value(value, column) for value, column in zip(values, columns))
+    except (ValueError, TypeError):
+        raise InvalidCursorError("Invalid pagination cursor")
+
+
 def paginate_with_cursor(
-    query: Query,
+    query: Union[Query, Select],
     cursor_column: Column,
     limit: int = 20,
-    cursor: Optional[UUID] = None,
+    cursor: Optional[str] = None,
     order_desc: bool = True,
-    secondary_order_column: Optional[Column] = None
-) -> Tuple[List, Optional[UUID], bool]:
+    secondary_order_column: Optional[Column] = None,
+    db: Optional[Session] = None,
+) -> Tuple[List, Optional[str], bool]:
     """
-    Apply cursor-based pagination to a SQLAlchemy query.
+    Apply keyset (cursor-based) pagination to a SQLAlchemy query.
+    
+    The ordering key is ``(secondary_order_column, cursor_column)`` when a
+    secondary column is given, otherwise just ``cursor_column``. The cursor
+    encodes that full key, and the next page is selected with a row-value
+    comparison on it, so pages stay consistent even when the secondary column
+    does not follow the cursor column's order (e.g. back-dated transactions).
+    
+    A Core ``Select`` is paginated the same way and executed on ``db``; its
+    rows must expose the key columns under their own keys (e.g. ``row.id``).
     
     Args:
-        query: SQLAlchemy query object
-        cursor_column: Column to use as cursor (typically the ID column)
+        query: SQLAlchemy query object, or a Core Select (requires db)
+        cursor_column: Unique tie-breaker column (typically the ID column)
         limit: Number of items per page (default: 20, max: 100)
-        cursor: UUID7 cursor from previous page (None for first page)
-        order_desc: If True, order by cursor_column DESC (default: True)
-        secondary_order_column: Optional secondary column for ordering (e.g., date column)
-                              Used for composite ordering when filtering by date ranges
+        cursor: Opaque cursor from previous page (None for first page)
+        order_desc: If True, order by the key DESC (default: True)
+        secondary_order_column: Optional leading column for ordering (e.g., date column)
+        db: Session used to execute a Core Select
     
     Returns:
         Tuple of (items, next_cursor, has_next)
         - items: List of results for current page
-        - next_cursor: UUID7 of last item (None if no next page)
+        - next_cursor: Opaque cursor after the last item (None if no next page)
         - has_next: Boolean indicating if there are more items
+    
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was not issued by this server
     """
     # Limit max page size
     limit = min(limit, 100)
     limit = max(limit, 1)
     
-    # Apply cursor filter if provided
+    key_columns = [cursor_column]
+    if secondary_order_column is not None:
+        key_columns.insert(0, secondary_order_column)
+    
+    # Apply cursor filter if provided: (key...) < (cursor key...) for DESC order
     if cursor:
-        if order_desc:
-            query = query.filter(cursor_column < cursor)
+        cursor_values = decode_cursor(cursor, key_columns)
+        if len(key_columns) > 1:
+            key_expr = tuple_(*key_columns)
+            cursor_expr = tuple_(
+                *(literal(value, type_=column.type) for value, column in zip(cursor_values, key_columns))
+            )
         else:
-            query = query.filter(cursor_column > cursor)
-    
-    # Order by cursor column (and secondary column if provided)
-    if secondary_order_column:
-        # Composite ordering: secondary column first, then cursor column
+            key_expr = cursor_column
+            cursor_expr = cursor_values[0]
         if order_desc:
-            query = query.order_by(secondary_order_column.desc(), cursor_column.desc())
+            query = query.where(key_expr < cursor_expr)
         else:
-            query = query.order_by(secondary_order_column.asc(), cursor_column.asc())
+            query = query.where(key_expr > cursor_expr)
+    
+    # Order by the full key so the cursor comparison and ordering agree
+    if order_desc:
+        query = query.order_by(*(column.desc() for column in key_columns))
     else:
-        # Simple ordering by cursor column only
-        if order_desc:
-            query = query.order_by(cursor_column.desc())
-        else:
-            query = query.order_by(cursor_column.asc())
+        query = query.order_by(*(column.asc() for column in key_columns))
     
     # Fetch limit + 1 to check if there's a next page
-    items = query.limit(limit + 1).all()
+    query = query.limit(limit + 1)
+    if isinstance(query, Select):
+        items = db.execute(query).all()
+    else:
+        items = query.all()
     
     # Check if there's a next page
     has_next = len(items) > limit
     if has_next:
         items = items[:limit]
     
-    # Get next cursor (UUID of last item)
+    # Encode the ordering key of the last item as the next cursor
     next_cursor = None
-    if items:
+    if has_next and items:
         last_item = items[-1]
-        # Get the cursor value - cursor_column.key gives us the attribute name
-        cursor_attr_name = cursor_column.key
-        next_cursor = getattr(last_item, cursor_attr_name, None)
+        next_cursor = encode_cursor(
+            [getattr(last_item, column.key, None) for column in key_columns]
+        )
     
     return items, next_cursor, has_next
-
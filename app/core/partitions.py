@@ -0,0 +1,243 @@
+"""
+Monthly range partitions of the transactions table (PostgreSQL only).
+
+On PostgreSQL ``transactions`` is partitioned by ``RANGE (date)`` with one
+partition per UTC calendar month (``transactions_pYYYY_MM``) plus a DEFAULT
+partition that catches rows for months without their own partition. Queries
+filtering on ``date`` (timeframe summaries, cursor pages with a date range)
+are pruned to the matching partitions. Lookups by id alone (get, update and
+delete of one transaction) can't be pruned: ``date`` is user supplied, so
+neither the id nor the request bounds it, and they probe the (id, date)
+primary key index of every partition. That is one index probe per month,
+so detaching old months also keeps them cheap.
+
+Other databases (SQLite in tests) keep a plain table; every function here is a
+no-op for them.
+
+Run ``python -m app.core.partitions`` from cron to create upcoming partitions;
+the app also does it on startup.
+"""
+from datetime import date, datetime, timezone as dt_timezone
+from typing import List, Optional, Set
+from uuid import UUID
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from app.core.cache import summary_cache
+from app.core.config import settings
+from app.models.transaction_daily_rollup import UNCATEGORIZED_ID
+
+PARTITIONED_TABLE = "transactions"
+DEFAULT_PARTITION = "transactions_default"
+
+# Serializes partition maintenance between workers starting at the same time
+_LOCK_KEY = 7_310_411
+
+
+def get_month_start(value: date) -> date:
+    """First day of the month containing value (datetimes are taken in UTC)."""
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(dt_timezone.utc)
+        value = value.date()
+    return value.replace(day=1)
+
+
+def get_next_month(month: date) -> date:
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1, day=1)
+    return month.replace(month=month.month + 1, day=1)
+
+
+def get_partition_name(month: date) -> str:
+    """Partition holding the given month, e.g. transactions_p2024_05."""
+    month = get_month_start(month)
+    return f"{PARTITIONED_TABLE}_p{month:%Y_%m}"
+
+
+def _bound(month: date) -> str:
+    return f"{month:%Y-%m-%d} 00:00:00+00"
+
+
+def is_partitioned(connection: Connection) -> bool:
+    """Whether transactions is a partitioned table on this connection's database."""
+    if connection.dialect.name != "postgresql":
+        return False
+    return bool(
+        connection.execute(
+            text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:name))"),
+            {"name": PARTITIONED_TABLE},
+        ).scalar()
+    )
+
+
+def _table_exists(connection: Connection, name: str) -> bool:
+    return connection.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None
+
+
+def _create_month_partition(connection: Connection, month: date) -> None:
+    name = get_partition_name(month)
+    lower, upper = _bound(month), _bound(get_next_month(month))
+    create_sql = (
+        f"CREATE TABLE {name} PARTITION OF {PARTITIONED_TABLE} "
+        f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    )
+    in_range = {"lower": lower, "upper": upper}
+
+    has_default_rows = _table_exists(connection, DEFAULT_PARTITION) and connection.execute(
+        text(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+            "WHERE date >= CAST(:lower AS timestamptz) AND date < CAST(:upper AS timestamptz))"
+        ),
+        in_range,
+    ).scalar()
+    if not has_default_rows:
+        connection.execute(text(create_sql))
+        return
+
+    # Postgres refuses to create a partition whose range already has rows in
+    # the DEFAULT partition: move them over while the default is detached
+    connection.execute(text(f"ALTER TABLE {PARTITIONED_TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+    connection.execute(text(create_sql))
+    connection.execute(
+        text(
+            f"INSERT INTO {PARTITIONED_TABLE} SELECT * FROM {DEFAULT_PARTITION} "
+            "WHERE date >= CAST(:lower AS timestamptz) AND date < CAST(:upper AS timestamptz)"
+        ),
+        in_range,
+    )
+    connection.execute(
+        text(
+            f"DELETE FROM {DEFAULT_PARTITION} "
+            "WHERE date >= CAST(:lower AS timestamptz) AND date < CAST(:upper AS timestamptz)"
+        ),
+        in_range,
+    )
+    connection.execute(text(f"ALTER TABLE {PARTITIONED_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+
+
+def ensure_transaction_partitions(
+    engine: Engine,
+    months_ahead: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> List[str]:
+    """
+    Create the monthly partitions for the current month and the next months.
+
+    Args:
+        months_ahead: Number of future months to create (default: PARTITION_MONTHS_AHEAD)
+        now: Reference time (default: current UTC time)
+
+    Returns:
+        Names of the partitions created (empty when not partitioned)
+    """
+    if months_ahead is None:
+        months_ahead = settings.PARTITION_MONTHS_AHEAD
+    month = get_month_start(now or datetime.now(dt_timezone.utc))
+
+    created = []
+    with engine.begin() as connection:
+        if not is_partitioned(connection):
+            return created
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+        for _ in range(months_ahead + 1):
+            name = get_partition_name(month)
+            if not _table_exists(connection, name):
+                _create_month_partition(connection, month)
+                created.append(name)
+            month = get_next_month(month)
+    return created
+
+
+def detach_transaction_partition(engine: Engine, month: date) -> Optional[str]:
+    """
+    Detach a month's partition from transactions, e.g. to archive or drop it.
+
+    The detached table keeps its rows under the partition's name. Its
+    transactions are subtracted from the daily rollups (on each user's local
+    days) and the monthly spend counters in the same DB transaction, so
+    summaries stay consistent with what is left in the table.
+    The plain (non-CONCURRENTLY) DETACH is a metadata-only change but takes a
+    short exclusive lock on transactions; CONCURRENTLY would have to run
+    outside the transaction that adjusts the rollups.
+
+    Returns:
+        The detached table's name, or None if there was nothing to detach
+    """
+    name = get_partition_name(month)
+    with engine.begin() as connection:
+        if not is_partitioned(connection) or not _table_exists(connection, name):
+            return None
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+
+        rows = connection.execute(
+            text(
+                f"""
+                UPDATE transaction_daily_rollups AS r
+                SET sum = r.sum - p.sum, count = r.count - p.count
+                FROM (
+                    SELECT
+                        t.user_id,
+                        (t.date AT TIME ZONE u.timezone)::date AS day,
+                        COALESCE(t.category_id, CAST(:uncategorized AS uuid)) AS category_id,
+                        t.type,
+                        SUM(t.amount) AS sum,
+                        COUNT(*) AS count
+                    FROM {name} AS t
+                    JOIN users AS u ON u.id = t.user_id
+                    GROUP BY 1, 2, 3, 4
+                ) AS p
+                WHERE r.user_id = p.user_id
+                    AND r.day = p.day
+                    AND r.category_id = p.category_id
+                    AND r.type = p.type
+                RETURNING r.user_id
+                """
+            ),
+            {"uncategorized": str(UNCATEGORIZED_ID)},
+        ).all()
+        connection.execute(text("DELETE FROM transaction_daily_rollups WHERE count <= 0"))
+        connection.execute(
+            text(
+                f"""
+                UPDATE user_monthly_spend AS s
+                SET expense = s.expense - p.expense, count = s.count - p.count
+                FROM (
+                    SELECT
+                        t.user_id,
+                        date_trunc('month', t.date AT TIME ZONE u.timezone)::date AS month,
+                        SUM(t.amount) AS expense,
+                        COUNT(*) AS count
+                    FROM {name} AS t
+                    JOIN users AS u ON u.id = t.user_id
+                    WHERE t.type = 'expense'
+                    GROUP BY 1, 2
+                ) AS p
+                WHERE s.user_id = p.user_id AND s.month = p.month
+                """
+            )
+        )
+        connection.execute(text("DELETE FROM user_monthly_spend WHERE count <= 0"))
+        # Changes the users' data, so their data versions (ETags, cache keys) move on
+        connection.execute(
+            text(
+                f"""
+                INSERT INTO user_data_versions (user_id, version, updated_at)
+                SELECT DISTINCT user_id, 1, now() FROM {name}
+                ON CONFLICT (user_id) DO UPDATE
+                SET version = user_data_versions.version + 1, updated_at = EXCLUDED.updated_at
+                """
+            )
+        )
+        connection.execute(text(f"ALTER TABLE {PARTITIONED_TABLE} DETACH PARTITION {name}"))
+
+    user_ids: Set[UUID] = {row.user_id for row in rows}
+    for user_id in user_ids:
+        summary_cache.bump_user(user_id)
+    return name
+
+
+if __name__ == "__main__":  # pragma: no cover - maintenance entry point
+    from app.core.database import engine
+
+    for created_name in ensure_transaction_partitions(engine):
+        print(f"Created partition {created_name}")
@@ -0,0 +1,490 @@
+"""
+Push notification delivery to registered device tokens.
+
+``PushDispatcher`` takes notification jobs (a notification and the users to
+send it to) on a queue, loads the active tokens of up to PUSH_BATCH_SIZE
+users with one query and fans the sends out to the provider of each device
+type:
+
+- ``FCMProvider``: Firebase Cloud Messaging HTTP v1 (android, web)
+- ``APNsProvider``: Apple Push Notification service (ios)
+- ``FakePushProvider``: in-process stand-in for tests and benchmarks
+
+Each provider keeps one pooled ``httpx.AsyncClient``, speaking HTTP/2 when
+the ``h2`` package is installed so the sends are multiplexed over a few
+connections; PUSH_CONCURRENCY bounds the requests in flight. Tokens a
+provider reports as no longer registered are deactivated with one UPDATE
+per batch; other failures are retried up to PUSH_MAX_RETRIES times with
+exponential backoff. Jobs queued together (e.g. budget alerts of many users)
+share the token queries.
+"""
+import asyncio
+import importlib.util
+import json
+import logging
+import random
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+import httpx
+from jose import jwt
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.crud.aio import user_device_token as aio_device_token
+from app.schemas.budget import BudgetAlert
+from app.schemas.push import PushNotification, PushResult
+
+logger = logging.getLogger(__name__)
+
+# Outcomes of PushProvider.send
+SENT = "sent"
+INVALID = "invalid"  # Token no longer registered: deactivate it
+FAILED = "failed"  # Anything else (PushDispatcher retries it)
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def build_http_client(concurrency: Optional[int] = None, **kwargs: Any) -> httpx.AsyncClient:
+    """Pooled client for a provider; HTTP/2 when h2 is installed."""
+    concurrency = concurrency or settings.PUSH_CONCURRENCY
+    return httpx.AsyncClient(
+        http2=http2_available(),
+        limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        timeout=httpx.Timeout(10.0),
+        **kwargs,
+    )
+
+
+class PushProvider(ABC):
+    """Sends one notification to one device token."""
+
+    @abstractmethod
+    async def send(self, token: str, notification: PushNotification) -> str:
+        """
+        Returns:
+            SENT, INVALID or FAILED
+        """
+
+    async def aclose(self) -> None:
+        pass
+
+
+class FakePushProvider(PushProvider):
+    """Records sends instead of delivering them; invalid_tokens are rejected as unregistered."""
+
+    def __init__(self, latency: float = 0.0, invalid_tokens: Iterable[str] = ()):
+        self.latency = latency
+        self.invalid_tokens = set(invalid_tokens)
+        self.sent: List[Tuple[str, PushNotification]] = []
+
+    async def send(self, token: str, notification: PushNotification) -> str:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if token in self.invalid_tokens:
+            return INVALID
+        self.sent.append((token, notification))
+        return SENT
+
+
+def _json_or_empty(response: httpx.Response) -> Dict[str, Any]:
+    try:
+        payload = response.json()
+    except ValueError:
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+class FCMProvider(PushProvider):
+    """Firebase Cloud Messaging HTTP v1, authenticated with a service account."""
+
+    SCOPE = "https://www.googleapis.com/auth/firebase.messaging"
+    DEFAULT_TOKEN_URI = "https://oauth2.googleapis.com/token"
+
+    def __init__(
+        self,
+        project_id: str,
+        credentials: Dict[str, Any],
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.project_id = project_id or credentials.get("project_id", "")
+        self._credentials = credentials
+        self._client = client or build_http_client()
+        self._url = f"https://fcm.googleapis.com/v1/projects/{self.project_id}/messages:send"
+        self._access_token: Optional[str] = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_file(cls, project_id: str, path: str, client: Optional[httpx.AsyncClient] = None) -> "FCMProvider":
+        with open(path) as f:
+            return cls(project_id, json.load(f), client=client)
+
+    async def _get_access_token(self) -> str:
+        # OAuth2 JWT-bearer grant; the access token is shared by all sends until
+        # shortly before it expires
+        if self._access_token and time.monotonic() < self._expires_at:
+            return self._access_token
+        async with self._lock:
+            if self._access_token and time.monotonic() < self._expires_at:
+                return self._access_token
+            token_uri = self._credentials.get("token_uri") or self.DEFAULT_TOKEN_URI
+            now = int(time.time())
+            assertion = jwt.encode(
+                {
+                    "iss": self._credentials["client_email"],
+                    "scope": self.SCOPE,
+                    "aud": token_uri,
+                    "iat": now,
+                    "exp": now + 3600,
+                },
+                self._credentials["private_key"],
+                algorithm="RS256",
+            )
+            response = await self._client.post(
+                token_uri,
+                data={"grant_type": "urn:ietf:params:oauth:grant-type:jwt-bearer", "assertion": assertion},
+            )
+            response.raise_for_status()
+            payload = response.json()
+            self._access_token = payload["access_token"]
+            self._expires_at = time.monotonic() + int(payload.get("expires_in", 3600)) - 60
+            return self._access_token
+
+    async def send(self, token: str, notification: PushNotification) -> str:
+        access_token = await self._get_access_token()
+        message: Dict[str, Any] = {
+            "token": token,
+            "notification": {"title": notification.title, "body": notification.body},
+        }
+        if notification.data:
+            message["data"] = notification.data
+        response = await self._client.post(
+            self._url,
+            json={"message": message},
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+        if response.status_code == 200:
+            return SENT
+        error = _json_or_empty(response).get("error") or {}
+        error_codes = {detail.get("errorCode") for detail in error.get("details", []) if isinstance(detail, dict)}
+        if response.status_code == 404 or "UNREGISTERED" in error_codes:
+            return INVALID
+        if response.status_code == 401:
+            self._access_token = None
+        return FAILED
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+class APNsProvider(PushProvider):
+    """Apple Push Notification service with token-based (.p8 key) auth; requires HTTP/2."""
+
+    # APNs rejects provider tokens older than an hour and throttles frequent refreshes
+    TOKEN_TTL_SECONDS = 50 * 60
+    # Reasons (HTTP 400) meaning the token itself is bad
+    INVALID_REASONS = {"BadDeviceToken", "DeviceTokenNotForTopic"}
+
+    def __init__(
+        self,
+        team_id: str,
+        key_id: str,
+        private_key: str,
+        topic: str,
+        use_sandbox: bool = False,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        if client is None and not http2_available():
+            raise RuntimeError("APNs requires HTTP/2: install the 'httpx[http2]' package")
+        self.team_id = team_id
+        self.key_id = key_id
+        self.topic = topic
+        self._private_key = private_key
+        self._client = client or build_http_client()
+        host = "api.sandbox.push.apple.com" if use_sandbox else "api.push.apple.com"
+        self._base_url = f"https://{host}/3/device/"
+        self._provider_token: Optional[str] = None
+        self._issued_at = 0.0
+
+    @classmethod
+    def from_file(
+        cls,
+        team_id: str,
+        key_id: str,
+        path: str,
+        topic: str,
+        use_sandbox: bool = False,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> "APNsProvider":
+        with open(path) as f:
+            return cls(team_id, key_id, f.read(), topic, use_sandbox=use_sandbox, client=client)
+
+    def _get_provider_token(self) -> str:
+        if self._provider_token is None or time.monotonic() - self._issued_at > self.TOKEN_TTL_SECONDS:
+            self._provider_token = jwt.encode(
+                {"iss": self.team_id, "iat": int(time.time())},
+                self._private_key,
+                algorithm="ES256",
+                headers={"kid": self.key_id},
+            )
+            self._issued_at = time.monotonic()
+        return self._provider_token
+
+    async def send(self, token: str, notification: PushNotification) -> str:
+        payload: Dict[str, Any] = {
+            **notification.data,
+            "aps": {"alert": {"title": notification.title, "body": notification.body}},
+        }
+        response = await self._client.post(
+            self._base_url + token,
+            json=payload,
+            headers={
+                "authorization": f"bearer {self._get_provider_token()}",
+                "apns-topic": self.topic,
+                "apns-push-type": "alert",
+            },
+        )
+        if response.status_code == 200:
+            return SENT
+        reason = _json_or_empty(response).get("reason")
+        if response.status_code == 410 or (response.status_code == 400 and reason in self.INVALID_REASONS):
+            return INVALID
+        if reason == "ExpiredProviderToken":
+            self._provider_token = None
+        return FAILED
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+# (user_id, notification) pairs: one job per user after expansion
+_Delivery = Tuple[UUID, PushNotification]
+
+
+def _notification_key(notification: PushNotification) -> Tuple[str, str, Tuple[Tuple[str, str], ...]]:
+    """Identifies a notification by its content, so equal notifications are sent to a device once."""
+    return notification.title, notification.body, tuple(sorted(notification.data.items()))
+
+
+class PushDispatcher:
+    """
+    Queue of push jobs delivered by a background task.
+
+    Call start() / stop() from the app's event loop (see app.main); dispatch()
+    delivers directly without the queue.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        providers: Dict[str, PushProvider],
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+    ):
+        self._session_factory = session_factory
+        self.providers = providers
+        self.batch_size = batch_size or settings.PUSH_BATCH_SIZE
+        self.concurrency = concurrency or settings.PUSH_CONCURRENCY
+        self.queue_size = queue_size or settings.PUSH_QUEUE_SIZE
+        self.max_retries = settings.PUSH_MAX_RETRIES if max_retries is None else max_retries
+        self.retry_backoff = settings.PUSH_RETRY_BACKOFF_SECONDS if retry_backoff is None else retry_backoff
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.providers)
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Deliver the jobs already queued, then stop the worker and close the providers."""
+        if self.running:
+            await self._queue.put(None)
+            await self._worker
+        self._queue = None
+        self._worker = None
+        for provider in set(self.providers.values()):
+            await provider.aclose()
+
+    def submit(self, user_ids: Iterable[UUID], notification: PushNotification) -> bool:
+        """
+        Queue a notification for users without waiting for delivery.
+
+        Returns:
+            False if the job was dropped (dispatcher not running or queue full)
+        """
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait([(user_id, notification) for user_id in user_ids])
+        except asyncio.QueueFull:
+            logger.warning("Push queue full, dropping notification %r", notification.title)
+            return False
+        return True
+
+    async def dispatch(self, user_ids: Iterable[UUID], notification: PushNotification) -> PushResult:
+        """Deliver a notification to every active token of the users."""
+        return await self._deliver([(user_id, notification) for user_id in user_ids])
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            deliveries: List[_Delivery] = []
+            job = await self._queue.get()
+            # Jobs waiting behind this one share its token queries
+            while job is not None:
+                deliveries.extend(job)
+                if len(deliveries) >= self.batch_size or self._queue.empty():
+                    break
+                job = self._queue.get_nowait()
+            stopping = job is None
+            if deliveries:
+                try:
+                    await self._deliver(deliveries)
+                except Exception:
+                    logger.exception("Push delivery failed")
+
+    async def _load_tokens(self, user_ids: Sequence[UUID]) -> List[Tuple[UUID, UUID, str, str]]:
+        async with self._session_factory() as db:
+            return await aio_device_token.get_active_tokens_for_users(db, user_ids)
+
+    async def _deliver(self, deliveries: List[_Delivery]) -> PushResult:
+        result = PushResult()
+        batches = [deliveries[i:i + self.batch_size] for i in range(0, len(deliveries), self.batch_size)]
+        if not batches:
+            return result
+        semaphore = asyncio.Semaphore(self.concurrency)
+        # The next batch's tokens load while the current batch is being sent
+        loading = asyncio.ensure_future(self._load_tokens(list({user_id for user_id, _ in batches[0]})))
+        try:
+            for index, batch in enumerate(batches):
+                rows = await loading
+                if index + 1 < len(batches):
+                    loading = asyncio.ensure_future(
+                        self._load_tokens(list({user_id for user_id, _ in batches[index + 1]}))
+                    )
+                await self._send_batch(batch, rows, semaphore, result)
+        finally:
+            loading.cancel()
+        return result
+
+    async def _send_batch(
+        self,
+        batch: List[_Delivery],
+        rows: List[Tuple[UUID, UUID, str, str]],
+        semaphore: asyncio.Semaphore,
+        result: PushResult,
+    ) -> None:
+        tokens_by_user: Dict[UUID, List[Tuple[UUID, str, str]]] = defaultdict(list)
+        for token_id, user_id, device_token, device_type in rows:
+            tokens_by_user[user_id].append((token_id, device_token, device_type))
+
+        sends = []
+        seen = set()
+        for user_id, notification in batch:
+            for token_id, device_token, device_type in tokens_by_user.get(user_id, ()):
+                provider = self.providers.get(device_type)
+                if provider is None:
+                    result.skipped += 1
+                    continue
+                # A device registered by several users gets each notification once
+                key = (device_token, _notification_key(notification))
+                if key in seen:
+                    continue
+                seen.add(key)
+                sends.append((token_id, self._send(semaphore, provider, device_token, notification)))
+
+        outcomes = await asyncio.gather(*(send for _, send in sends))
+        invalid = []
+        for (token_id, _), outcome in zip(sends, outcomes):
+            if outcome == SENT:
+                result.sent += 1
+            elif outcome == INVALID:
+                invalid.append(token_id)
+            else:
+                result.failed += 1
+        if invalid:
+            async with self._session_factory() as db:
+                result.deactivated += await aio_device_token.deactivate_device_tokens(db, invalid)
+
+    async def _send(
+        self,
+        semaphore: asyncio.Semaphore,
+        provider: PushProvider,
+        token: str,
+        notification: PushNotification,
+    ) -> str:
+        """Send with up to max_retries retries of FAILED outcomes (SENT and INVALID are final)."""
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                # Sleep outside the semaphore so other sends go on; jitter spreads
+                # the retries of a batch that failed together (e.g. provider outage)
+                delay = self.retry_backoff * 2 ** (attempt - 1)
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+            async with semaphore:
+                try:
+                    outcome = await provider.send(token, notification)
+                except Exception:
+                    logger.warning("Push send via %s failed", type(provider).__name__, exc_info=True)
+                    outcome = FAILED
+            if outcome != FAILED:
+                return outcome
+        return FAILED
+
+
+def build_push_providers() -> Dict[str, PushProvider]:
+    """Create the providers (by device_type) configured by PUSH_BACKEND."""
+    backend = (settings.PUSH_BACKEND or "").lower()
+    if backend == "fake":
+        fake = FakePushProvider()
+        return {"ios": fake, "android": fake, "web": fake}
+    providers: Dict[str, PushProvider] = {}
+    if backend == "live":
+        if settings.FCM_CREDENTIALS_FILE:
+            fcm = FCMProvider.from_file(settings.FCM_PROJECT_ID, settings.FCM_CREDENTIALS_FILE)
+            providers["android"] = providers["web"] = fcm
+        if settings.APNS_KEY_FILE:
+            providers["ios"] = APNsProvider.from_file(
+                settings.APNS_TEAM_ID,
+                settings.APNS_KEY_ID,
+                settings.APNS_KEY_FILE,
+                settings.APNS_TOPIC,
+                use_sandbox=settings.APNS_USE_SANDBOX,
+            )
+    return providers
+
+
+def get_budget_alert_notification(alert: BudgetAlert) -> PushNotification:
+    if alert.threshold >= 100:
+        title = "Monthly budget reached"
+    else:
+        title = f"{alert.threshold}% of your monthly budget used"
+    return PushNotification(
+        title=title,
+        body=f"You have spent {alert.spent} of your {alert.limit_amount} limit this month.",
+        data={"type": "budget_alert", "month": alert.month.isoformat(), "threshold": str(alert.threshold)},
+    )
+
+
+def push_budget_alert(alert: BudgetAlert) -> None:
+    """budget_alerts hook: queue a push to the alert's user."""
+    push_dispatcher.submit([alert.user_id], get_budget_alert_notification(alert))
+
+
+push_dispatcher = PushDispatcher(AsyncSessionLocal, build_push_providers())
@@ -0,0 +1,210 @@
+"""
+Token-bucket rate limiting for credential endpoints.
+
+Login and registration spend a full bcrypt round per attempt, so they are
+throttled per client IP and per username before any hashing happens. A bucket
+holds up to ``capacity`` attempts and refills continuously at
+``capacity / period``. Two backends are available:
+
+- ``MemoryRateLimitBackend``: in-process, bounded; budgets are per worker
+- ``RedisRateLimitBackend``: one atomic Lua script per attempt on a Redis
+  server, so every worker shares the same budgets
+
+``hit`` is a coroutine: the Redis backend awaits an asyncio client, so a burst
+of attempts never blocks the event loop on the network.
+"""
+import math
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Optional
+from app.core.config import settings
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+class RateLimit:
+    """A bucket size and the period it takes to refill completely."""
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.period = period
+
+    @property
+    def refill_rate(self) -> float:
+        """Tokens added per second."""
+        return self.capacity / self.period
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, RateLimit) and (self.capacity, self.period) == (other.capacity, other.period)
+
+    def __repr__(self) -> str:
+        return f"RateLimit(capacity={self.capacity}, period={self.period})"
+
+
+@lru_cache(maxsize=32)
+def parse_rate_limit(value: Optional[str]) -> Optional[RateLimit]:
+    """
+    Parse a limit like '20/minute' (units: second, minute, hour, day).
+
+    Returns:
+        None when the value is empty or '0' (limit disabled)
+
+    Raises:
+        ValueError: If the value is malformed
+    """
+    value = (value or "").strip().lower()
+    if value in ("", "0"):
+        return None
+    match = re.fullmatch(r"(\d+)\s*/\s*(second|minute|hour|day)s?", value)
+    if not match:
+        raise ValueError(f"Invalid rate limit: {value!r}")
+    capacity = int(match.group(1))
+    if capacity == 0:
+        return None
+    return RateLimit(capacity, _PERIODS[match.group(2)])
+
+
+class RateLimitBackend(ABC):
+    """Interface implemented by rate limit backends."""
+
+    @abstractmethod
+    async def hit(self, key: str, limit: RateLimit, cost: int = 1) -> float:
+        """
+        Take cost tokens from the bucket at key.
+
+        Returns:
+            0 if the attempt is allowed, otherwise seconds until it would be
+        """
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Thread-safe in-process token buckets, least recently used evicted first."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    async def hit(self, key: str, limit: RateLimit, cost: int = 1, now: Optional[float] = None) -> float:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (limit.capacity, now))
+            tokens = min(limit.capacity, tokens + max(now - updated_at, 0) * limit.refill_rate)
+            if tokens >= cost:
+                tokens -= cost
+                retry_after = 0.0
+            else:
+                retry_after = (cost - tokens) / limit.refill_rate
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            # An evicted bucket starts full again, which only errs on the lenient side
+            while len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+            return retry_after
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+# KEYS[1] = bucket; ARGV = capacity, refill rate (tokens/s), cost.
+# Uses the server clock so workers with skewed clocks agree; returns the
+# retry delay as a string because Lua numbers are truncated in replies.
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - ts, 0) * rate)
+local retry_after = 0
+if tokens >= cost then
+  tokens = tokens - cost
+else
+  retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(retry_after)
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Token buckets in Redis hashes, updated atomically by a Lua script.
+
+    ``client`` is an asyncio client (redis.asyncio.Redis): its scripts are
+    awaited.
+    """
+
+    def __init__(self, client: Any, prefix: str = "fm:rl:"):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "fm:rl:") -> "RedisRateLimitBackend":
+        """Create a backend using redis-py (optional dependency)."""
+        try:
+            import redis.asyncio
+        except ImportError as exc:  # pragma: no cover - depends on environment
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires the 'redis' package") from exc
+        return cls(redis.asyncio.Redis.from_url(url), prefix=prefix)
+
+    async def hit(self, key: str, limit: RateLimit, cost: int = 1) -> float:
+        result = await self._script(keys=[self.prefix + key], args=[limit.capacity, limit.refill_rate, cost])
+        if isinstance(result, bytes):
+            result = result.decode("utf-8")
+        return float(result)
+
+
+class RateLimiter:
+    """Named token buckets (e.g. 'login:ip') keyed by an identity."""
+
+    def __init__(self, backend: Optional[RateLimitBackend]):
+        self.backend = backend
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    async def hit(self, scope: str, identity: str, limit: Optional[RateLimit]) -> float:
+        """
+        Count one attempt of identity in scope.
+
+        Returns:
+            0 if allowed (or unlimited), otherwise the seconds to wait
+        """
+        if self.backend is None or limit is None:
+            return 0.0
+        return await self.backend.hit(f"{scope}:{identity}", limit)
+
+    def reset(self) -> None:
+        """Forget every bucket (in-process backend only)."""
+        if isinstance(self.backend, MemoryRateLimitBackend):
+            self.backend.clear()
+
+
+def retry_after_header(retry_after: float) -> str:
+    """Retry-After value (whole seconds, at least 1)."""
+    return str(max(math.ceil(retry_after), 1))
+
+
+def build_rate_limit_backend() -> Optional[RateLimitBackend]:
+    """Create the backend configured by RATE_LIMIT_BACKEND."""
+    backend = (settings.RATE_LIMIT_BACKEND or "").lower()
+    if backend == "memory":
+        return MemoryRateLimitBackend(max_entries=settings.CACHE_MAX_ENTRIES)
+    if backend == "redis":
+        return RedisRateLimitBackend.from_url(settings.RATE_LIMIT_URL or settings.CACHE_URL)
+    return None
+
+
+rate_limiter = RateLimiter(build_rate_limit_backend())
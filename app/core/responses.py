@@ -0,0 +1,64 @@
+"""
+orjson-backed JSON encoding for API responses and exports.
+
+Recent FastAPI versions serialize routes declaring a ``response_model`` with
+pydantic-core straight to JSON bytes, which beats any custom response class
+(a custom class forces a detour through Python dicts). Older versions encode
+those responses with ``jsonable_encoder`` + stdlib ``json``, several times
+slower; there ``FastJSONResponse`` becomes the app default.
+See scripts/bench_serialization.py for numbers.
+"""
+import inspect
+from decimal import Decimal
+from typing import Any, Type, Union
+import orjson
+from fastapi import routing
+from fastapi.datastructures import Default, DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from starlette.responses import Response
+
+
+def _default(value: Any) -> Any:
+    # Amounts keep their exact digits, as a string (same as the pydantic schemas)
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any, utc_z: bool = False) -> bytes:
+    """
+    Encode content as JSON with orjson.
+
+    UUID, datetime/date and Decimal (as str) are handled natively.
+
+    Args:
+        utc_z: Write UTC offsets as 'Z' (like pydantic) instead of '+00:00'
+    """
+    option = orjson.OPT_NON_STR_KEYS
+    if utc_z:
+        option |= orjson.OPT_UTC_Z
+    return orjson.dumps(content, default=_default, option=option)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by orjson, matching the pydantic JSON output."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content, utc_z=True)
+
+
+def fastapi_serializes_to_json() -> bool:
+    """Whether FastAPI dumps response_model routes straight to JSON bytes."""
+    return "dump_json" in inspect.signature(routing.serialize_response).parameters
+
+
+def get_default_response_class() -> Union[Type[Response], DefaultPlaceholder]:
+    """
+    Default response class for the app.
+
+    Returns FastAPI's own default where it already takes the pydantic-core
+    fast path (setting any class explicitly would disable it).
+    """
+    if fastapi_serializes_to_json():
+        return Default(JSONResponse)
+    return FastJSONResponse
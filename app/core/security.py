@@ -1,11 +1,21 @@
-from datetime import datetime, timedelta
-from typing import Optional
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
-from datetime import datetime, timezone
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes made with other rounds still verify and are flagged by needs_update,
+# so changing BCRYPT_ROUNDS upgrades users as they log in
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
+
+# bcrypt is CPU bound (and releases the GIL); a dedicated bounded pool keeps a
+# burst of logins from starving the event loop or the shared threadpool
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -18,6 +28,73 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+_dummy_password_hash: Optional[str] = None
+
+
+def get_dummy_password_hash() -> str:
+    """
+    A hash to verify against when the user doesn't exist.
+
+    Checking unknown usernames costs the same bcrypt round as known ones (so
+    timing doesn't reveal which usernames exist), without hashing every time.
+    """
+    global _dummy_password_hash
+    if _dummy_password_hash is None:
+        _dummy_password_hash = pwd_context.hash("dummy-password-for-unknown-users")
+    return _dummy_password_hash
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if the hash uses outdated settings.
+
+    Returns:
+        (verified, new hash or None if the stored hash is current)
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+async def _run_password_task(fn, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, fn, *args)
+
+
+async def verify_dummy_password_async(plain_password: str) -> None:
+    """Spend one verification on the dummy hash (unknown users)."""
+    await _run_password_task(lambda: verify_password(plain_password, get_dummy_password_hash()))
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the password hashing pool"""
+    return await _run_password_task(get_password_hash, password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """verify_and_update_password on the password hashing pool"""
+    return await _run_password_task(verify_and_update_password, plain_password, hashed_password)
+
+
+def get_token_data(user) -> dict:
+    """
+    Claims identifying a user in access and refresh tokens.
+
+    Besides the username (``sub``) tokens carry the immutable user id, role,
+    flags and the token version, so an access token is enough to build the
+    principal without reading the user.
+    """
+    role = getattr(user.role, "value", user.role)
+    return {
+        "sub": user.username,
+        "uid": str(user.id),
+        "role": role,
+        "act": bool(user.is_active),
+        "su": bool(user.is_superuser),
+        "tv": user.token_version or 0,
+    }
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     return _create_token(data, expires_delta, token_type="access")
@@ -0,0 +1,139 @@
+"""
+In-memory revocation check for stateless access tokens.
+
+Access tokens carry the user's ``token_version`` (claim ``tv``). A token is
+revoked once the user's version in the database moves past the one it was
+issued with. Instead of reading the user on every request, each process keeps
+a compact map of recently bumped versions and refreshes it every
+TOKEN_VERSION_REFRESH_SECONDS with one query for the rows whose
+``token_version_updated_at`` moved since the previous refresh. Writes made by
+this process are applied to the map immediately; writes made by other workers
+are seen after the next refresh.
+
+A bump only needs remembering while tokens issued before it can still be
+valid, so entries older than the access token lifetime are dropped and the
+map stays as small as the recent revocations.
+
+A deleted user has no row left to carry a version. The same refresh checks
+that the users who presented tokens since the previous one still exist, and
+revokes the tokens of those that don't.
+"""
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Set, Tuple
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.user import User
+
+# Re-read bumps this far behind the watermark: a bump committed late (or
+# stamped by a worker with a slower clock) is still picked up
+REFRESH_OVERLAP = timedelta(seconds=60)
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class TokenVersionMap:
+    """Per-user token versions, refreshed incrementally."""
+
+    def __init__(self, refresh_interval: float, retention: timedelta, chunk_size: int = 1000):
+        self.refresh_interval = refresh_interval
+        # How long a bump must be remembered: the access token lifetime
+        self.retention = retention
+        self.chunk_size = chunk_size
+        self._versions: Dict[UUID, Tuple[int, datetime]] = {}  # user_id -> (version, bumped_at)
+        self._deleted: Dict[UUID, datetime] = {}  # user_id -> noticed_at
+        self._seen: Set[UUID] = set()  # Users who presented tokens since the last refresh
+        self._watermark: Optional[datetime] = None
+        self._loaded_at: Optional[float] = None
+
+    def is_stale(self, now: Optional[float] = None) -> bool:
+        if self._loaded_at is None:
+            return True
+        now = time.monotonic() if now is None else now
+        return now - self._loaded_at >= self.refresh_interval
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """Load versions bumped since the last refresh and drop deleted users' tokens."""
+        previous = self._loaded_at
+        # Claim the refresh first so concurrent requests keep using the current map
+        self._loaded_at = time.monotonic()
+        seen, self._seen = self._seen, set()
+        now = datetime.now(timezone.utc)
+        since = now - self.retention if self._watermark is None else self._watermark - REFRESH_OVERLAP
+        try:
+            rows = (await db.execute(
+                select(User.id, User.token_version, User.token_version_updated_at)
+                .where(User.token_version_updated_at > since)
+            )).all()
+            existing = await self._existing(db, seen)
+        except Exception:
+            self._loaded_at = previous
+            self._seen |= seen
+            raise
+
+        for user_id, version, bumped_at in rows:
+            bumped_at = _as_utc(bumped_at)
+            self.set(user_id, version, bumped_at)
+            if self._watermark is None or bumped_at > self._watermark:
+                self._watermark = bumped_at
+        if self._watermark is None:
+            self._watermark = since
+        for user_id in seen - existing:
+            self.mark_deleted(user_id, now)
+
+        expired = now - self.retention - REFRESH_OVERLAP
+        self._versions = {
+            user_id: entry for user_id, entry in self._versions.items() if entry[1] > expired
+        }
+        self._deleted = {
+            user_id: noticed_at for user_id, noticed_at in self._deleted.items() if noticed_at > expired
+        }
+
+    async def _existing(self, db: AsyncSession, user_ids: Iterable[UUID]) -> Set[UUID]:
+        """The subset of user_ids still in the database (primary key lookups)."""
+        user_ids = list(user_ids)
+        existing: Set[UUID] = set()
+        for start in range(0, len(user_ids), self.chunk_size):
+            chunk = user_ids[start:start + self.chunk_size]
+            existing.update(await db.scalars(select(User.id).where(User.id.in_(chunk))))
+        return existing
+
+    async def refresh_if_stale(self, db: AsyncSession) -> None:
+        if self.is_stale():
+            await self.refresh(db)
+
+    def set(self, user_id: UUID, version: int, bumped_at: Optional[datetime] = None) -> None:
+        """Record a version (written by this process unless bumped_at comes from the database)."""
+        bumped_at = bumped_at or datetime.now(timezone.utc)
+        current = self._versions.get(user_id)
+        if current is None or version > current[0]:
+            self._versions[user_id] = (version, bumped_at)
+
+    def mark_deleted(self, user_id: UUID, noticed_at: Optional[datetime] = None) -> None:
+        self._deleted[user_id] = noticed_at or datetime.now(timezone.utc)
+        self._versions.pop(user_id, None)
+
+    def is_current(self, user_id: UUID, version: int) -> bool:
+        """Whether a token issued with version is still valid for the user."""
+        if user_id in self._deleted:
+            return False
+        self._seen.add(user_id)
+        current = self._versions.get(user_id)
+        return current is None or version >= current[0]
+
+    def clear(self) -> None:
+        self._versions = {}
+        self._deleted = {}
+        self._seen = set()
+        self._watermark = None
+        self._loaded_at = None
+
+
+token_versions = TokenVersionMap(
+    refresh_interval=settings.TOKEN_VERSION_REFRESH_SECONDS,
+    retention=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+)
@@ -0,0 +1,13 @@
+"""
+Async (AsyncSession) versions of the CRUD modules in app.crud, used by the API.
+
+The query logic lives in the sync modules. The functions here run it on the
+AsyncSession with ``run_sync`` (a greenlet on the event loop; every query is
+awaited through asyncpg/aiosqlite, no worker threads), except where a native
+async query is simpler: user lookups on every request and the streaming
+export. ORM results are returned as their response schemas, converted inside
+the greenlet, so callers never trigger lazy loads.
+"""
+from app.crud.aio import user, transaction, category, user_device_token
+
+__all__ = ["user", "transaction", "category", "user_device_token"]
@@ -0,0 +1,51 @@
+from functools import lru_cache
+from typing import Any, Callable, Type, TypeVar
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+S = TypeVar("S", bound=BaseModel)
+
+
+def to_schema(schema: Type[S], value: Any) -> Any:
+    """Convert an ORM object (or a list of them) to schema; None passes through."""
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return [schema.model_validate(item) for item in value]
+    return schema.model_validate(value)
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(tp: Any) -> TypeAdapter:
+    """TypeAdapter for tp, built once per type."""
+    return TypeAdapter(tp)
+
+
+async def run_sync(db: AsyncSession, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a sync CRUD function on the AsyncSession.
+
+    ``fn`` receives the AsyncSession's sync Session and runs in a greenlet on
+    the event loop; every query it makes is awaited through the async driver.
+    """
+    return await db.run_sync(fn, *args, **kwargs)
+
+
+async def run_sync_as(
+    db: AsyncSession,
+    schema: Type[S],
+    fn: Callable[..., Any],
+    *args: Any,
+    **kwargs: Any,
+) -> Any:
+    """
+    Like run_sync, converting the ORM result to schema inside the greenlet.
+
+    Relationships read by the schema are loaded there too, so the caller never
+    triggers a lazy load (which an AsyncSession doesn't allow).
+    """
+
+    def call(session):
+        return to_schema(schema, fn(session, *args, **kwargs))
+
+    return await db.run_sync(call)
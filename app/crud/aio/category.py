@@ -0,0 +1,75 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+from app.core.category_catalog import category_catalog
+from app.crud import category as crud_category
+from app.crud.aio.base import run_sync, run_sync_as
+from app.models.enums import CategoryType
+from app.schemas.category import Category, CategoryCreate, CategoryUpdate
+
+
+async def get_category(
+    db: AsyncSession,
+    category_id: UUID,
+    user_id: Optional[UUID] = None,
+) -> Optional[Category]:
+    """Get category by ID (visible categories come from the category catalog)"""
+    if user_id:
+        category = (await category_catalog.visible_async(db, user_id)).get(category_id)
+        if category is not None:
+            return category
+    return await run_sync_as(db, Category, crud_category.get_category, category_id, user_id)
+
+
+async def get_visible_category_ids(
+    db: AsyncSession, category_ids: Iterable[UUID], user_id: UUID
+) -> Set[UUID]:
+    """Return the subset of category_ids that exist and are visible to the user."""
+    return await run_sync(db, crud_category.get_visible_category_ids, category_ids, user_id)
+
+
+async def get_categories_cursor(
+    db: AsyncSession,
+    user_id: Optional[UUID] = None,
+    type: Optional[CategoryType] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Category], Optional[str], bool]:
+    """
+    Get categories with cursor-based pagination.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or tampered with
+    """
+
+    def call(session):
+        items, next_cursor, has_next = crud_category.get_categories_cursor(
+            session, user_id=user_id, type=type, limit=limit, cursor=cursor
+        )
+        return [Category.model_validate(item) for item in items], next_cursor, has_next
+
+    return await run_sync(db, call)
+
+
+async def create_category(
+    db: AsyncSession, category: CategoryCreate, user_id: Optional[UUID] = None
+) -> Category:
+    """Create a new category"""
+    return await run_sync_as(db, Category, crud_category.create_category, category, user_id)
+
+
+async def update_category(
+    db: AsyncSession,
+    category_id: UUID,
+    category_update: CategoryUpdate,
+    user_id: Optional[UUID] = None,
+) -> Optional[Category]:
+    """Update a category"""
+    return await run_sync_as(
+        db, Category, crud_category.update_category, category_id, category_update, user_id
+    )
+
+
+async def delete_category(db: AsyncSession, category_id: UUID, user_id: Optional[UUID] = None) -> bool:
+    """Delete a category"""
+    return await run_sync(db, crud_category.delete_category, category_id, user_id)
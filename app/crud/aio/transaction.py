@@ -0,0 +1,327 @@
+from datetime import date, datetime
+from decimal import Decimal
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+from app.core.category_catalog import category_catalog
+from app.crud import transaction as crud_transaction
+from app.crud.aio.base import get_type_adapter, run_sync, run_sync_as
+from app.schemas.budget import BudgetStatus
+from app.schemas.category import Category
+from app.schemas.transaction import (
+    Transaction,
+    TransactionBatchOperation,
+    TransactionBatchResult,
+    TransactionCreate,
+    TransactionGroupedResponse,
+    TransactionImportResult,
+    TransactionPeriodSummary,
+    TransactionSeries,
+    TransactionUpdate,
+)
+
+EXPORT_COLUMNS = crud_transaction.EXPORT_COLUMNS
+
+
+async def get_transaction(db: AsyncSession, transaction_id: UUID, user_id: UUID) -> Optional[Transaction]:
+    """Get transaction by ID for a specific user"""
+    return await run_sync_as(
+        db, Transaction, crud_transaction.get_transaction, transaction_id, user_id, load_category=True
+    )
+
+
+def transactions_from_rows(
+    rows: Sequence[Any], user_id: UUID, categories: Dict[UUID, Category]
+) -> List[Transaction]:
+    """
+    Build Transaction schemas from TRANSACTION_LIST_COLUMNS rows.
+
+    The rows are plain tuples, so validating them as dicts with a cached
+    TypeAdapter is cheap (and faster than model_construct, which runs in
+    Python); ORM instances never take this path.
+
+    Args:
+        categories: Category schemas by id (from the category catalog)
+    """
+    items = []
+    for row in rows:
+        items.append({
+            "id": row.id,
+            "user_id": user_id,
+            "amount": row.amount,
+            "name": row.name,
+            "type": row.type,
+            "description": row.description,
+            "date": row.date,
+            "category_id": row.category_id,
+            "category": categories.get(row.category_id),
+            "created_at": row.created_at,
+            "updated_at": row.updated_at,
+        })
+    return get_type_adapter(List[Transaction]).validate_python(items)
+
+
+async def get_transaction_list_cursor(
+    db: AsyncSession,
+    user_id: UUID,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    type: Optional[str] = None,
+    category_id: Optional[UUID] = None,
+    normalize_dates: bool = True,
+) -> Tuple[List[Transaction], Optional[str], bool]:
+    """
+    Transaction list page from one column-projected query.
+
+    See app.crud.transaction.get_transaction_rows_cursor; schemas are built
+    straight from the rows, with categories from the category catalog.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or tampered with
+    """
+
+    def call(session):
+        return crud_transaction.get_transaction_rows_cursor(
+            session,
+            user_id=user_id,
+            limit=limit,
+            cursor=cursor,
+            start_date=start_date,
+            end_date=end_date,
+            type=type,
+            category_id=category_id,
+            normalize_dates=normalize_dates,
+        )
+
+    rows, next_cursor, has_next = await run_sync(db, call)
+    categories = await category_catalog.resolve_async(db, user_id, {row.category_id for row in rows})
+    return transactions_from_rows(rows, user_id, categories), next_cursor, has_next
+
+
+async def iter_transactions_for_export(
+    db: AsyncSession,
+    user_id: UUID,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    type: Optional[str] = None,
+    category_id: Optional[UUID] = None,
+    normalize_dates: bool = True,
+    batch_size: int = 1000,
+) -> AsyncIterator[Sequence[Sequence]]:
+    """
+    Stream transactions for export in batches of plain row tuples (see EXPORT_COLUMNS).
+
+    Rows come from a server-side cursor, one batch of batch_size per fetch.
+    """
+    stmt = crud_transaction.get_export_query(
+        user_id=user_id,
+        start_date=start_date,
+        end_date=end_date,
+        type=type,
+        category_id=category_id,
+        normalize_dates=normalize_dates,
+        batch_size=batch_size,
+        timezone=await run_sync(
+            db, crud_transaction.get_filter_timezone, user_id, start_date, end_date, normalize_dates
+        ),
+    )
+    result = await db.stream(stmt)
+    try:
+        async for partition in result.partitions():
+            yield partition
+    finally:
+        await result.close()
+
+
+async def get_data_version(db: AsyncSession, user_id: UUID) -> int:
+    """Return the version of the user's transaction data, for ETags."""
+    return await run_sync(db, crud_transaction.get_data_version, user_id)
+
+
+async def get_grouped_transactions(
+    db: AsyncSession,
+    user_id: UUID,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    type: Optional[str] = None,
+    category_id: Optional[UUID] = None,
+    include_breakdown: bool = False,
+    timezone: Optional[str] = None,
+    week_start: int = 0,
+    limit_amount: Optional[Decimal] = None,
+) -> TransactionGroupedResponse:
+    """
+    Totals (and optionally the timeframe breakdown) for the current year, in the user's timezone.
+
+    The breakdown's queries run on the AsyncSession; bucketing the rows and
+    building the nested schemas is CPU-only work, so it runs in a worker thread.
+    """
+    if not include_breakdown:
+        return await run_sync(
+            db,
+            crud_transaction.get_grouped_transactions,
+            user_id=user_id,
+            start_date=start_date,
+            end_date=end_date,
+            type=type,
+            category_id=category_id,
+            timezone=timezone,
+            week_start=week_start,
+            limit_amount=limit_amount,
+        )
+    transactions, anchors, budget = await run_sync(
+        db,
+        crud_transaction.get_grouped_breakdown_rows,
+        user_id=user_id,
+        start_date=start_date,
+        end_date=end_date,
+        type=type,
+        category_id=category_id,
+        timezone=timezone,
+        week_start=week_start,
+        limit_amount=limit_amount,
+    )
+    categories = await category_catalog.resolve_async(db, user_id, {tx.category_id for tx, _ in transactions})
+    return await run_in_threadpool(
+        crud_transaction.build_grouped_breakdown, transactions, categories, anchors, budget
+    )
+
+
+async def get_transaction_period_summary(
+    db: AsyncSession,
+    user_id: UUID,
+    timeframe: str,
+    now: Optional[datetime] = None,
+    timezone: Optional[str] = None,
+    week_start: int = 0,
+    limit_amount: Optional[Decimal] = None,
+) -> TransactionPeriodSummary:
+    """
+    Totals and category breakdown for a timeframe keyword.
+
+    Raises:
+        ValueError: If the timeframe is not supported
+    """
+    timeframe, start_date, end_date, category_rows, budget = await run_sync(
+        db,
+        crud_transaction.get_period_summary_rows,
+        user_id=user_id,
+        timeframe=timeframe,
+        now=now,
+        timezone=timezone,
+        week_start=week_start,
+        limit_amount=limit_amount,
+    )
+    categories = await category_catalog.resolve_async(
+        db, user_id, crud_transaction.summary_category_ids(category_rows)
+    )
+    return crud_transaction.build_period_summary(
+        timeframe, start_date, end_date, category_rows, categories, budget
+    )
+
+
+async def get_transaction_series(
+    db: AsyncSession,
+    user_id: UUID,
+    granularity: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    type: Optional[str] = None,
+    category_id: Optional[UUID] = None,
+    today: Optional[date] = None,
+    timezone: Optional[str] = None,
+    week_start: int = 0,
+) -> TransactionSeries:
+    """
+    Gap-filled income/expense totals per day, week or month.
+
+    Raises:
+        ValueError: If the granularity or range is invalid
+    """
+    return await run_sync(
+        db,
+        crud_transaction.get_transaction_series,
+        user_id=user_id,
+        granularity=granularity,
+        start_date=start_date,
+        end_date=end_date,
+        type=type,
+        category_id=category_id,
+        today=today,
+        timezone=timezone,
+        week_start=week_start,
+    )
+
+
+async def get_budget_status(
+    db: AsyncSession,
+    user_id: UUID,
+    limit_amount: Decimal,
+    timezone: Optional[str] = None,
+    now: Optional[datetime] = None,
+) -> BudgetStatus:
+    """The user's spend against limit_amount for the current month."""
+    return await run_sync(
+        db,
+        crud_transaction.get_budget_status,
+        user_id=user_id,
+        limit_amount=limit_amount,
+        timezone=timezone,
+        now=now,
+    )
+
+
+async def create_transaction(db: AsyncSession, transaction: TransactionCreate, user_id: UUID) -> Transaction:
+    """Create a new transaction"""
+    return await run_sync_as(db, Transaction, crud_transaction.create_transaction, transaction, user_id)
+
+
+async def update_transaction(
+    db: AsyncSession,
+    transaction_id: UUID,
+    transaction_update: TransactionUpdate,
+    user_id: UUID,
+) -> Optional[Transaction]:
+    """Update a transaction"""
+    return await run_sync_as(
+        db, Transaction, crud_transaction.update_transaction, transaction_id, transaction_update, user_id
+    )
+
+
+async def delete_transaction(db: AsyncSession, transaction_id: UUID, user_id: UUID) -> bool:
+    """Delete a transaction"""
+    return await run_sync(db, crud_transaction.delete_transaction, transaction_id, user_id)
+
+
+async def import_transactions(db: AsyncSession, rows: List[dict], user_id: UUID) -> TransactionImportResult:
+    """
+    Validate and bulk-insert raw rows; see app.crud.transaction.import_transactions.
+
+    Validating and building up to IMPORT_MAX_ROWS rows is CPU-only work, so it
+    runs in a worker thread; only the queries (categories, INSERTs, rollup
+    upserts) run on the AsyncSession.
+    """
+    valid, errors = await run_in_threadpool(crud_transaction.validate_import_rows, rows)
+    zone, visible_categories = await run_sync(db, crud_transaction.get_import_context, valid, user_id)
+    insert_rows, deltas, category_errors = await run_in_threadpool(
+        crud_transaction.prepare_import_rows, valid, visible_categories, user_id, zone
+    )
+    imported = await run_sync(db, crud_transaction.insert_import_rows, user_id, insert_rows, deltas)
+    return crud_transaction.build_import_result(len(rows), imported, errors + category_errors)
+
+
+async def apply_transaction_batch(
+    db: AsyncSession,
+    operations: Sequence[TransactionBatchOperation],
+    user_id: UUID,
+) -> List[TransactionBatchResult]:
+    """
+    Apply create/update/delete operations in one DB transaction.
+
+    Raises:
+        ValueError: If an operation references a category the user can't see
+    """
+    return await run_sync(db, crud_transaction.apply_transaction_batch, operations, user_id)
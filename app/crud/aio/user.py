@@ -0,0 +1,132 @@
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from uuid import UUID
+from app.core.cache import principal_cache, summary_cache
+from app.core.token_versions import token_versions
+from app.core.security import (
+    get_password_hash_async,
+    verify_and_update_password_async,
+    verify_dummy_password_async,
+)
+from app.crud.aio.base import run_sync
+from app.crud import transaction as crud_transaction
+from app.crud.user import build_user, bump_token_version_if_needed, get_user_update_data
+from app.models.user import User
+from app.schemas.user import UserCreate, UserUpdate
+
+# Users are read on login and profile requests, so this module queries the
+# AsyncSession natively instead of going through run_sync. bcrypt is CPU
+# bound and runs on the password hashing pool (see app.core.security).
+
+
+async def get_user(db: AsyncSession, user_id: UUID) -> Optional[User]:
+    """Get user by ID"""
+    return await db.scalar(select(User).where(User.id == user_id).limit(1))
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    """Get user by email"""
+    return await db.scalar(select(User).where(User.email == email).limit(1))
+
+
+async def get_user_by_username(db: AsyncSession, username: str) -> Optional[User]:
+    """Get user by username"""
+    return await db.scalar(
+        select(User).where(or_(User.username == username, User.email == username)).limit(1)
+    )
+
+
+async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[User]:
+    """Get all users with pagination"""
+    result = await db.scalars(select(User).offset(skip).limit(limit))
+    return list(result)
+
+
+async def create_user(db: AsyncSession, user: UserCreate) -> User:
+    """Create a new user"""
+    # Guard against duplicate username/email before insert
+    existing = await db.scalar(
+        select(User).where(or_(User.username == user.username, User.email == user.email)).limit(1)
+    )
+    if existing:
+        raise ValueError("Username or email already registered")
+
+    hashed_password = await get_password_hash_async(user.password)
+    db_user = build_user(user, hashed_password)
+    db.add(db_user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # In case a concurrent insert slipped in between the pre-check and commit
+        await db.rollback()
+        raise ValueError("Username or email already registered")
+    await db.refresh(db_user)
+    return db_user
+
+
+async def update_user(db: AsyncSession, user_id: UUID, user_update: UserUpdate) -> Optional[User]:
+    """Update user information"""
+    db_user = await get_user(db, user_id)
+    if not db_user:
+        return None
+    old_subjects = (db_user.username, db_user.email)
+
+    update_data = get_user_update_data(user_update)
+    bump_token_version_if_needed(db_user, update_data)
+    if "password" in update_data:
+        update_data["hashed_password"] = await get_password_hash_async(update_data.pop("password"))
+    timezone_changed = update_data.get("timezone", db_user.timezone) != db_user.timezone
+
+    for field, value in update_data.items():
+        setattr(db_user, field, value)
+    if timezone_changed:
+        # Rollups are kept on the user's local days
+        # Python aggregation (when the database can't group by local day) runs in a worker thread
+        rows = await run_sync(db, crud_transaction.start_rollup_rebuild, db_user.id, db_user.timezone)
+        rollups = []
+        if rows is not None:
+            rollups = await run_in_threadpool(
+                crud_transaction.aggregate_rollup_rows, rows, db_user.id, db_user.timezone
+            )
+        await run_sync(db, crud_transaction.finish_rollup_rebuild, db_user.id, rollups)
+
+    await db.commit()
+    # Cached principals may be keyed by the old or the new username/email
+    await principal_cache.invalidate_async(*old_subjects, db_user.username, db_user.email)
+    if timezone_changed:
+        await summary_cache.bump_user_async(db_user.id)
+    await db.refresh(db_user)
+    token_versions.set(db_user.id, db_user.token_version)
+    return db_user
+
+
+async def delete_user(db: AsyncSession, user_id: UUID) -> bool:
+    """Delete a user"""
+    db_user = await get_user(db, user_id)
+    if not db_user:
+        return False
+
+    await db.delete(db_user)
+    await db.commit()
+    await principal_cache.invalidate_async(db_user.username, db_user.email)
+    token_versions.mark_deleted(db_user.id)
+    return True
+
+
+async def authenticate_user(db: AsyncSession, username: str, password: str) -> Optional[User]:
+    """Authenticate user with username and password"""
+    user = await get_user_by_username(db, username)
+    if not user:
+        await verify_dummy_password_async(password)
+        return None
+    verified, new_hash = await verify_and_update_password_async(password, user.hashed_password)
+    if not verified:
+        return None
+    if new_hash is not None:
+        # Stored with outdated bcrypt settings (e.g. BCRYPT_ROUNDS changed)
+        user.hashed_password = new_hash
+        await db.commit()
+    return user
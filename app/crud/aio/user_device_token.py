@@ -0,0 +1,71 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Sequence, Tuple
+from uuid import UUID
+from app.crud import user_device_token as crud_device_token
+from app.crud.aio.base import run_sync, run_sync_as
+from app.schemas.user_device_token import (
+    UserDeviceToken,
+    UserDeviceTokenCreate,
+    UserDeviceTokenUpdate,
+)
+
+
+async def get_device_token(db: AsyncSession, token_id: UUID, user_id: UUID) -> Optional[UserDeviceToken]:
+    """Get device token by ID for a specific user"""
+    return await run_sync_as(db, UserDeviceToken, crud_device_token.get_device_token, token_id, user_id)
+
+
+async def get_device_tokens_by_user(
+    db: AsyncSession, user_id: UUID, active_only: bool = False
+) -> List[UserDeviceToken]:
+    """Get all device tokens for a user"""
+    return await run_sync_as(
+        db, UserDeviceToken, crud_device_token.get_device_tokens_by_user, user_id, active_only
+    )
+
+
+async def create_or_update_device_token(
+    db: AsyncSession, device_token: UserDeviceTokenCreate, user_id: UUID
+) -> UserDeviceToken:
+    """Create a new device token or update if device_id already exists for this user."""
+    return await run_sync_as(
+        db, UserDeviceToken, crud_device_token.create_or_update_device_token, device_token, user_id
+    )
+
+
+async def update_device_token(
+    db: AsyncSession,
+    token_id: UUID,
+    token_update: UserDeviceTokenUpdate,
+    user_id: UUID,
+) -> Optional[UserDeviceToken]:
+    """Update a device token"""
+    return await run_sync_as(
+        db, UserDeviceToken, crud_device_token.update_device_token, token_id, token_update, user_id
+    )
+
+
+async def delete_device_token(db: AsyncSession, token_id: UUID, user_id: UUID) -> bool:
+    """Delete a device token"""
+    return await run_sync(db, crud_device_token.delete_device_token, token_id, user_id)
+
+
+async def deactivate_device_token(
+    db: AsyncSession, token_id: UUID, user_id: UUID
+) -> Optional[UserDeviceToken]:
+    """Deactivate a device token (soft delete)"""
+    return await run_sync_as(
+        db, UserDeviceToken, crud_device_token.deactivate_device_token, token_id, user_id
+    )
+
+
+async def get_active_tokens_for_users(
+    db: AsyncSession, user_ids: Sequence[UUID]
+) -> List[Tuple[UUID, UUID, str, str]]:
+    """Active (token id, user_id, device_token, device_type) of many users in one query"""
+    return await run_sync(db, crud_device_token.get_active_tokens_for_users, user_ids)
+
+
+async def deactivate_device_tokens(db: AsyncSession, token_ids: Sequence[UUID]) -> int:
+    """Deactivate many device tokens in one UPDATE"""
+    return await run_sync(db, crud_device_token.deactivate_device_tokens, token_ids)
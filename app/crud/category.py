@@ -1,14 +1,31 @@
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import exists, or_
+from sqlalchemy import ColumnElement, select, true, union
 from app.models.category import Category
 from app.models.user_category import UserCategory
-from app.schemas.category import CategoryCreate, CategoryUpdate
-from app.core.pagination import paginate_with_cursor
-from typing import Optional, List, Tuple
+from app.schemas.category import Category as CategorySchema, CategoryCreate, CategoryUpdate
+from app.core.category_catalog import category_catalog
+from app.core.pagination import decode_cursor, encode_cursor, paginate_with_cursor
+from typing import Optional, List, Tuple, Iterable, Set
 from uuid import UUID
 from app.models.enums import CategoryType
 
 
+def visible_to(user_id: UUID) -> ColumnElement[bool]:
+    """
+    Filter for categories visible to a user: global ones plus the user's own.
+
+    Written as ``id IN (global ids UNION linked ids)`` so each branch is read
+    from an index (ix_categories_global_id, the user_categories primary key)
+    instead of probing user_categories once per category row.
+    """
+    return Category.id.in_(
+        union(
+            select(Category.id).where(Category.is_global == true()),
+            select(UserCategory.category_id).where(UserCategory.user_id == user_id),
+        )
+    )
+
+
 def get_category(
     db: Session, 
     category_id: UUID, 
@@ -24,14 +41,7 @@ def get_category(
     query = db.query(Category).filter(Category.id == category_id)
 
     if user_id:
-        query = query.filter(
-            or_(
-                exists().where(
-                    (UserCategory.category_id == Category.id) & (UserCategory.user_id == user_id)
-                ),
-                ~exists().where(UserCategory.category_id == Category.id),
-            )
-        )
+        query = query.filter(visible_to(user_id))
 
     if load_user:
         query = query.options(joinedload(Category.users))
@@ -39,6 +49,27 @@ def get_category(
     return query.first()
 
 
+def get_visible_category_ids(db: Session, category_ids: Iterable[UUID], user_id: UUID) -> Set[UUID]:
+    """
+    Return the subset of category_ids that exist and are visible to the user.
+
+    Answered from the category catalog; only ids missing from it (e.g. created
+    since the catalog was loaded) are checked in the database.
+    """
+    category_ids = set(category_ids)
+    if not category_ids:
+        return set()
+
+    visible = category_catalog.visible(db, user_id)
+    found = {category_id for category_id in category_ids if category_id in visible}
+    missing = category_ids - found
+    if not missing:
+        return found
+
+    rows = db.query(Category.id).filter(Category.id.in_(missing), visible_to(user_id))
+    return found | {row.id for row in rows}
+
+
 def get_categories(
     db: Session,
     user_id: Optional[UUID] = None,
@@ -53,14 +84,7 @@ def get_categories(
     query = db.query(Category)
 
     if user_id:
-        query = query.filter(
-            or_(
-                exists().where(
-                    (UserCategory.category_id == Category.id) & (UserCategory.user_id == user_id)
-                ),
-                ~exists().where(UserCategory.category_id == Category.id),
-            )
-        )
+        query = query.filter(visible_to(user_id))
 
     if type:
         query = query.filter(Category.type == type)
@@ -73,9 +97,9 @@ def get_categories_cursor(
     user_id: Optional[UUID] = None,
     type: Optional[CategoryType] = None,
     limit: int = 20,
-    cursor: Optional[UUID] = None,
+    cursor: Optional[str] = None,
     load_user: bool = False
-) -> Tuple[List[Category], Optional[UUID], bool]:
+) -> Tuple[List[Category], Optional[str], bool]:
     """
     Get categories with cursor-based pagination.
     
@@ -83,23 +107,22 @@ def get_categories_cursor(
         user_id: Filter by user ID (None for global categories)
         type: Filter by category type ('income' or 'expense')
         limit: Number of items per page (default: 20, max: 100)
-        cursor: UUID7 cursor from previous page (None for first page)
+        cursor: Opaque cursor from previous page (None for first page)
         load_user: If True, eager load user relationship (prevents N+1)
     
     Returns:
         Tuple of (items, next_cursor, has_next)
+    
+    Raises:
+        InvalidCursorError: If the cursor is malformed or tampered with
     """
+    if user_id and not load_user:
+        return _paginate_catalog(db, user_id, type, limit, cursor)
+
     query = db.query(Category)
 
     if user_id:
-        query = query.filter(
-            or_(
-                exists().where(
-                    (UserCategory.category_id == Category.id) & (UserCategory.user_id == user_id)
-                ),
-                ~exists().where(UserCategory.category_id == Category.id),
-            )
-        )
+        query = query.filter(visible_to(user_id))
 
     if type:
         query = query.filter(Category.type == type)
@@ -107,7 +130,7 @@ def get_categories_cursor(
     if load_user:
         query = query.options(joinedload(Category.users))
 
-    # Use cursor-based pagination with UUID7
+    # Keyset pagination on the UUID7 id
     return paginate_with_cursor(
         query=query,
         cursor_column=Category.id,
@@ -117,14 +140,53 @@ def get_categories_cursor(
     )
 
 
+def _paginate_catalog(
+    db: Session,
+    user_id: UUID,
+    type: Optional[CategoryType],
+    limit: int,
+    cursor: Optional[str],
+) -> Tuple[List[CategorySchema], Optional[str], bool]:
+    """Same pages as get_categories_cursor, served from the category catalog."""
+    limit = max(min(limit, 100), 1)
+    items = sorted(category_catalog.visible(db, user_id).values(), key=lambda item: item.id, reverse=True)
+    if type:
+        items = [item for item in items if item.type == type]
+    if cursor:
+        (last_id,) = decode_cursor(cursor, [Category.id])
+        items = [item for item in items if item.id < last_id]
+
+    has_next = len(items) > limit
+    items = items[:limit]
+    next_cursor = encode_cursor([items[-1].id]) if has_next else None
+    return items, next_cursor, has_next
+
+
+def _bump_catalog(db: Session, db_category: Category, was_global: bool) -> None:
+    """Retire the catalog versions that can show the category (before commit)."""
+    if was_global or db_category.is_global:
+        category_catalog.bump_global(db)
+        return
+    # A category can be linked to several users
+    links = db.query(UserCategory.user_id).filter(UserCategory.category_id == db_category.id)
+    for (linked_user_id,) in links:
+        category_catalog.bump_user(db, linked_user_id)
+
+
 def create_category(db: Session, category: CategoryCreate, user_id: Optional[UUID] = None) -> Category:
     """Create a new category"""
-    db_category = Category(**category.model_dump())
+    db_category = Category(**category.model_dump(), is_global=user_id is None)
     db.add(db_category)
     if user_id:
+        # The id is assigned on flush; the link needs it
+        db.flush()
         db.add(UserCategory(user_id=user_id, category_id=db_category.id))
+        category_catalog.bump_user(db, user_id)
+    else:
+        category_catalog.bump_global(db)
 
     db.commit()
+    category_catalog.publish_pending(db)
     db.refresh(db_category)
     return db_category
 
@@ -140,11 +202,14 @@ def update_category(
     if not db_category:
         return None
     
+    was_global = db_category.is_global
     update_data = category_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_category, field, value)
+    _bump_catalog(db, db_category, was_global)
     
     db.commit()
+    category_catalog.publish_pending(db)
     db.refresh(db_category)
     return db_category
 
@@ -155,6 +220,8 @@ def delete_category(db: Session, category_id: UUID, user_id: Optional[UUID] = No
     if not db_category:
         return False
     
+    _bump_catalog(db, db_category, db_category.is_global)
     db.delete(db_category)
     db.commit()
+    category_catalog.publish_pending(db)
     return True
@@ -1,5 +1,14 @@
+from pydantic import ValidationError
+from sqlalchemy import Date, DateTime, Select, func, case, cast, literal, literal_column, select, insert, update, delete, bindparam
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session, selectinload, joinedload
+from sqlalchemy.orm.exc import StaleDataError
+from app.models.category import Category
 from app.models.transaction import Transaction
+from app.models.user import User
+from app.models.transaction_daily_rollup import TransactionDailyRollup, UNCATEGORIZED_ID
+from app.models.user_monthly_spend import UserMonthlySpend
+from app.models.user_data_version import UserDataVersion
 from app.schemas.transaction import (
     TransactionCreate,
     TransactionUpdate,
@@ -10,11 +19,23 @@ from app.schemas.transaction import (
     TransactionGroupItem,
     TransactionCategorySummary,
     TransactionPeriodSummary,
+    TransactionSeries,
+    TransactionSeriesPoint,
+    TransactionImportError,
+    TransactionImportResult,
+    TransactionBatchOperation,
+    TransactionBatchResult,
 )
+from app.schemas.budget import BudgetAlert, BudgetStatus
+from app.core.budget import budget_alerts, get_crossed_thresholds, get_reached_thresholds
+from app.core.cache import summary_cache
+from app.core.category_catalog import category_catalog
 from app.core.pagination import paginate_with_cursor
-from app.core.date_utils import parse_date_range, get_start_of_day, get_end_of_day
-from typing import Optional, List, Tuple, Dict
-from datetime import datetime, timedelta, timezone as dt_timezone
+from app.core.uuid7 import uuid7
+from app.crud.category import get_visible_category_ids
+from app.core.date_utils import parse_date_range, get_start_of_day, get_end_of_day, get_zone
+from typing import Any, Optional, List, Set, Tuple, Dict, Iterator, Sequence
+from datetime import date, datetime, timedelta, timezone as dt_timezone, tzinfo
 from decimal import Decimal, ROUND_FLOOR
 from uuid import UUID
 
@@ -22,13 +43,19 @@ from uuid import UUID
 TIMEFRAME_ORDER = ["today", "yesterday", "this_week", "this_month", "this_year"]
 TIMEFRAME_SET = set(TIMEFRAME_ORDER)
 
+SERIES_GRANULARITIES = ("day", "week", "month")
+# Buckets returned when no start date is given
+SERIES_DEFAULT_POINTS = {"day": 30, "week": 12, "month": 12}
+SERIES_MAX_POINTS = 1000
+
 
 def get_transaction(
     db: Session, 
     transaction_id: UUID, 
     user_id: UUID,
     load_category: bool = False,
-    load_user: bool = False
+    load_user: bool = False,
+    for_update: bool = False
 ) -> Optional[Transaction]:
     """
     Get transaction by ID for a specific user.
@@ -36,6 +63,7 @@ def get_transaction(
     Args:
         load_category: If True, eager load category relationship (prevents N+1)
         load_user: If True, eager load user relationship (prevents N+1)
+        for_update: If True, lock the row until commit (SELECT ... FOR UPDATE)
     """
     query = db.query(Transaction).filter(
         Transaction.id == transaction_id,
@@ -47,6 +75,8 @@ def get_transaction(
         query = query.options(joinedload(Transaction.category))
     if load_user:
         query = query.options(joinedload(Transaction.user))
+    if for_update:
+        query = query.with_for_update()
     
     return query.first()
 
@@ -91,45 +121,52 @@ def get_transactions_cursor(
     db: Session,
     user_id: UUID,
     limit: int = 20,
-    cursor: Optional[UUID] = None,
+    cursor: Optional[str] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     type: Optional[str] = None,
     category_id: Optional[UUID] = None,
     load_category: bool = False,
     normalize_dates: bool = True
-) -> Tuple[List[Transaction], Optional[UUID], bool]:
+) -> Tuple[List[Transaction], Optional[str], bool]:
     """
     Get transactions for a user with cursor-based pagination.
     
     Cursor pagination works correctly with date filters because:
     1. Date filters are applied BEFORE cursor filter
     2. Composite ordering (date DESC, id DESC) ensures consistent pagination
-    3. UUID7 is time-ordered, so cursor maintains correct order within date range
+    3. The cursor encodes the full (date, id) key, so back-dated transactions
+       are neither skipped nor repeated across pages
     
     Args:
         limit: Number of items per page (default: 20, max: 100)
-        cursor: UUID7 cursor from previous page (None for first page)
+        cursor: Opaque cursor from previous page (None for first page)
         start_date: Filter by start date (will be normalized to start of day if normalize_dates=True)
         end_date: Filter by end date (will be normalized to end of day if normalize_dates=True)
         type: Filter by transaction type ('income' or 'expense')
         category_id: Filter by category ID
         load_category: If True, eager load category relationship (prevents N+1)
-        normalize_dates: If True, normalize start_date to start of day and end_date to end of day
+        normalize_dates: If True, normalize start_date to start of day and end_date to end of day,
+            on the user's calendar days (their timezone)
     
     Returns:
         Tuple of (items, next_cursor, has_next)
+    
+    Raises:
+        InvalidCursorError: If the cursor is malformed or tampered with
     """
     query = db.query(Transaction).filter(Transaction.user_id == user_id)
     
-    # Normalize date range if requested
+    # Normalize date range to the user's days if requested
     if normalize_dates:
         start_date, end_date = parse_date_range(
             start_date=start_date,
             end_date=end_date,
             start_of_day=True,
-            end_of_day=True
+            end_of_day=True,
+            timezone=get_filter_timezone(db, user_id, start_date, end_date, normalize_dates),
         )
+        start_date, end_date = _to_utc(start_date), _to_utc(end_date)
     
     # Apply date filters (BEFORE cursor filter to ensure correct pagination)
     if start_date:
@@ -147,8 +184,8 @@ def get_transactions_cursor(
     if load_category:
         query = query.options(selectinload(Transaction.category))
     
-    # Use cursor-based pagination with composite ordering
-    # Order by date DESC first, then id DESC for consistent pagination with date filters
+    # Keyset pagination on (date DESC, id DESC): matches the ordering exactly and
+    # can be served from a (user_id, date DESC, id DESC) index
     return paginate_with_cursor(
         query=query,
         cursor_column=Transaction.id,
@@ -159,6 +196,197 @@ def get_transactions_cursor(
     )
 
 
+# Columns of the transaction list (schemas.Transaction without user_id, which
+# is the caller's, and category, which comes from the category catalog)
+TRANSACTION_LIST_COLUMNS = [
+    Transaction.id,
+    Transaction.amount,
+    Transaction.name,
+    Transaction.type,
+    Transaction.description,
+    Transaction.date,
+    Transaction.category_id,
+    Transaction.created_at,
+    Transaction.updated_at,
+]
+
+
+def _filter_transactions(
+    stmt: Select,
+    user_id: UUID,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    type: Optional[str],
+    category_id: Optional[UUID],
+    normalize_dates: bool,
+    timezone: Optional[str] = None,
+) -> Select:
+    """Apply the list/export filters to a select over transactions (days in timezone)."""
+    stmt = stmt.where(Transaction.user_id == user_id)
+
+    if normalize_dates:
+        start_date, end_date = parse_date_range(
+            start_date=start_date,
+            end_date=end_date,
+            start_of_day=True,
+            end_of_day=True,
+            timezone=timezone,
+        )
+        # Compare in UTC: SQLite stores the dates without their offset
+        start_date, end_date = _to_utc(start_date), _to_utc(end_date)
+
+    if start_date:
+        stmt = stmt.where(Transaction.date >= start_date)
+    if end_date:
+        stmt = stmt.where(Transaction.date <= end_date)
+    if type:
+        stmt = stmt.where(Transaction.type == type)
+    if category_id:
+        stmt = stmt.where(Transaction.category_id == category_id)
+    return stmt
+
+
+def get_transaction_rows_cursor(
+    db: Session,
+    user_id: UUID,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    type: Optional[str] = None,
+    category_id: Optional[UUID] = None,
+    normalize_dates: bool = True,
+) -> Tuple[List[Any], Optional[str], bool]:
+    """
+    Column-projected variant of get_transactions_cursor for the list endpoint.
+
+    One Core SELECT returns plain rows (see TRANSACTION_LIST_COLUMNS): no ORM
+    instances or identity map. Categories are not joined; resolve them from
+    the category catalog. Filters (date filters on the user's days) and
+    pagination are the same.
+
+    Returns:
+        Tuple of (rows, next_cursor, has_next)
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or tampered with
+    """
+    timezone = get_filter_timezone(db, user_id, start_date, end_date, normalize_dates)
+    stmt = select(*TRANSACTION_LIST_COLUMNS)
+    stmt = _filter_transactions(
+        stmt, user_id, start_date, end_date, type, category_id, normalize_dates, timezone
+    )
+    return paginate_with_cursor(
+        query=stmt,
+        cursor_column=Transaction.id,
+        limit=limit,
+        cursor=cursor,
+        order_desc=True,
+        secondary_order_column=Transaction.date,
+        db=db,
+    )
+
+
+EXPORT_COLUMNS = [
+    "id",
+    "date",
+    "type",
+    "amount",
+    "name",
+    "description",
+    "category_id",
+    "category_name",
+    "created_at",
+    "updated_at",
+]
+
+
+def get_export_query(
+    user_id: UUID,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    type: Optional[str] = None,
+    category_id: Optional[UUID] = None,
+    normalize_dates: bool = True,
+    batch_size: int = 1000,
+    timezone: Optional[str] = None,
+) -> Select:
+    """
+    Build the column-projected export query (see EXPORT_COLUMNS).
+
+    The statement is marked for streaming (stream_results/yield_per), so rows
+    come from a server-side cursor in batches of batch_size. Date filters are
+    normalized to whole days in timezone (see get_filter_timezone).
+    """
+    stmt = select(
+        Transaction.id,
+        Transaction.date,
+        Transaction.type,
+        Transaction.amount,
+        Transaction.name,
+        Transaction.description,
+        Transaction.category_id,
+        Category.name.label("category_name"),
+        Transaction.created_at,
+        Transaction.updated_at,
+    ).outerjoin(Category, Transaction.category_id == Category.id)
+    stmt = _filter_transactions(
+        stmt, user_id, start_date, end_date, type, category_id, normalize_dates, timezone
+    )
+
+    return stmt.order_by(Transaction.date.desc(), Transaction.id.desc()).execution_options(
+        stream_results=True, yield_per=batch_size
+    )
+
+
+def iter_transactions_for_export(
+    db: Session,
+    user_id: UUID,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    type: Optional[str] = None,
+    category_id: Optional[UUID] = None,
+    normalize_dates: bool = True,
+    batch_size: int = 1000,
+) -> Iterator[Sequence]:
+    """
+    Stream transactions for export as plain row tuples (see EXPORT_COLUMNS).
+
+    Uses a single column-projected query with a server-side cursor
+    (stream_results/yield_per), so no ORM entities are built and memory stays
+    constant regardless of how many rows the user has.
+    """
+    stmt = get_export_query(
+        user_id=user_id,
+        start_date=start_date,
+        end_date=end_date,
+        type=type,
+        category_id=category_id,
+        normalize_dates=normalize_dates,
+        batch_size=batch_size,
+        timezone=get_filter_timezone(db, user_id, start_date, end_date, normalize_dates),
+    )
+    result = db.execute(stmt)
+    try:
+        for partition in result.partitions():
+            yield from partition
+    finally:
+        result.close()
+
+
+def _local_day_expr(dialect: str, column, timezone: Optional[str]):
+    """
+    SQL expression for the calendar day of a timestamp column in timezone.
+
+    Returns:
+        None where the database has no timezone support (SQLite); compute the
+        day in Python with _get_rollup_day instead
+    """
+    if dialect == "postgresql":
+        return cast(func.timezone(timezone or "UTC", column), Date)
+    return None
+
+
 def get_transactions_for_grouping(
     db: Session,
     user_id: UUID,
@@ -166,12 +394,25 @@ def get_transactions_for_grouping(
     end_date: Optional[datetime] = None,
     type: Optional[str] = None,
     category_id: Optional[UUID] = None,
-    normalize_dates: bool = True
-) -> List[Transaction]:
+    normalize_dates: bool = True,
+    timezone: Optional[str] = None,
+) -> List[Tuple[Transaction, date]]:
     """
-    Get all transactions for summary/grouped reporting.
+    Get all transactions for summary/grouped reporting, newest first.
+
+    Each transaction comes with its calendar day in timezone, computed by the
+    database (AT TIME ZONE) on Postgres. Categories are not loaded; resolve
+    them from the category catalog.
+
+    Returns:
+        List of (transaction, local day)
     """
-    query = db.query(Transaction).filter(Transaction.user_id == user_id)
+    local_day = _local_day_expr(db.get_bind().dialect.name, Transaction.date, timezone)
+    if local_day is not None:
+        query = db.query(Transaction, local_day)
+    else:
+        query = db.query(Transaction)
+    query = query.filter(Transaction.user_id == user_id)
 
     if normalize_dates:
         start_date, end_date = parse_date_range(
@@ -179,6 +420,7 @@ def get_transactions_for_grouping(
             end_date=end_date,
             start_of_day=True,
             end_of_day=True,
+            timezone=timezone,
         )
 
     if start_date:
@@ -190,7 +432,457 @@ def get_transactions_for_grouping(
     if category_id:
         query = query.filter(Transaction.category_id == category_id)
 
-    return query.options(selectinload(Transaction.category)).order_by(Transaction.date.desc()).all()
+    query = query.order_by(Transaction.date.desc())
+    if local_day is not None:
+        return [tuple(row) for row in query]
+    zone = get_zone(timezone)
+    return [(tx, _get_rollup_day(tx.date, zone)) for tx in query]
+
+
+def get_category_totals(
+    db: Session,
+    user_id: UUID,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    timezone: Optional[str] = None,
+) -> List:
+    """
+    Aggregate amounts per (type, category) from the daily rollup table.
+
+    Reads at most one row per day/category/type in the range, so the cost does
+    not depend on how many transactions the user has. Dates are matched at day
+    granularity, in the user's timezone (the rollups' days). Category display
+    fields come from the category catalog.
+
+    Returns:
+        Rows with attributes: type, category_id, total
+        (category_id is UNCATEGORIZED_ID for transactions without a category)
+    """
+    query = db.query(
+        TransactionDailyRollup.type,
+        TransactionDailyRollup.category_id,
+        func.sum(TransactionDailyRollup.sum).label("total"),
+    ).filter(TransactionDailyRollup.user_id == user_id)
+
+    zone = get_zone(timezone)
+    if start_date:
+        query = query.filter(TransactionDailyRollup.day >= _get_rollup_day(start_date, zone))
+    if end_date:
+        query = query.filter(TransactionDailyRollup.day <= _get_rollup_day(end_date, zone))
+
+    return query.group_by(
+        TransactionDailyRollup.type,
+        TransactionDailyRollup.category_id,
+    ).all()
+
+
+def get_data_version(db: Session, user_id: UUID) -> int:
+    """
+    Get the version of a user's transaction data (one primary key read).
+
+    Every write that changes the daily rollups bumps it in the same DB
+    transaction, so it can be used as a validator (e.g. for ETags).
+    """
+    version = db.query(UserDataVersion.version).filter(UserDataVersion.user_id == user_id).scalar()
+    return int(version or 0)
+
+
+def _bump_data_version(db: Session, user_id: UUID, touched_at: datetime) -> None:
+    """Bump the user's data version (see get_data_version) within the caller's transaction."""
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(UserDataVersion).values(user_id=user_id, version=1, updated_at=touched_at)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={"version": UserDataVersion.version + 1, "updated_at": stmt.excluded.updated_at},
+        ))
+        return
+    row = db.get(UserDataVersion, user_id)
+    if row is None:
+        db.add(UserDataVersion(user_id=user_id, version=1, updated_at=touched_at))
+    else:
+        row.version += 1
+        row.updated_at = touched_at
+    db.flush()
+
+
+def get_user_timezone(db: Session, user_id: UUID) -> Optional[str]:
+    """The user's IANA timezone name."""
+    return db.query(User.timezone).filter(User.id == user_id).scalar()
+
+
+def get_user_zone(db: Session, user_id: UUID) -> tzinfo:
+    """The user's timezone, in which their daily rollups are kept."""
+    return get_zone(get_user_timezone(db, user_id))
+
+
+def get_filter_timezone(
+    db: Session,
+    user_id: UUID,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    normalize_dates: bool,
+) -> Optional[str]:
+    """
+    Timezone in which list/export date filters are widened to whole days.
+
+    Like the summaries, the days are the user's; the user is only read when
+    there is a date filter to normalize.
+    """
+    if normalize_dates and (start_date or end_date):
+        return get_user_timezone(db, user_id)
+    return None
+
+
+def _get_rollup_day(tx_date: datetime, zone: tzinfo = dt_timezone.utc) -> date:
+    """Get the rollup day (calendar date in the user's timezone) for a transaction date."""
+    return _ensure_timezone(tx_date).astimezone(zone).date()
+
+
+RollupKey = Tuple[date, UUID, str]
+
+
+def _add_rollup_delta(
+    deltas: Dict[RollupKey, List],
+    tx_date: datetime,
+    category_id: Optional[UUID],
+    tx_type: str,
+    amount: Decimal,
+    count: int,
+    zone: tzinfo = dt_timezone.utc,
+) -> None:
+    """Accumulate a transaction's delta into a {(day, category, type): [sum, count]} map."""
+    key = (_get_rollup_day(tx_date, zone), category_id or UNCATEGORIZED_ID, tx_type)
+    bucket = deltas.setdefault(key, [Decimal("0"), 0])
+    bucket[0] += Decimal(amount)
+    bucket[1] += count
+
+
+def _apply_rollup_deltas(
+    db: Session,
+    user_id: UUID,
+    deltas: Dict[RollupKey, List],
+    touched_at: datetime,
+    chunk_size: int = 1000,
+) -> None:
+    """
+    Add accumulated deltas to the user's daily rollup rows.
+
+    Uses multi-row upserts (ON CONFLICT DO UPDATE) on the session's connection,
+    so the rollups commit or roll back together with the transaction writes.
+    Rows whose count drops to zero are removed, and the user's data version is
+    bumped.
+    """
+    if not deltas:
+        return
+    _bump_data_version(db, user_id, touched_at)
+
+    rows = [
+        {
+            "user_id": user_id,
+            "day": day,
+            "category_id": category_id,
+            "type": tx_type,
+            "sum": amount,
+            "count": count,
+            "max_updated_at": touched_at,
+        }
+        for (day, category_id, tx_type), (amount, count) in deltas.items()
+    ]
+    dialect = db.get_bind().dialect.name
+
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        for start in range(0, len(rows), chunk_size):
+            stmt = insert(TransactionDailyRollup).values(rows[start:start + chunk_size])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["user_id", "day", "category_id", "type"],
+                set_={
+                    "sum": TransactionDailyRollup.sum + stmt.excluded.sum,
+                    "count": TransactionDailyRollup.count + stmt.excluded.count,
+                    "max_updated_at": case(
+                        (
+                            TransactionDailyRollup.max_updated_at.is_(None)
+                            | (stmt.excluded.max_updated_at > TransactionDailyRollup.max_updated_at),
+                            stmt.excluded.max_updated_at,
+                        ),
+                        else_=TransactionDailyRollup.max_updated_at,
+                    ),
+                },
+            )
+            db.execute(stmt)
+    else:
+        for row in rows:
+            key = (row["user_id"], row["day"], row["category_id"], row["type"])
+            rollup = db.get(TransactionDailyRollup, key)
+            if rollup is None:
+                rollup = TransactionDailyRollup(
+                    user_id=row["user_id"],
+                    day=row["day"],
+                    category_id=row["category_id"],
+                    type=row["type"],
+                    sum=Decimal("0"),
+                    count=0,
+                )
+                db.add(rollup)
+            rollup.sum = (rollup.sum or Decimal("0")) + row["sum"]
+            rollup.count = (rollup.count or 0) + row["count"]
+            rollup.max_updated_at = _max_datetime(rollup.max_updated_at, touched_at)
+        db.flush()
+
+    if any(count < 0 for _, count in deltas.values()):
+        db.query(TransactionDailyRollup).filter(
+            TransactionDailyRollup.user_id == user_id,
+            TransactionDailyRollup.count <= 0,
+        ).delete(synchronize_session=False)
+
+    _apply_monthly_spend_deltas(db, user_id, deltas, touched_at)
+
+
+def _apply_monthly_spend_deltas(
+    db: Session,
+    user_id: UUID,
+    deltas: Dict[RollupKey, List],
+    touched_at: datetime,
+) -> None:
+    """
+    Add the expense part of rollup deltas to the user's monthly spend counters.
+
+    The upsert returns each month's new total, so threshold crossings for the
+    current month are found by comparing it with the total before the write
+    (new total minus delta). Alerts are held on the session until commit
+    (see app.core.budget).
+    """
+    months: Dict[date, List] = {}
+    for (day, _, tx_type), (amount, count) in deltas.items():
+        if tx_type != "expense":
+            continue
+        bucket = months.setdefault(day.replace(day=1), [Decimal("0"), 0])
+        bucket[0] += Decimal(amount)
+        bucket[1] += count
+    months = {month: bucket for month, bucket in months.items() if bucket[0] or bucket[1]}
+    if not months:
+        return
+
+    dialect = db.get_bind().dialect.name
+    totals: Dict[date, Decimal] = {}
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(UserMonthlySpend).values(
+            [
+                {
+                    "user_id": user_id,
+                    "month": month,
+                    "expense": amount,
+                    "count": count,
+                    "updated_at": touched_at,
+                }
+                for month, (amount, count) in months.items()
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "month"],
+            set_={
+                "expense": UserMonthlySpend.expense + stmt.excluded.expense,
+                "count": UserMonthlySpend.count + stmt.excluded.count,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        ).returning(UserMonthlySpend.month, UserMonthlySpend.expense)
+        totals = {row.month: Decimal(row.expense) for row in db.execute(stmt)}
+    else:
+        for month, (amount, count) in months.items():
+            spend = db.get(UserMonthlySpend, (user_id, month))
+            if spend is None:
+                spend = UserMonthlySpend(user_id=user_id, month=month, expense=Decimal("0"), count=0)
+                db.add(spend)
+            spend.expense = (spend.expense or Decimal("0")) + amount
+            spend.count = (spend.count or 0) + count
+            spend.updated_at = touched_at
+            totals[month] = spend.expense
+        db.flush()
+
+    if any(count < 0 for _, count in months.values()):
+        db.query(UserMonthlySpend).filter(
+            UserMonthlySpend.user_id == user_id,
+            UserMonthlySpend.count <= 0,
+        ).delete(synchronize_session=False)
+
+    # Only spending in the current month is alerted on (not back-dated imports)
+    limit_amount, timezone = db.query(User.limit_amount, User.timezone).filter(User.id == user_id).one()
+    month = datetime.now(get_zone(timezone)).date().replace(day=1)
+    if month not in totals:
+        return
+    spent = totals[month]
+    alerts = [
+        BudgetAlert(
+            user_id=user_id,
+            month=month,
+            threshold=threshold,
+            spent=spent,
+            limit_amount=limit_amount,
+        )
+        for threshold in get_crossed_thresholds(spent - months[month][0], spent, limit_amount)
+    ]
+    if alerts:
+        budget_alerts.add_pending(db, alerts)
+
+
+def get_budget_status(
+    db: Session,
+    user_id: UUID,
+    limit_amount: Decimal,
+    timezone: Optional[str] = None,
+    now: Optional[datetime] = None,
+) -> BudgetStatus:
+    """
+    The user's spend against limit_amount for the current month.
+
+    Reads the single monthly spend counter row, so the cost does not depend
+    on how many transactions the month has.
+    """
+    month = _ensure_timezone(now or datetime.now(dt_timezone.utc)).astimezone(get_zone(timezone))
+    month = month.date().replace(day=1)
+    spend = db.get(UserMonthlySpend, (user_id, month))
+    spent = Decimal(spend.expense) if spend else Decimal("0")
+    limit_amount = Decimal(limit_amount)
+    return BudgetStatus(
+        month=month,
+        limit_amount=limit_amount,
+        spent=spent,
+        remaining=limit_amount - spent,
+        percent_used=float(spent * 100 / limit_amount) if limit_amount > 0 else 0.0,
+        count=spend.count if spend else 0,
+        thresholds_reached=get_reached_thresholds(spent, limit_amount),
+        updated_at=_ensure_timezone(spend.updated_at) if spend else None,
+    )
+
+
+def _apply_rollup_delta(
+    db: Session,
+    user_id: UUID,
+    tx_date: datetime,
+    category_id: Optional[UUID],
+    tx_type: str,
+    amount: Decimal,
+    count: int,
+    touched_at: datetime,
+    zone: tzinfo = dt_timezone.utc,
+) -> None:
+    """Add a single transaction's delta to its (day, category, type) rollup row."""
+    deltas: Dict[RollupKey, List] = {}
+    _add_rollup_delta(deltas, tx_date, category_id, tx_type, amount, count, zone)
+    _apply_rollup_deltas(db, user_id, deltas, touched_at)
+
+
+def rebuild_daily_rollups(db: Session, user_id: UUID, timezone: Optional[str]) -> None:
+    """
+    Recompute a user's daily rollups on their calendar days in timezone.
+
+    Needed when the user changes timezone: every transaction may move to
+    another day. On Postgres this is one INSERT ... SELECT grouping on
+    ``date AT TIME ZONE``; elsewhere the rows are aggregated in Python. The
+    monthly spend counters are then rebuilt from the new rollups. The caller
+    commits.
+    """
+    rows = start_rollup_rebuild(db, user_id, timezone)
+    rollups = aggregate_rollup_rows(rows, user_id, timezone) if rows is not None else []
+    finish_rollup_rebuild(db, user_id, rollups)
+
+
+def start_rollup_rebuild(db: Session, user_id: UUID, timezone: Optional[str]) -> Optional[List[Any]]:
+    """
+    Clear a user's rollups and rebuild them in the database when it can.
+
+    Returns:
+        None when the database grouped the rows itself, otherwise the
+        transaction rows for aggregate_rollup_rows
+    """
+    _bump_data_version(db, user_id, datetime.now(dt_timezone.utc))
+    db.query(TransactionDailyRollup).filter(
+        TransactionDailyRollup.user_id == user_id
+    ).delete(synchronize_session=False)
+
+    category = func.coalesce(Transaction.category_id, UNCATEGORIZED_ID)
+    last_update = func.coalesce(Transaction.updated_at, Transaction.created_at)
+    day = _local_day_expr(db.get_bind().dialect.name, Transaction.date, timezone)
+    if day is None:
+        return db.execute(
+            select(Transaction.date, category, Transaction.type, Transaction.amount, last_update)
+            .where(Transaction.user_id == user_id)
+        ).all()
+
+    rows = select(
+        Transaction.user_id,
+        day.label("day"),
+        category.label("category_id"),
+        Transaction.type,
+        Transaction.amount,
+        last_update.label("updated_at"),
+    ).where(Transaction.user_id == user_id).subquery()
+    group = (rows.c.user_id, rows.c.day, rows.c.category_id, rows.c.type)
+    totals = select(
+        *group,
+        func.sum(rows.c.amount),
+        func.count(),
+        func.max(rows.c.updated_at),
+    ).group_by(*group)
+    db.execute(
+        insert(TransactionDailyRollup).from_select(
+            ["user_id", "day", "category_id", "type", "sum", "count", "max_updated_at"],
+            totals,
+        )
+    )
+    return None
+
+
+def aggregate_rollup_rows(rows: Sequence[Any], user_id: UUID, timezone: Optional[str]) -> List[Dict[str, Any]]:
+    """Group (date, category_id, type, amount, updated_at) rows into rollup rows (no queries)."""
+    zone = get_zone(timezone)
+    rollups: Dict[RollupKey, Dict[str, Any]] = {}
+    for tx_date, category_id, tx_type, amount, updated_at in rows:
+        key = (_get_rollup_day(tx_date, zone), category_id, tx_type)
+        rollup = rollups.setdefault(key, {"sum": Decimal("0"), "count": 0, "max_updated_at": None})
+        rollup["sum"] += amount
+        rollup["count"] += 1
+        rollup["max_updated_at"] = _max_datetime(rollup["max_updated_at"], updated_at)
+    return [
+        {"user_id": user_id, "day": day, "category_id": category_id, "type": tx_type, **totals}
+        for (day, category_id, tx_type), totals in rollups.items()
+    ]
+
+
+def finish_rollup_rebuild(db: Session, user_id: UUID, rollups: List[Dict[str, Any]]) -> None:
+    """Insert the rollups aggregated in Python (if any) and rebuild the monthly spend counters."""
+    if rollups:
+        db.execute(insert(TransactionDailyRollup), rollups)
+
+    db.query(UserMonthlySpend).filter(
+        UserMonthlySpend.user_id == user_id
+    ).delete(synchronize_session=False)
+    month = _series_bucket_expr(db.get_bind().dialect.name, "month", TransactionDailyRollup.day)
+    days = select(
+        TransactionDailyRollup.user_id,
+        month.label("month"),
+        TransactionDailyRollup.sum,
+        TransactionDailyRollup.count,
+        TransactionDailyRollup.max_updated_at,
+    ).where(
+        TransactionDailyRollup.user_id == user_id,
+        TransactionDailyRollup.type == "expense",
+    ).subquery()
+    db.execute(
+        insert(UserMonthlySpend).from_select(
+            ["user_id", "month", "expense", "count", "updated_at"],
+            select(
+                days.c.user_id,
+                days.c.month,
+                func.sum(days.c.sum),
+                func.sum(days.c.count),
+                func.max(days.c.max_updated_at),
+            ).group_by(days.c.user_id, days.c.month),
+        )
+    )
 
 
 def _ensure_timezone(dt: Optional[datetime]) -> Optional[datetime]:
@@ -202,6 +894,11 @@ def _ensure_timezone(dt: Optional[datetime]) -> Optional[datetime]:
     return dt
 
 
+def _to_utc(dt: Optional[datetime]) -> Optional[datetime]:
+    """Convert an aware datetime to UTC (None passes through)."""
+    return dt.astimezone(dt_timezone.utc) if dt is not None else None
+
+
 def _get_next_month_start(dt: datetime) -> datetime:
     """Get the first day of the next month preserving timezone."""
     if dt.month == 12:
@@ -209,22 +906,33 @@ def _get_next_month_start(dt: datetime) -> datetime:
     return dt.replace(month=dt.month + 1, day=1)
 
 
-def _get_timeframe_range(timeframe: str, now: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+def _get_week_start(day_start: datetime, week_start: int = 0) -> datetime:
+    """Start of the week containing day_start (week_start: 0 = Monday ... 6 = Sunday)."""
+    return day_start - timedelta(days=(day_start.weekday() - week_start) % 7)
+
+
+def _get_timeframe_range(
+    timeframe: str,
+    now: Optional[datetime] = None,
+    timezone: Optional[str] = None,
+    week_start: int = 0,
+) -> Tuple[datetime, datetime]:
     """
     Resolve timeframe keyword into an explicit start/end datetime range.
 
-    All datetimes are timezone-aware (UTC if naive).
+    Days are calendar days in timezone (UTC by default) and weeks begin on
+    week_start. All datetimes are timezone-aware.
     """
     normalized_now = _ensure_timezone(now or datetime.now(dt_timezone.utc))
-    today_start = get_start_of_day(normalized_now)
+    today_start = get_start_of_day(normalized_now, timezone)
 
     if timeframe == "today":
-        return today_start, get_end_of_day(normalized_now)
+        return today_start, get_end_of_day(normalized_now, timezone)
     if timeframe == "yesterday":
         day = today_start - timedelta(days=1)
         return day, get_end_of_day(day)
     if timeframe == "this_week":
-        week_start = today_start - timedelta(days=today_start.weekday())
+        week_start = _get_week_start(today_start, week_start)
         week_end = get_end_of_day(week_start + timedelta(days=6))
         return week_start, week_end
     if timeframe == "this_month":
@@ -240,31 +948,33 @@ def _get_timeframe_range(timeframe: str, now: Optional[datetime] = None) -> Tupl
     raise ValueError(f"Unsupported timeframe: {timeframe}")
 
 
-def _get_timeframe_anchors(now: datetime) -> Dict[str, datetime]:
-    """Compute anchor datetimes for timeframe buckets."""
-    now = _ensure_timezone(now)
-    today_start = get_start_of_day(now)
+def _get_timeframe_anchors(
+    now: datetime,
+    timezone: Optional[str] = None,
+    week_start: int = 0,
+) -> Dict[str, datetime]:
+    """Compute anchor datetimes (local day starts in timezone) for timeframe buckets."""
+    today_start = get_start_of_day(_ensure_timezone(now), timezone)
     return {
         "today_start": today_start,
         "yesterday_start": today_start - timedelta(days=1),
-        "week_start": today_start - timedelta(days=today_start.weekday()),
+        "week_start": _get_week_start(today_start, week_start),
         "month_start": today_start.replace(day=1),
         "year_start": today_start.replace(month=1, day=1),
     }
 
 
-def _get_timeframe_label(tx_date: datetime, anchors: Dict[str, datetime]) -> Optional[str]:
-    """Determine which timeframe bucket a transaction belongs to."""
-    tx_date = _ensure_timezone(tx_date)
-    if tx_date >= anchors["today_start"]:
+def _get_timeframe_label(day: date, anchor_days: Dict[str, date]) -> Optional[str]:
+    """Determine which timeframe bucket a local day belongs to."""
+    if day >= anchor_days["today_start"]:
         return "today"
-    if tx_date >= anchors["yesterday_start"]:
+    if day >= anchor_days["yesterday_start"]:
         return "yesterday"
-    if tx_date >= anchors["week_start"]:
+    if day >= anchor_days["week_start"]:
         return "this_week"
-    if tx_date >= anchors["month_start"]:
+    if day >= anchor_days["month_start"]:
         return "this_month"
-    if tx_date >= anchors["year_start"]:
+    if day >= anchor_days["year_start"]:
         return "this_year"
     return None
 
@@ -317,21 +1027,30 @@ def _get_last_update(ts: Transaction) -> Optional[datetime]:
     return ts.updated_at or ts.created_at
 
 
-def _build_timeframe_group(label: str, transactions: List[Transaction]) -> TransactionTimeframeGroup:
+def _build_timeframe_group(
+    label: str,
+    transactions: List[Tuple[Transaction, date]],
+    categories: Dict[UUID, Any],
+) -> TransactionTimeframeGroup:
     """
     Build a TransactionTimeframeGroup with nested day and category aggregates.
+
+    Args:
+        transactions: (transaction, local day) pairs, newest first (as returned
+            by get_transactions_for_grouping), so days and the transactions
+            within them need no sorting
+        categories: Category schemas by id (from the category catalog)
     """
     day_buckets: Dict = {}
-    for tx in transactions:
-        day_key = _ensure_timezone(tx.date).date()
+    for tx, day_key in transactions:
         day_buckets.setdefault(day_key, []).append(tx)
 
     day_groups: List[TransactionDayGroup] = []
     timeframe_total = Decimal("0")
     timeframe_last_update: Optional[datetime] = None
 
-    # Sort days newest first
-    for day_key, day_transactions in sorted(day_buckets.items(), key=lambda item: item[0], reverse=True):
+    # Days keep the newest-first order of the rows
+    for day_key, day_transactions in day_buckets.items():
         category_buckets: Dict = {}
         for tx in day_transactions:
             category_buckets.setdefault(tx.category_id, []).append(tx)
@@ -339,16 +1058,10 @@ def _build_timeframe_group(label: str, transactions: List[Transaction]) -> Trans
         category_groups: List[TransactionCategoryGroup] = []
         day_total = Decimal("0")
 
-        for category_id, category_transactions in category_buckets.items():
-            # Sort transactions in category newest first
-            sorted_transactions = sorted(
-                category_transactions,
-                key=lambda tx: _ensure_timezone(tx.date),
-                reverse=True,
-            )
-
+        for category_id, sorted_transactions in category_buckets.items():
             cat_total = sum((tx.amount for tx in sorted_transactions), Decimal("0"))
-            category_name = sorted_transactions[0].category.name if sorted_transactions[0].category else None
+            category = categories.get(category_id)
+            category_name = category.name if category else None
 
             category_groups.append(
                 TransactionCategoryGroup(
@@ -364,7 +1077,7 @@ def _build_timeframe_group(label: str, transactions: List[Transaction]) -> Trans
                             description=tx.description,
                             date=_ensure_timezone(tx.date),
                             category_id=tx.category_id,
-                            category_name=tx.category.name if tx.category else None,
+                            category_name=category_name,
                             created_at=_ensure_timezone(tx.created_at) or _ensure_timezone(tx.date),
                             updated_at=_ensure_timezone(tx.updated_at),
                         )
@@ -399,6 +1112,61 @@ def _build_timeframe_group(label: str, transactions: List[Transaction]) -> Trans
     )
 
 
+def get_grouped_totals(
+    db: Session,
+    user_id: UUID,
+    since: datetime,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    type: Optional[str] = None,
+    category_id: Optional[UUID] = None,
+    normalize_dates: bool = True,
+    timezone: Optional[str] = None,
+) -> Tuple[Decimal, Optional[datetime]]:
+    """
+    Compute the total amount and latest modification time from the daily rollups.
+
+    The last update is the latest write (create, update or delete) that touched
+    any of the matching days.
+
+    Args:
+        since: Lower bound for transaction dates (e.g. start of the current year)
+        timezone: The user's timezone, in which the rollup days are kept
+
+    Returns:
+        Tuple of (total, last_update)
+    """
+    zone = get_zone(timezone)
+    query = db.query(
+        func.sum(TransactionDailyRollup.sum),
+        func.max(TransactionDailyRollup.max_updated_at),
+    ).filter(
+        TransactionDailyRollup.user_id == user_id,
+        TransactionDailyRollup.day >= _get_rollup_day(since, zone),
+    )
+
+    if normalize_dates:
+        start_date, end_date = parse_date_range(
+            start_date=start_date,
+            end_date=end_date,
+            start_of_day=True,
+            end_of_day=True,
+            timezone=timezone,
+        )
+
+    if start_date:
+        query = query.filter(TransactionDailyRollup.day >= _get_rollup_day(start_date, zone))
+    if end_date:
+        query = query.filter(TransactionDailyRollup.day <= _get_rollup_day(end_date, zone))
+    if type:
+        query = query.filter(TransactionDailyRollup.type == type)
+    if category_id:
+        query = query.filter(TransactionDailyRollup.category_id == category_id)
+
+    total, last_update = query.one()
+    return Decimal(total or 0), _ensure_timezone(last_update)
+
+
 def get_grouped_transactions(
     db: Session,
     user_id: UUID,
@@ -406,10 +1174,84 @@ def get_grouped_transactions(
     end_date: Optional[datetime] = None,
     type: Optional[str] = None,
     category_id: Optional[UUID] = None,
+    include_breakdown: bool = False,
+    timezone: Optional[str] = None,
+    week_start: int = 0,
+    limit_amount: Optional[Decimal] = None,
 ) -> TransactionGroupedResponse:
     """
-    Return transactions grouped by timeframe/day/category with totals.
+    Return totals for transactions in the current year's timeframes.
+
+    By default only ``total`` and ``lasted_update_at`` are computed, with a single
+    aggregate query. Set include_breakdown to also load the transactions and
+    build the nested timeframe/day/category groups.
+
+    Days, weeks (starting on week_start) and months are the user's, in
+    timezone; the boundaries are computed once per call. With limit_amount
+    the current month's budget status is included.
     """
+    if include_breakdown:
+        transactions, anchors, budget = get_grouped_breakdown_rows(
+            db,
+            user_id=user_id,
+            start_date=start_date,
+            end_date=end_date,
+            type=type,
+            category_id=category_id,
+            timezone=timezone,
+            week_start=week_start,
+            limit_amount=limit_amount,
+        )
+        categories = category_catalog.resolve(db, user_id, {tx.category_id for tx, _ in transactions})
+        return build_grouped_breakdown(transactions, categories, anchors, budget)
+
+    anchors, budget = _get_grouping_frame(db, user_id, timezone, week_start, limit_amount)
+    total, last_update = get_grouped_totals(
+        db=db,
+        user_id=user_id,
+        since=anchors["year_start"],
+        start_date=start_date,
+        end_date=end_date,
+        type=type,
+        category_id=category_id,
+        timezone=timezone,
+    )
+    return TransactionGroupedResponse(
+        total=total,
+        lasted_update_at=last_update,
+        budget=budget,
+    )
+
+
+def _get_grouping_frame(
+    db: Session,
+    user_id: UUID,
+    timezone: Optional[str],
+    week_start: int,
+    limit_amount: Optional[Decimal],
+) -> Tuple[Dict[str, datetime], Optional[BudgetStatus]]:
+    """Timeframe anchors for now, plus the budget status when limit_amount is set."""
+    now = datetime.now(dt_timezone.utc)
+    anchors = _get_timeframe_anchors(now, timezone, week_start)
+    budget = None
+    if limit_amount is not None:
+        budget = get_budget_status(db, user_id, limit_amount, timezone, now)
+    return anchors, budget
+
+
+def get_grouped_breakdown_rows(
+    db: Session,
+    user_id: UUID,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    type: Optional[str] = None,
+    category_id: Optional[UUID] = None,
+    timezone: Optional[str] = None,
+    week_start: int = 0,
+    limit_amount: Optional[Decimal] = None,
+) -> Tuple[List[Tuple[Transaction, date]], Dict[str, datetime], Optional[BudgetStatus]]:
+    """The queries behind the grouped breakdown: (transactions, anchors, budget)."""
+    anchors, budget = _get_grouping_frame(db, user_id, timezone, week_start, limit_amount)
     transactions = get_transactions_for_grouping(
         db=db,
         user_id=user_id,
@@ -418,30 +1260,49 @@ def get_grouped_transactions(
         type=type,
         category_id=category_id,
         normalize_dates=True,
+        timezone=timezone,
     )
+    return transactions, anchors, budget
+
 
-    anchors = _get_timeframe_anchors(datetime.now(dt_timezone.utc))
-    bucketed: Dict[str, List[Transaction]] = {label: [] for label in TIMEFRAME_ORDER}
+def build_grouped_breakdown(
+    transactions: List[Tuple[Transaction, date]],
+    categories: Dict[UUID, Any],
+    anchors: Dict[str, datetime],
+    budget: Optional[BudgetStatus],
+) -> TransactionGroupedResponse:
+    """
+    Bucket the rows into the nested timeframe/day/category groups.
 
-    for tx in transactions:
-        label = _get_timeframe_label(tx.date, anchors)
+    CPU only: the transactions are fully loaded and categories come from
+    the catalog, so no attribute read triggers a query.
+    """
+    anchor_days = {name: anchor.date() for name, anchor in anchors.items()}
+    bucketed: Dict[str, List[Tuple[Transaction, date]]] = {label: [] for label in TIMEFRAME_ORDER}
+
+    for row in transactions:
+        label = _get_timeframe_label(row[1], anchor_days)
         if label:
-            bucketed[label].append(tx)
+            bucketed[label].append(row)
 
     total = Decimal("0")
     last_update: Optional[datetime] = None
+    groups: List[TransactionTimeframeGroup] = []
 
     for label in TIMEFRAME_ORDER:
         txs = bucketed.get(label, [])
         if not txs:
             continue
-        group = _build_timeframe_group(label, txs)
+        group = _build_timeframe_group(label, txs, categories)
         total += group.total
         last_update = _max_datetime(last_update, group.lasted_update_at)
+        groups.append(group)
 
     return TransactionGroupedResponse(
         total=total,
         lasted_update_at=last_update,
+        timeframes=groups,
+        budget=budget,
     )
 
 
@@ -450,23 +1311,84 @@ def get_transaction_period_summary(
     user_id: UUID,
     timeframe: str,
     now: Optional[datetime] = None,
+    timezone: Optional[str] = None,
+    week_start: int = 0,
+    limit_amount: Optional[Decimal] = None,
 ) -> TransactionPeriodSummary:
     """
     Return totals and category breakdown for a specific timeframe keyword.
+
+    The timeframe is resolved in the user's timezone, with weeks starting on
+    week_start. With limit_amount the current month's budget status is
+    included.
+    """
+    normalized_timeframe, start_date, end_date, category_rows, budget = get_period_summary_rows(
+        db,
+        user_id=user_id,
+        timeframe=timeframe,
+        now=now,
+        timezone=timezone,
+        week_start=week_start,
+        limit_amount=limit_amount,
+    )
+    categories = category_catalog.resolve(db, user_id, summary_category_ids(category_rows))
+    return build_period_summary(
+        normalized_timeframe, start_date, end_date, category_rows, categories, budget
+    )
+
+
+def get_period_summary_rows(
+    db: Session,
+    user_id: UUID,
+    timeframe: str,
+    now: Optional[datetime] = None,
+    timezone: Optional[str] = None,
+    week_start: int = 0,
+    limit_amount: Optional[Decimal] = None,
+) -> Tuple[str, datetime, datetime, List[Any], Optional[BudgetStatus]]:
+    """
+    The queries behind a period summary.
+
+    Returns:
+        Tuple of (timeframe, start_date, end_date, category total rows, budget)
+
+    Raises:
+        ValueError: If the timeframe is not supported
     """
     normalized_timeframe = (timeframe or "").lower()
     if normalized_timeframe not in TIMEFRAME_SET:
         raise ValueError(f"Invalid timeframe '{timeframe}'. Expected one of {', '.join(TIMEFRAME_ORDER)}")
 
-    start_date, end_date = _get_timeframe_range(normalized_timeframe, now=now)
-    transactions = get_transactions_for_grouping(
+    start_date, end_date = _get_timeframe_range(
+        normalized_timeframe, now=now, timezone=timezone, week_start=week_start
+    )
+    category_rows = get_category_totals(
         db=db,
         user_id=user_id,
         start_date=start_date,
         end_date=end_date,
-        normalize_dates=False,
+        timezone=timezone,
     )
+    budget = None
+    if limit_amount is not None:
+        budget = get_budget_status(db, user_id, limit_amount, timezone, now)
+    return normalized_timeframe, start_date, end_date, category_rows, budget
+
+
+def summary_category_ids(category_rows: List[Any]) -> Set[UUID]:
+    """Category ids to resolve for the category total rows."""
+    return {row.category_id for row in category_rows if row.category_id != UNCATEGORIZED_ID}
+
 
+def build_period_summary(
+    timeframe: str,
+    start_date: datetime,
+    end_date: datetime,
+    category_rows: List[Any],
+    categories: Dict[UUID, Any],
+    budget: Optional[BudgetStatus],
+) -> TransactionPeriodSummary:
+    """Totals and percentages from the category total rows (no queries)."""
     total_income = Decimal("0")
     total_expense = Decimal("0")
     category_totals: Dict[str, Dict[Optional[UUID], Dict[str, object]]] = {
@@ -474,25 +1396,23 @@ def get_transaction_period_summary(
         "expense": {},
     }
 
-    for tx in transactions:
-        amount = Decimal(tx.amount)
-        if tx.type == "income":
+    for row in category_rows:
+        amount = Decimal(row.total or 0)
+        if row.type == "income":
             total_income += amount
-        elif tx.type == "expense":
+        elif row.type == "expense":
             total_expense += amount
         else:
             continue  # Skip unknown types defensively
 
-        bucket = category_totals[tx.type].setdefault(
-            tx.category_id,
-            {
-                "total": Decimal("0"),
-                "name": tx.category.name if tx.category else None,
-                "color": tx.category.color if tx.category else None,
-                "icon": tx.category.icon if tx.category else None,
-            },
-        )
-        bucket["total"] += amount
+        category_id = None if row.category_id == UNCATEGORIZED_ID else row.category_id
+        category = categories.get(category_id)
+        category_totals[row.type][category_id] = {
+            "total": amount,
+            "name": category.name if category else None,
+            "color": category.color if category else None,
+            "icon": category.icon if category else None,
+        }
 
     combined_total = total_income + total_expense
     raw_rows: List[Dict] = []
@@ -535,13 +1455,195 @@ def get_transaction_period_summary(
     category_summaries.sort(key=lambda item: type_rank.get(item.type, 2))
 
     return TransactionPeriodSummary(
-        timeframe=normalized_timeframe,
+        timeframe=timeframe,
         start_date=start_date,
         end_date=end_date,
         total_income=total_income,
         total_expense=total_expense,
         net=total_income - total_expense,
         categories=category_summaries,
+        budget=budget,
+    )
+
+
+def _get_series_bucket_start(day: date, granularity: str, week_start: int = 0) -> date:
+    """First day of the bucket containing day (weeks start on week_start, 0 = Monday)."""
+    if granularity == "week":
+        return day - timedelta(days=(day.weekday() - week_start) % 7)
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _count_series_points(start: date, end: date, granularity: str) -> int:
+    """Number of buckets between two bucket starts, inclusive."""
+    if granularity == "month":
+        return (end.year - start.year) * 12 + end.month - start.month + 1
+    if granularity == "week":
+        return (end - start).days // 7 + 1
+    return (end - start).days + 1
+
+
+def get_series_range(
+    granularity: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    today: Optional[date] = None,
+    week_start: int = 0,
+) -> Tuple[date, date]:
+    """
+    Validate a series request and fill in the default range.
+
+    Without end_date the series ends today (the user's local date); without
+    start_date it covers SERIES_DEFAULT_POINTS buckets up to end_date.
+
+    Raises:
+        ValueError: On an unknown granularity, an inverted range or more than
+                    SERIES_MAX_POINTS buckets
+    """
+    if granularity not in SERIES_GRANULARITIES:
+        raise ValueError(
+            f"Invalid granularity '{granularity}'. Expected one of {', '.join(SERIES_GRANULARITIES)}"
+        )
+
+    end_date = end_date or today or datetime.now(dt_timezone.utc).date()
+    if start_date is None:
+        start_date = _get_series_bucket_start(end_date, granularity, week_start)
+        points = SERIES_DEFAULT_POINTS[granularity] - 1
+        if granularity == "month":
+            month_index = start_date.year * 12 + start_date.month - 1 - points
+            start_date = date(month_index // 12, month_index % 12 + 1, 1)
+        else:
+            start_date -= timedelta(days=points * (7 if granularity == "week" else 1))
+
+    if start_date > end_date:
+        raise ValueError("start must not be after end")
+    points = _count_series_points(
+        _get_series_bucket_start(start_date, granularity, week_start),
+        _get_series_bucket_start(end_date, granularity, week_start),
+        granularity,
+    )
+    if points > SERIES_MAX_POINTS:
+        raise ValueError(f"Range too large: {points} buckets (max {SERIES_MAX_POINTS})")
+    return start_date, end_date
+
+
+def _series_bucket_expr(dialect: str, granularity: str, column, week_start: int = 0):
+    """SQL expression truncating a date column to its bucket start."""
+    if dialect == "postgresql":
+        if granularity == "week" and week_start:
+            # date_trunc weeks start on Monday: shift into them and back
+            shifted = cast(column - week_start, DateTime)
+            return cast(func.date_trunc(granularity, shifted), Date) + week_start
+        return cast(func.date_trunc(granularity, cast(column, DateTime)), Date)
+    # SQLite date modifiers ('weekday N' moves forward to the week's last day, 0 = Sunday)
+    if granularity == "week":
+        return func.date(column, f"weekday {week_start}", "-6 days", type_=Date)
+    if granularity == "month":
+        return func.date(column, "start of month", type_=Date)
+    return column
+
+
+def _series_buckets(dialect: str, granularity: str, first: date, last: date):
+    """Selectable with a 'bucket' column holding every bucket start from first to last."""
+    if dialect == "postgresql":
+        series = func.generate_series(
+            cast(literal(first, Date), DateTime),
+            cast(literal(last, Date), DateTime),
+            literal_column(f"interval '1 {granularity}'"),
+        ).table_valued("value")
+        return select(cast(series.c.value, Date).label("bucket")).subquery()
+
+    # SQLite: recursive CTE stepping one bucket at a time
+    step = {"day": "+1 day", "week": "+7 days", "month": "+1 month"}[granularity]
+    buckets = select(literal(first, Date).label("bucket")).cte("series_buckets", recursive=True)
+    next_bucket = func.date(buckets.c.bucket, step, type_=Date)
+    return buckets.union_all(select(next_bucket).where(next_bucket <= literal(last, Date)))
+
+
+def get_transaction_series(
+    db: Session,
+    user_id: UUID,
+    granularity: str,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    type: Optional[str] = None,
+    category_id: Optional[UUID] = None,
+    today: Optional[date] = None,
+    timezone: Optional[str] = None,
+    week_start: int = 0,
+) -> TransactionSeries:
+    """
+    Income/expense totals per day, week or month, from the daily rollups.
+
+    Buckets are computed in SQL (date_trunc on Postgres, date modifiers on
+    SQLite) and left joined to a generated series of bucket starts
+    (generate_series / a recursive CTE), so empty buckets come back as zeros
+    in the same query. The first and last buckets only count days inside the
+    range. Days are the user's calendar days in timezone, like the rollups,
+    and weeks start on week_start.
+
+    Raises:
+        ValueError: If the granularity or range is invalid (see get_series_range)
+    """
+    today = today or datetime.now(get_zone(timezone)).date()
+    start_date, end_date = get_series_range(
+        granularity, start_date, end_date, today=today, week_start=week_start
+    )
+    dialect = db.get_bind().dialect.name
+
+    bucket = _series_bucket_expr(dialect, granularity, TransactionDailyRollup.day, week_start)
+    totals = select(
+        bucket.label("bucket"),
+        func.sum(
+            case((TransactionDailyRollup.type == "income", TransactionDailyRollup.sum), else_=0)
+        ).label("income"),
+        func.sum(
+            case((TransactionDailyRollup.type == "expense", TransactionDailyRollup.sum), else_=0)
+        ).label("expense"),
+        func.sum(TransactionDailyRollup.count).label("count"),
+    ).where(
+        TransactionDailyRollup.user_id == user_id,
+        TransactionDailyRollup.day >= start_date,
+        TransactionDailyRollup.day <= end_date,
+    )
+    if type:
+        totals = totals.where(TransactionDailyRollup.type == type)
+    if category_id:
+        totals = totals.where(TransactionDailyRollup.category_id == category_id)
+    totals = totals.group_by(bucket).subquery()
+
+    buckets = _series_buckets(
+        dialect,
+        granularity,
+        _get_series_bucket_start(start_date, granularity, week_start),
+        _get_series_bucket_start(end_date, granularity, week_start),
+    )
+    rows = db.execute(
+        select(buckets.c.bucket, totals.c.income, totals.c.expense, totals.c.count)
+        .select_from(buckets.outerjoin(totals, totals.c.bucket == buckets.c.bucket))
+        .order_by(buckets.c.bucket)
+    ).all()
+
+    points = []
+    for row in rows:
+        income = Decimal(row.income or 0)
+        expense = Decimal(row.expense or 0)
+        points.append(
+            TransactionSeriesPoint(
+                period_start=row.bucket,
+                income=income,
+                expense=expense,
+                net=income - expense,
+                count=int(row.count or 0),
+            )
+        )
+
+    return TransactionSeries(
+        granularity=granularity,
+        start_date=start_date,
+        end_date=end_date,
+        points=points,
     )
 
 
@@ -552,7 +1654,20 @@ def create_transaction(db: Session, transaction: TransactionCreate, user_id: UUI
         user_id=user_id
     )
     db.add(db_transaction)
+    _apply_rollup_delta(
+        db,
+        user_id=user_id,
+        tx_date=db_transaction.date,
+        category_id=db_transaction.category_id,
+        tx_type=db_transaction.type,
+        amount=db_transaction.amount,
+        count=1,
+        touched_at=datetime.now(dt_timezone.utc),
+        zone=get_user_zone(db, user_id),
+    )
     db.commit()
+    summary_cache.bump_user(user_id)
+    budget_alerts.dispatch_pending(db)
     db.refresh(db_transaction)
     return db_transaction
 
@@ -563,26 +1678,438 @@ def update_transaction(
     transaction_update: TransactionUpdate,
     user_id: UUID
 ) -> Optional[Transaction]:
-    """Update a transaction"""
-    db_transaction = get_transaction(db, transaction_id, user_id)
+    """
+    Update a transaction.
+
+    The row is locked while the rollup deltas are computed, so a concurrent
+    update or delete can't apply deltas from the same old values.
+    """
+    db_transaction = get_transaction(db, transaction_id, user_id, for_update=True)
     if not db_transaction:
         return None
     
+    old_date, old_category_id, old_type, old_amount = (
+        db_transaction.date,
+        db_transaction.category_id,
+        db_transaction.type,
+        db_transaction.amount,
+    )
+    
     update_data = transaction_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_transaction, field, value)
+    try:
+        db.flush()
+    except StaleDataError:
+        # Deleted since it was read (backends without row locks)
+        db.rollback()
+        return None
+    
+    # Move the transaction out of its old rollup row and into the new one
+    # (nets out to an amount-only delta when the row doesn't change)
+    zone = get_user_zone(db, user_id)
+    deltas: Dict[RollupKey, List] = {}
+    _add_rollup_delta(deltas, old_date, old_category_id, old_type, -old_amount, -1, zone)
+    _add_rollup_delta(
+        deltas,
+        db_transaction.date,
+        db_transaction.category_id,
+        db_transaction.type,
+        db_transaction.amount,
+        1,
+        zone,
+    )
+    _apply_rollup_deltas(db, user_id, deltas, touched_at=datetime.now(dt_timezone.utc))
     
     db.commit()
+    summary_cache.bump_user(user_id)
+    budget_alerts.dispatch_pending(db)
     db.refresh(db_transaction)
     return db_transaction
 
 
 def delete_transaction(db: Session, transaction_id: UUID, user_id: UUID) -> bool:
-    """Delete a transaction"""
-    db_transaction = get_transaction(db, transaction_id, user_id)
+    """
+    Delete a transaction.
+
+    The row is locked until commit, and its rollup delta is only applied
+    when the DELETE removed it, so concurrent deletes count it once.
+    """
+    db_transaction = get_transaction(db, transaction_id, user_id, for_update=True)
     if not db_transaction:
         return False
     
-    db.delete(db_transaction)
+    deleted = db.execute(
+        delete(Transaction)
+        .where(Transaction.id == transaction_id, Transaction.user_id == user_id)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not deleted:
+        db.rollback()
+        return False
+    _apply_rollup_delta(
+        db,
+        user_id=user_id,
+        tx_date=db_transaction.date,
+        category_id=db_transaction.category_id,
+        tx_type=db_transaction.type,
+        amount=-db_transaction.amount,
+        count=-1,
+        touched_at=datetime.now(dt_timezone.utc),
+        zone=get_user_zone(db, user_id),
+    )
+    db.expunge(db_transaction)
     db.commit()
+    summary_cache.bump_user(user_id)
+    budget_alerts.dispatch_pending(db)
     return True
+
+
+def _build_transaction_rows(
+    user_id: UUID,
+    transactions: List[TransactionCreate],
+    deltas: Dict[RollupKey, List],
+    zone: tzinfo,
+) -> List[Dict[str, Any]]:
+    """
+    Turn validated transactions into INSERT rows (with fresh ids).
+
+    Rollup deltas (on the user's days in zone) are accumulated into
+    ``deltas``. No DB access, so callers may run it off the event loop.
+    """
+    rows = []
+    for transaction in transactions:
+        row = transaction.model_dump()
+        row["id"] = uuid7()
+        row["user_id"] = user_id
+        rows.append(row)
+        _add_rollup_delta(
+            deltas,
+            row["date"],
+            row["category_id"],
+            row["type"],
+            row["amount"],
+            1,
+            zone,
+        )
+    return rows
+
+
+def _insert_transaction_rows(db: Session, rows: List[Dict[str, Any]]) -> None:
+    # Core table insert: the ORM bulk path would split rows with NULL
+    # columns into separate statements
+    if rows:
+        db.execute(insert(Transaction.__table__), rows)
+
+
+def _bulk_insert_transactions(
+    db: Session,
+    user_id: UUID,
+    transactions: List[TransactionCreate],
+    deltas: Dict[RollupKey, List],
+    zone: tzinfo,
+) -> List[UUID]:
+    """
+    Insert transactions with batched multi-row INSERT ... VALUES statements.
+
+    Rollup deltas (on the user's days in zone) are accumulated into
+    ``deltas``; the caller applies them and commits.
+    """
+    rows = _build_transaction_rows(user_id, transactions, deltas, zone)
+    _insert_transaction_rows(db, rows)
+    return [row["id"] for row in rows]
+
+
+def _format_validation_errors(exc: ValidationError) -> List[str]:
+    messages = []
+    for error in exc.errors():
+        location = ".".join(str(part) for part in error.get("loc", ()))
+        messages.append(f"{location}: {error['msg']}" if location else error["msg"])
+    return messages
+
+
+def validate_import_rows(
+    rows: List[dict],
+) -> Tuple[List[Tuple[int, TransactionCreate]], List[TransactionImportError]]:
+    """
+    Validate raw import rows against TransactionCreate (CPU only, no DB access).
+
+    Returns:
+        ((1-based row number, transaction) for valid rows, errors of the others)
+    """
+    valid: List[Tuple[int, TransactionCreate]] = []
+    errors: List[TransactionImportError] = []
+    for row_number, raw in enumerate(rows, start=1):
+        try:
+            valid.append((row_number, TransactionCreate.model_validate(raw)))
+        except ValidationError as exc:
+            errors.append(
+                TransactionImportError(row=row_number, errors=_format_validation_errors(exc))
+            )
+    return valid, errors
+
+
+def get_import_context(
+    db: Session,
+    valid: List[Tuple[int, TransactionCreate]],
+    user_id: UUID,
+) -> Tuple[tzinfo, Set[UUID]]:
+    """The user's timezone and which of the rows' categories they can see."""
+    category_ids = {item.category_id for _, item in valid if item.category_id}
+    return get_user_zone(db, user_id), get_visible_category_ids(db, category_ids, user_id)
+
+
+def prepare_import_rows(
+    valid: List[Tuple[int, TransactionCreate]],
+    visible_categories: Set[UUID],
+    user_id: UUID,
+    zone: tzinfo,
+) -> Tuple[List[Dict[str, Any]], Dict[RollupKey, List], List[TransactionImportError]]:
+    """
+    Build the INSERT rows and rollup deltas of validated rows (CPU only, no DB access).
+
+    Rows with unknown or foreign categories are reported instead.
+
+    Returns:
+        (INSERT rows, rollup deltas, category errors)
+    """
+    errors: List[TransactionImportError] = []
+    to_insert: List[TransactionCreate] = []
+    for row_number, item in valid:
+        if item.category_id and item.category_id not in visible_categories:
+            errors.append(
+                TransactionImportError(row=row_number, errors=["category_id: Category not found"])
+            )
+            continue
+        to_insert.append(item)
+    deltas: Dict[RollupKey, List] = {}
+    return _build_transaction_rows(user_id, to_insert, deltas, zone), deltas, errors
+
+
+def insert_import_rows(
+    db: Session,
+    user_id: UUID,
+    rows: List[Dict[str, Any]],
+    deltas: Dict[RollupKey, List],
+    chunk_size: int = 1000,
+) -> int:
+    """
+    Insert prepared import rows (multi-row INSERTs of chunk_size rows), apply
+    their rollup deltas and commit, all in one DB transaction.
+
+    Returns:
+        Number of transactions inserted
+    """
+    for chunk_start in range(0, len(rows), chunk_size):
+        _insert_transaction_rows(db, rows[chunk_start:chunk_start + chunk_size])
+    _apply_rollup_deltas(db, user_id, deltas, touched_at=datetime.now(dt_timezone.utc))
+    db.commit()
+    if rows:
+        summary_cache.bump_user(user_id)
+    budget_alerts.dispatch_pending(db)
+    return len(rows)
+
+
+def build_import_result(
+    received: int,
+    imported: int,
+    errors: List[TransactionImportError],
+) -> TransactionImportResult:
+    errors = sorted(errors, key=lambda error: error.row)
+    return TransactionImportResult(
+        received=received,
+        imported=imported,
+        failed=len(errors),
+        errors=errors,
+    )
+
+
+def import_transactions(
+    db: Session,
+    rows: List[dict],
+    user_id: UUID,
+    chunk_size: int = 1000,
+) -> TransactionImportResult:
+    """
+    Validate and bulk insert raw transaction rows (e.g. parsed CSV or JSON).
+
+    Rows are validated against TransactionCreate and the valid ones inserted
+    with multi-row INSERTs of chunk_size rows. Invalid rows (including
+    unknown or foreign categories) are skipped and reported. Everything is
+    committed in a single DB transaction.
+
+    The async variant (app.crud.aio.transaction.import_transactions) runs
+    the same steps, with the CPU-only ones in a worker thread.
+    """
+    valid, errors = validate_import_rows(rows)
+    zone, visible_categories = get_import_context(db, valid, user_id)
+    insert_rows, deltas, category_errors = prepare_import_rows(valid, visible_categories, user_id, zone)
+    imported = insert_import_rows(db, user_id, insert_rows, deltas, chunk_size=chunk_size)
+    return build_import_result(len(rows), imported, errors + category_errors)
+
+
+def _update_transactions(
+    db: Session,
+    user_id: UUID,
+    changes: Dict[UUID, Dict[str, Any]],
+) -> Set[UUID]:
+    """
+    Write pending field changes with set-based UPDATE statements.
+
+    Transactions receiving the same change share one
+    ``UPDATE ... WHERE id IN (...) AND user_id = ...``; differing changes to
+    the same set of columns are sent as one executemany statement.
+
+    Returns:
+        Ids of the transactions that were updated (rows deleted in the
+        meantime are left out)
+    """
+    table = Transaction.__table__
+    groups: Dict[Tuple[str, ...], List[Tuple[UUID, Dict[str, Any]]]] = {}
+    for transaction_id, data in changes.items():
+        groups.setdefault(tuple(sorted(data)), []).append((transaction_id, data))
+
+    updated: Set[UUID] = set()
+    for fields, items in groups.items():
+        ids = [transaction_id for transaction_id, _ in items]
+        payloads = {tuple(data[field] for field in fields) for _, data in items}
+        if len(payloads) == 1:
+            updated.update(db.scalars(
+                update(table)
+                .where(table.c.id.in_(ids), table.c.user_id == user_id)
+                .values(items[0][1])
+                .returning(table.c.id)
+            ))
+            continue
+
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"), table.c.user_id == user_id)
+            .values({field: bindparam(f"b_{field}") for field in fields})
+        )
+        matched = db.execute(
+            stmt,
+            [
+                {"b_id": transaction_id, **{f"b_{field}": data[field] for field in fields}}
+                for transaction_id, data in items
+            ],
+        ).rowcount
+        if matched == len(ids):
+            updated.update(ids)
+        else:
+            # executemany can't say which rows matched: look up the survivors
+            updated.update(db.scalars(select(table.c.id).where(table.c.id.in_(ids))))
+    return updated
+
+
+def apply_transaction_batch(
+    db: Session,
+    operations: Sequence[TransactionBatchOperation],
+    user_id: UUID,
+) -> List[TransactionBatchResult]:
+    """
+    Apply a list of create/update/delete operations in one DB transaction.
+
+    Operations are applied in order, so later operations on the same
+    transaction see earlier ones (e.g. update then delete). Updates and deletes
+    of transactions that don't exist (or belong to another user) are reported
+    as ``not_found`` instead of failing the batch.
+
+    Rows are written with one multi-row INSERT, set-based UPDATEs and one
+    DELETE, and rollup deltas for the whole batch are applied once. Existing
+    rows are locked (in id order) while the batch runs, and deltas are only
+    applied for rows the UPDATE or DELETE actually matched.
+
+    Raises:
+        ValueError: If an operation references a category the user can't see
+    """
+    category_ids = set()
+    for operation in operations:
+        if operation.op == "delete":
+            continue
+        category_id = operation.data.category_id
+        if category_id is not None and "category_id" in operation.data.model_fields_set:
+            category_ids.add(category_id)
+    if category_ids - get_visible_category_ids(db, category_ids, user_id):
+        raise ValueError("Category not found")
+
+    table = Transaction.__table__
+    target_ids = {operation.id for operation in operations if operation.op != "create"}
+    original: Dict[UUID, Dict[str, Any]] = {}
+    if target_ids:
+        rows = db.execute(
+            select(table.c.id, table.c.amount, table.c.type, table.c.date, table.c.category_id)
+            .where(table.c.id.in_(target_ids), table.c.user_id == user_id)
+            .order_by(table.c.id)
+            .with_for_update()
+        ).all()
+        original = {row.id: dict(row._mapping) for row in rows}
+
+    # Fold the operations into the final state of each existing transaction
+    # (None once deleted) before writing anything
+    state: Dict[UUID, Optional[Dict[str, Any]]] = {
+        transaction_id: dict(values) for transaction_id, values in original.items()
+    }
+    changes: Dict[UUID, Dict[str, Any]] = {}
+    creates: List[Tuple[int, TransactionCreate]] = []
+    results: List[Optional[TransactionBatchResult]] = []
+    for index, operation in enumerate(operations):
+        if operation.op == "create":
+            creates.append((index, operation.data))
+            results.append(None)
+            continue
+
+        if state.get(operation.id) is None:
+            status = "not_found"
+        elif operation.op == "update":
+            data = operation.data.model_dump(exclude_unset=True)
+            if data:
+                state[operation.id].update(data)
+                changes.setdefault(operation.id, {}).update(data)
+            status = "updated"
+        else:
+            state[operation.id] = None
+            changes.pop(operation.id, None)
+            status = "deleted"
+        results.append(
+            TransactionBatchResult(index=index, op=operation.op, id=operation.id, status=status)
+        )
+
+    deleted_ids = [transaction_id for transaction_id, new in state.items() if new is None]
+    written = _update_transactions(db, user_id, changes) if changes else set()
+    if deleted_ids:
+        written.update(db.scalars(
+            delete(table)
+            .where(table.c.id.in_(deleted_ids), table.c.user_id == user_id)
+            .returning(table.c.id)
+        ))
+
+    # Rows changed or deleted by another request since they were read
+    missing = (set(changes) | set(deleted_ids)) - written
+    for index, result in enumerate(results):
+        if result is not None and result.id in missing:
+            results[index] = result.model_copy(update={"status": "not_found"})
+
+    zone = get_user_zone(db, user_id)
+    deltas: Dict[RollupKey, List] = {}
+    for transaction_id in written:
+        old, new = original[transaction_id], state[transaction_id]
+        _add_rollup_delta(deltas, old["date"], old["category_id"], old["type"], -old["amount"], -1, zone)
+        if new is not None:
+            _add_rollup_delta(deltas, new["date"], new["category_id"], new["type"], new["amount"], 1, zone)
+
+    created_ids = _bulk_insert_transactions(db, user_id, [data for _, data in creates], deltas, zone)
+    for (index, _), transaction_id in zip(creates, created_ids):
+        results[index] = TransactionBatchResult(
+            index=index, op="create", id=transaction_id, status="created"
+        )
+
+    if not (created_ids or written):
+        db.rollback()
+        return results
+
+    _apply_rollup_deltas(db, user_id, deltas, touched_at=datetime.now(dt_timezone.utc))
+    db.commit()
+    summary_cache.bump_user(user_id)
+    budget_alerts.dispatch_pending(db)
+    return results
@@ -3,11 +3,23 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.core.cache import principal_cache, summary_cache
+from app.core.token_versions import token_versions
+from app.crud.transaction import rebuild_daily_rollups
+from app.core.security import (
+    get_dummy_password_hash,
+    get_password_hash,
+    verify_and_update_password,
+    verify_password,
+)
+from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
 from app.models.enums import UserRole
 
+# User fields copied into access token claims (see app.core.security.get_token_data)
+TOKEN_CLAIM_FIELDS = ("username", "role", "is_active")
+
 
 def get_user(db: Session, user_id: UUID) -> Optional[User]:
     """Get user by ID"""
@@ -29,16 +41,8 @@ def get_users(db: Session, skip: int = 0, limit: int = 100):
     return db.query(User).offset(skip).limit(limit).all()
 
 
-def create_user(db: Session, user: UserCreate) -> User:
-    """Create a new user"""
-    # Guard against duplicate username/email before insert
-    existing = db.query(User).filter(
-        or_(User.username == user.username, User.email == user.email)
-    ).first()
-    if existing:
-        raise ValueError("Username or email already registered")
-
-    hashed_password = get_password_hash(user.password)
+def build_user(user: UserCreate, hashed_password: str) -> User:
+    """Build (but don't add) a User row from the create schema."""
     role_value = user.role.value if isinstance(user.role, UserRole) else user.role
     user_data = {
         "email": user.email,
@@ -46,10 +50,55 @@ def create_user(db: Session, user: UserCreate) -> User:
         "full_name": user.full_name,
         "hashed_password": hashed_password,
         "role": role_value or UserRole.MEMBER.value,
+        "timezone": user.timezone,
+        "week_start": user.week_start,
     }
     if user.limit_amount is not None:
         user_data["limit_amount"] = user.limit_amount
-    db_user = User(**user_data)
+    return User(**user_data)
+
+
+def get_user_update_data(user_update: UserUpdate) -> dict:
+    """Fields to set from an update; 'password' is left for the caller to hash."""
+    update_data = user_update.model_dump(exclude_unset=True)
+    for field in ("timezone", "week_start"):
+        if field in update_data and update_data[field] is None:
+            del update_data[field]
+    if "role" in update_data and update_data["role"] is not None:
+        role_value = update_data["role"]
+        if isinstance(role_value, UserRole):
+            role_value = role_value.value
+        update_data["role"] = role_value
+    return update_data
+
+
+def bump_token_version_if_needed(db_user: User, update_data: dict) -> None:
+    """
+    Revoke the user's tokens when an update changes what they claim.
+
+    Access tokens carry username, role and active flag; a password change
+    also signs out every session. Mutates update_data in place.
+    """
+    changed = "password" in update_data or any(
+        field in update_data and update_data[field] != getattr(db_user, field)
+        for field in TOKEN_CLAIM_FIELDS
+    )
+    if changed:
+        # Increment in SQL so concurrent updates can't reuse a version
+        update_data["token_version"] = User.token_version + 1
+        update_data["token_version_updated_at"] = datetime.now(timezone.utc)
+
+
+def create_user(db: Session, user: UserCreate) -> User:
+    """Create a new user"""
+    # Guard against duplicate username/email before insert
+    existing = db.query(User).filter(
+        or_(User.username == user.username, User.email == user.email)
+    ).first()
+    if existing:
+        raise ValueError("Username or email already registered")
+
+    db_user = build_user(user, get_password_hash(user.password))
     db.add(db_user)
     try:
         db.commit()
@@ -66,21 +115,27 @@ def update_user(db: Session, user_id: UUID, user_update: UserUpdate) -> Optional
     db_user = get_user(db, user_id)
     if not db_user:
         return None
+    old_subjects = (db_user.username, db_user.email)
     
-    update_data = user_update.model_dump(exclude_unset=True)
+    update_data = get_user_update_data(user_update)
+    bump_token_version_if_needed(db_user, update_data)
     if "password" in update_data:
         update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
-    if "role" in update_data and update_data["role"] is not None:
-        role_value = update_data["role"]
-        if isinstance(role_value, UserRole):
-            role_value = role_value.value
-        update_data["role"] = role_value
+    timezone_changed = update_data.get("timezone", db_user.timezone) != db_user.timezone
     
     for field, value in update_data.items():
         setattr(db_user, field, value)
+    if timezone_changed:
+        # Rollups are kept on the user's local days
+        rebuild_daily_rollups(db, db_user.id, db_user.timezone)
     
     db.commit()
+    # Cached principals may be keyed by the old or the new username/email
+    principal_cache.invalidate(*old_subjects, db_user.username, db_user.email)
+    if timezone_changed:
+        summary_cache.bump_user(db_user.id)
     db.refresh(db_user)
+    token_versions.set(db_user.id, db_user.token_version)
     return db_user
 
 
@@ -92,6 +147,8 @@ def delete_user(db: Session, user_id: UUID) -> bool:
     
     db.delete(db_user)
     db.commit()
+    principal_cache.invalidate(db_user.username, db_user.email)
+    token_versions.mark_deleted(db_user.id)
     return True
 
 
@@ -99,7 +156,13 @@ def authenticate_user(db: Session, username: str, password: str) -> Optional[Use
     """Authenticate user with username and password"""
     user = get_user_by_username(db, username)
     if not user:
+        verify_password(password, get_dummy_password_hash())
         return None
-    if not verify_password(password, user.hashed_password):
+    verified, new_hash = verify_and_update_password(password, user.hashed_password)
+    if not verified:
         return None
+    if new_hash is not None:
+        # Stored with outdated bcrypt settings (e.g. BCRYPT_ROUNDS changed)
+        user.hashed_password = new_hash
+        db.commit()
     return user
@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session
 from app.models.user_device_token import UserDeviceToken
 from app.schemas.user_device_token import UserDeviceTokenCreate, UserDeviceTokenUpdate
-from typing import Optional, List
+from typing import Optional, List, Sequence, Tuple
 from uuid import UUID
 from datetime import datetime, timezone
 from sqlalchemy import and_
@@ -128,3 +128,47 @@ def update_last_used(db: Session, token_id: UUID, user_id: UUID) -> Optional[Use
     db.refresh(db_token)
     return db_token
 
+
+def get_active_tokens_for_users(
+    db: Session, user_ids: Sequence[UUID]
+) -> List[Tuple[UUID, UUID, str, str]]:
+    """
+    Active device tokens of many users in one query (for push delivery).
+    
+    Returns:
+        (token id, user_id, device_token, device_type) for every active token
+    """
+    if not user_ids:
+        return []
+    rows = db.query(
+        UserDeviceToken.id,
+        UserDeviceToken.user_id,
+        UserDeviceToken.device_token,
+        UserDeviceToken.device_type,
+    ).filter(
+        and_(
+            UserDeviceToken.user_id.in_(list(user_ids)),
+            UserDeviceToken.is_active == True
+        )
+    ).all()
+    return [tuple(row) for row in rows]
+
+
+def deactivate_device_tokens(db: Session, token_ids: Sequence[UUID]) -> int:
+    """
+    Deactivate many device tokens in one UPDATE (e.g. tokens a push provider
+    reported as unregistered).
+    
+    Returns:
+        Number of tokens deactivated
+    """
+    if not token_ids:
+        return 0
+    count = db.query(UserDeviceToken).filter(
+        and_(
+            UserDeviceToken.id.in_(list(token_ids)),
+            UserDeviceToken.is_active == True
+        )
+    ).update({UserDeviceToken.is_active: False}, synchronize_session=False)
+    db.commit()
+    return count
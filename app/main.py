@@ -1,26 +1,51 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.budget import budget_alerts
 from app.core.config import settings
 from app.core.database import engine, Base
+from app.core.partitions import ensure_transaction_partitions
+from app.core.push import push_budget_alert, push_dispatcher
+from app.core.responses import get_default_response_class
 from app.api.v1.api import api_router
 
 # Import models để đăng ký vào Base.metadata
 # Quan trọng: Phải import trước khi gọi create_all()
-from app.models import User, Transaction, Category, UserDeviceToken, UserCategory  # noqa: F401
+from app.models import User, Transaction, Category, UserDeviceToken, UserCategory, TransactionDailyRollup  # noqa: F401
 
 # Create database tables (only if database is available)
 # Note: This will fail if database is not accessible, but that's okay for startup
 try:
     Base.metadata.create_all(bind=engine, checkfirst=True)
+    # Tạo trước các partition theo tháng của transactions (PostgreSQL)
+    ensure_transaction_partitions(engine)
 except Exception:
     # Database connection will be checked when endpoints are called
     pass
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Push notifications (PUSH_BACKEND): worker của dispatcher chạy trên event loop của app
+    if push_dispatcher.enabled:
+        await push_dispatcher.start()
+        budget_alerts.register(push_budget_alert)
+    try:
+        yield
+    finally:
+        if push_dispatcher.enabled:
+            budget_alerts.unregister(push_budget_alert)
+            await push_dispatcher.stop()
+
+
 # Initialize FastAPI app
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     debug=settings.DEBUG,
+    # orjson khi FastAPI chưa tự serialize response_model sang JSON bytes
+    default_response_class=get_default_response_class(),
 )
 
 # CORS middleware
@@ -3,5 +3,9 @@ from app.models.transaction import Transaction
 from app.models.category import Category
 from app.models.user_device_token import UserDeviceToken
 from app.models.user_category import UserCategory
+from app.models.transaction_daily_rollup import TransactionDailyRollup
+from app.models.user_monthly_spend import UserMonthlySpend
+from app.models.category_catalog_version import CategoryCatalogVersion
+from app.models.user_data_version import UserDataVersion
 
-__all__ = ["User", "Transaction", "Category", "UserDeviceToken", "UserCategory"]
+__all__ = ["User", "Transaction", "Category", "UserDeviceToken", "UserCategory", "TransactionDailyRollup", "UserMonthlySpend", "CategoryCatalogVersion", "UserDataVersion"]
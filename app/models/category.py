@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Enum, UniqueConstraint
+from sqlalchemy import Boolean, Column, String, DateTime, Enum, Index, UniqueConstraint, false, true
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -9,9 +9,6 @@ from app.models.enums import CategoryType
 
 class Category(Base):
     __tablename__ = "categories"
-    __table_args__ = (
-        UniqueConstraint("name", "type", name="uq_category_name_type"),
-    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, index=True)
     name = Column(String, nullable=False, index=True)
@@ -29,6 +26,8 @@ class Category(Base):
     )  # 'income' or 'expense'
     color = Column(String, nullable=True)  # Hex color code
     icon = Column(String, nullable=True)  # Icon name or path
+    # Visible to every user; other categories are visible through user_categories
+    is_global = Column(Boolean, nullable=False, default=False, server_default=false())
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(
         DateTime(timezone=True),
@@ -36,6 +35,17 @@ class Category(Base):
         onupdate=func.now(),
     )
 
+    __table_args__ = (
+        UniqueConstraint("name", "type", name="uq_category_name_type"),
+        # Global categories, in id order (category pickers)
+        Index(
+            "ix_categories_global_id",
+            id,
+            postgresql_where=is_global == true(),
+            sqlite_where=is_global == true(),
+        ),
+    )
+
     # Relationships
     users = relationship(
         "User",
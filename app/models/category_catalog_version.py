@@ -0,0 +1,15 @@
+from sqlalchemy import BigInteger, Column, String
+from app.core.database import Base
+
+
+class CategoryCatalogVersion(Base):
+    """
+    Version counters of the category catalog (see app.core.category_catalog):
+    ``catalog:global`` for global categories and ``catalog:user:<id>`` for the
+    categories linked to a user. Bumped in the same DB transaction as the
+    category write; a missing row means version 0.
+    """
+    __tablename__ = "category_catalog_versions"
+
+    key = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Numeric, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, Numeric, DateTime, ForeignKey, Text, Index, DDL, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -9,12 +9,14 @@ from app.core.uuid7 import uuid7
 class Transaction(Base):
     __tablename__ = "transactions"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     amount = Column(Numeric(10, 2), nullable=False)
     type = Column(String, nullable=False)  # 'income' or 'expense'
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
-    date = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # Part of the table's primary key: Postgres range-partitions transactions by
+    # month on this column, and a partitioned table's keys must include it
+    date = Column(DateTime(timezone=True), primary_key=True, nullable=False, server_default=func.now())
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     category_id = Column(UUID(as_uuid=True), ForeignKey("categories.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -24,6 +26,29 @@ class Transaction(Base):
         onupdate=func.now(),
     )
 
+    __table_args__ = (
+        # Transaction list / export / cursor pagination (WHERE user_id ORDER BY date DESC, id DESC)
+        Index("ix_transactions_user_id_date_id", user_id, date.desc(), id.desc()),
+        # Category-filtered lists and summaries
+        Index("ix_transactions_user_id_category_id_date", user_id, category_id, date),
+        # Type-filtered lists and summaries
+        Index("ix_transactions_user_id_type_date", user_id, type, date),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
+    # Rows are still identified by id alone
+    __mapper_args__ = {"primary_key": [id]}
+
     # Relationships
     user = relationship("User", back_populates="transactions")
     category = relationship("Category", back_populates="transactions")
+
+
+# Catch-all partition so inserts never fail for a month without its own
+# partition; monthly partitions are managed by app.core.partitions
+event.listen(
+    Transaction.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS transactions_default PARTITION OF transactions DEFAULT").execute_if(
+        dialect="postgresql"
+    ),
+)
@@ -0,0 +1,24 @@
+from uuid import UUID as PyUUID
+from sqlalchemy import Column, String, Numeric, Integer, Date, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+# Transactions without a category are rolled up under this key, because
+# category_id is part of the primary key and cannot be NULL.
+UNCATEGORIZED_ID = PyUUID("ffffffff-ffff-ffff-ffff-ffffffffffff")  # RFC 9562 Max UUID
+
+
+class TransactionDailyRollup(Base):
+    """
+    Per-user daily totals, maintained incrementally by the transaction CRUD
+    functions in the same DB transaction as the write.
+    """
+    __tablename__ = "transaction_daily_rollups"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    category_id = Column(UUID(as_uuid=True), primary_key=True)  # UNCATEGORIZED_ID when no category
+    type = Column(String, primary_key=True)  # 'income' or 'expense'
+    sum = Column(Numeric(14, 2), nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
+    max_updated_at = Column(DateTime(timezone=True), nullable=True)  # Last write touching this row
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Numeric, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, Numeric, String, Boolean, DateTime
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -35,6 +35,13 @@ class User(Base):
         default=2000000.0,
         server_default="2000000.0",
     )
+    # IANA timezone and first weekday (0 = Monday) used for summary days/weeks/months
+    timezone = Column(String, nullable=False, default="UTC", server_default="UTC")
+    week_start = Column(Integer, nullable=False, default=0, server_default="0")
+    # Bumped to revoke every token issued before (see app.core.token_versions)
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # When token_version last moved; workers refresh only the rows bumped since their last look
+    token_version_updated_at = Column(DateTime(timezone=True), nullable=True, index=True)
 
     # Relationships
     transactions = relationship("Transaction", back_populates="user", cascade="all, delete-orphan")
@@ -0,0 +1,16 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class UserDataVersion(Base):
+    """
+    Per-user version of the transaction data, bumped in the same DB transaction
+    as every write that changes the daily rollups. One row read gives a
+    validator for ETags and summary cache keys; a missing row means version 0.
+    """
+    __tablename__ = "user_data_versions"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=True)  # Last write
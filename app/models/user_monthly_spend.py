@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Numeric, Integer, Date, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class UserMonthlySpend(Base):
+    """
+    Per-user running expense total for each month (in the user's timezone),
+    compared against User.limit_amount. Maintained as deltas by the
+    transaction CRUD functions, alongside the daily rollups.
+    """
+    __tablename__ = "user_monthly_spend"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(Date, primary_key=True)  # First day of the month
+    expense = Column(Numeric(14, 2), nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)  # Expense transactions
+    updated_at = Column(DateTime(timezone=True), nullable=True)  # Last write touching this month
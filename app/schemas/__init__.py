@@ -1,4 +1,4 @@
-from app.schemas.user import User, UserCreate, UserUpdate, UserInDB
+from app.schemas.user import Principal, User, UserCreate, UserUpdate, UserInDB
 from app.schemas.transaction import (
     Transaction,
     TransactionCreate,
@@ -10,11 +10,17 @@ from app.schemas.transaction import (
     TransactionGroupItem,
     TransactionCategorySummary,
     TransactionPeriodSummary,
+    TransactionImportError,
+    TransactionImportResult,
+    TransactionBatchRequest,
+    TransactionBatchResult,
+    TransactionBatchResponse,
 )
 from app.schemas.category import Category, CategoryCreate, CategoryUpdate
 from app.schemas.token import Token, TokenData
 
 __all__ = [
+    "Principal",
     "User",
     "UserCreate",
     "UserUpdate",
@@ -29,6 +35,11 @@ __all__ = [
     "TransactionGroupItem",
     "TransactionCategorySummary",
     "TransactionPeriodSummary",
+    "TransactionImportError",
+    "TransactionImportResult",
+    "TransactionBatchRequest",
+    "TransactionBatchResult",
+    "TransactionBatchResponse",
     "Category",
     "CategoryCreate",
     "CategoryUpdate",
@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from datetime import date, datetime
+from decimal import Decimal
+from typing import List, Optional
+from uuid import UUID
+
+
+class BudgetStatus(BaseModel):
+    month: date  # First day of the month, in the user's timezone
+    limit_amount: Decimal
+    spent: Decimal  # Expenses this month
+    remaining: Decimal  # Negative once over the limit
+    percent_used: float
+    count: int  # Expense transactions this month
+    thresholds_reached: List[int]  # Percent thresholds (see app.core.budget) already reached
+    updated_at: Optional[datetime] = None  # Last write touching this month
+
+
+class BudgetAlert(BaseModel):
+    """A user's monthly spend crossing a percentage of their limit."""
+    user_id: UUID
+    month: date
+    threshold: int  # Percent of limit_amount, e.g. 80 or 100
+    spent: Decimal
+    limit_amount: Decimal
@@ -28,6 +28,7 @@ class CategoryUpdate(BaseModel):
 
 class Category(CategoryBase):
     id: UUID
+    is_global: bool = False  # Shared by every user
     created_at: datetime
     updated_at: Optional[datetime] = None
 
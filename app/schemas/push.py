@@ -0,0 +1,16 @@
+from pydantic import BaseModel, Field
+from typing import Dict
+
+
+class PushNotification(BaseModel):
+    title: str
+    body: str
+    data: Dict[str, str] = Field(default_factory=dict)  # Custom key/values delivered to the app
+
+
+class PushResult(BaseModel):
+    """Outcome of delivering push notifications, counted per device token."""
+    sent: int = 0
+    failed: int = 0
+    deactivated: int = 0  # Rejected as no longer registered; now is_active = False
+    skipped: int = 0  # No provider configured for the device type
@@ -1,9 +1,10 @@
-from pydantic import BaseModel
-from datetime import datetime, date
-from typing import Optional, List
+from pydantic import BaseModel, Field, field_validator
+from datetime import datetime, date, timezone
+from typing import Annotated, Optional, List, Literal, Union
 from decimal import Decimal
 from uuid import UUID
 from app.core.pagination import PaginatedResponse
+from app.schemas.budget import BudgetStatus
 from app.schemas.category import Category
 
 
@@ -36,6 +37,14 @@ class Transaction(TransactionBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
+    @field_validator("date", "created_at", "updated_at")
+    @classmethod
+    def ensure_timezone(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # Stored in UTC; SQLite hands them back naive
+        if value is not None and value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value
+
     class Config:
         from_attributes = True
 
@@ -84,6 +93,8 @@ class TransactionTimeframeGroup(BaseModel):
 class TransactionGroupedResponse(BaseModel):
     total: Decimal
     lasted_update_at: Optional[datetime]
+    timeframes: Optional[List[TransactionTimeframeGroup]] = None  # Only when a breakdown is requested
+    budget: Optional[BudgetStatus] = None  # Current month's spend vs limit_amount
 
 
 class TransactionCategorySummary(BaseModel):
@@ -104,3 +115,68 @@ class TransactionPeriodSummary(BaseModel):
     total_expense: Decimal
     net: Decimal
     categories: List[TransactionCategorySummary]
+    budget: Optional[BudgetStatus] = None  # Current month's spend vs limit_amount
+
+
+class TransactionSeriesPoint(BaseModel):
+    period_start: date  # First day of the bucket (weeks start on the user's week_start)
+    income: Decimal
+    expense: Decimal
+    net: Decimal
+    count: int  # Number of transactions in the bucket
+
+
+class TransactionSeries(BaseModel):
+    granularity: str  # 'day', 'week' or 'month'
+    start_date: date
+    end_date: date
+    points: List[TransactionSeriesPoint]  # One per bucket, oldest first, empty buckets included
+
+
+class TransactionImportError(BaseModel):
+    row: int  # 1-based position of the row in the uploaded data
+    errors: List[str]
+
+
+class TransactionImportResult(BaseModel):
+    received: int
+    imported: int
+    failed: int
+    errors: List[TransactionImportError]
+
+
+class TransactionBatchCreate(BaseModel):
+    op: Literal["create"]
+    data: TransactionCreate
+
+
+class TransactionBatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: UUID
+    data: TransactionUpdate
+
+
+class TransactionBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: UUID
+
+
+TransactionBatchOperation = Annotated[
+    Union[TransactionBatchCreate, TransactionBatchUpdate, TransactionBatchDelete],
+    Field(discriminator="op"),
+]
+
+
+class TransactionBatchRequest(BaseModel):
+    operations: List[TransactionBatchOperation]
+
+
+class TransactionBatchResult(BaseModel):
+    index: int  # Position of the operation in the request
+    op: str
+    id: Optional[UUID] = None
+    status: str  # 'created', 'updated', 'deleted' or 'not_found'
+
+
+class TransactionBatchResponse(BaseModel):
+    results: List[TransactionBatchResult]
@@ -1,7 +1,8 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, field_validator
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
+from app.core.date_utils import get_zone
 from app.models.enums import UserRole
 from decimal import Decimal
 
@@ -11,6 +12,14 @@ class UserBase(BaseModel):
     username: str
     full_name: Optional[str] = None
     limit_amount: Optional[Decimal] = 2000000.0
+    timezone: str = "UTC"  # IANA name; days, weeks and months of summaries are local to it
+    week_start: int = Field(0, ge=0, le=6)  # 0 = Monday ... 6 = Sunday
+
+    @field_validator("timezone")
+    @classmethod
+    def check_timezone(cls, value: str) -> str:
+        get_zone(value)
+        return value
 
 
 class UserCreate(UserBase):
@@ -26,6 +35,15 @@ class UserUpdate(BaseModel):
     is_active: Optional[bool] = None
     role: Optional[UserRole] = None
     limit_amount: Optional[Decimal] = None
+    timezone: Optional[str] = None
+    week_start: Optional[int] = Field(None, ge=0, le=6)
+
+    @field_validator("timezone")
+    @classmethod
+    def check_timezone(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None:
+            get_zone(value)
+        return value
 
 
 class UserInDB(UserBase):
@@ -43,3 +61,14 @@ class UserInDB(UserBase):
 class User(UserInDB):
     pass
 
+
+class Principal(BaseModel):
+    """Authenticated user as carried by the access token claims."""
+    id: UUID
+    username: str
+    role: UserRole = UserRole.MEMBER
+    is_active: bool = True
+    is_superuser: bool = False
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,113 @@
+"""
+Benchmark: gửi một push notification (vd cảnh báo ngân sách) tới nhiều users
+
+So sánh hai cách gửi tới provider giả lập (FakePushProvider, mỗi request mất --latency giây):
+- từng token: mỗi user một query lấy device tokens, gửi lần lượt từng token
+  (đo trên --loop-users users đầu tiên rồi suy ra cho toàn bộ)
+- PushDispatcher: một query cho mỗi PUSH_BATCH_SIZE users, gửi song song
+  tối đa PUSH_CONCURRENCY requests
+
+Dữ liệu được tạo trong một SQLite tạm (hoặc DATABASE_URL nếu đã đặt).
+
+Chạy:
+python scripts/bench_push.py --users 100000 --latency 0.02 --concurrency 1000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+
+from sqlalchemy import insert  # noqa: E402
+from app.core.database import AsyncSessionLocal, Base, SessionLocal, engine  # noqa: E402
+from app.core.push import FakePushProvider, PushDispatcher  # noqa: E402
+from app.core.uuid7 import uuid7  # noqa: E402
+from app.crud.aio import user_device_token as aio_device_token  # noqa: E402
+from app.models import User, UserDeviceToken  # noqa: E402
+from app.schemas.push import PushNotification  # noqa: E402
+
+
+def seed(users: int):
+    """users users, each with one android token; bulk inserted."""
+    prefix = time.time_ns()
+    user_ids = [uuid7() for _ in range(users)]
+    with SessionLocal() as db:
+        db.execute(
+            insert(User),
+            [
+                {
+                    "id": user_id,
+                    "email": f"push-{prefix}-{index}@example.com",
+                    "username": f"push{prefix}{index}",
+                    "hashed_password": "-",
+                }
+                for index, user_id in enumerate(user_ids)
+            ],
+        )
+        db.execute(
+            insert(UserDeviceToken),
+            [
+                {
+                    "id": uuid7(),
+                    "user_id": user_id,
+                    "device_token": f"token-{index}",
+                    "device_id": f"device-{index}",
+                    "device_type": "android",
+                }
+                for index, user_id in enumerate(user_ids)
+            ],
+        )
+        db.commit()
+    return user_ids
+
+
+async def token_loop(user_ids, provider, notification):
+    """One query per user, then one awaited request per token."""
+    for user_id in user_ids:
+        async with AsyncSessionLocal() as db:
+            tokens = await aio_device_token.get_device_tokens_by_user(db, user_id, active_only=True)
+        for token in tokens:
+            await provider.send(token.device_token, notification)
+
+
+async def run(args):
+    Base.metadata.create_all(bind=engine)
+    user_ids = seed(args.users)
+    notification = PushNotification(title="Monthly budget reached", body="Bench", data={"type": "budget_alert"})
+
+    loop_users = user_ids[:args.loop_users]
+    started = time.perf_counter()
+    await token_loop(loop_users, FakePushProvider(latency=args.latency), notification)
+    loop_seconds = (time.perf_counter() - started) * len(user_ids) / len(loop_users)
+
+    provider = FakePushProvider(latency=args.latency)
+    dispatcher = PushDispatcher(
+        AsyncSessionLocal, {"android": provider}, batch_size=args.batch_size, concurrency=args.concurrency
+    )
+    started = time.perf_counter()
+    result = await dispatcher.dispatch(user_ids, notification)
+    dispatcher_seconds = time.perf_counter() - started
+    assert result.sent == len(user_ids), result
+
+    print(f"{len(user_ids)} users, provider latency {args.latency * 1000:.0f} ms")
+    print(f"  per-token loop (estimated)   {loop_seconds:10.2f} s")
+    print(f"  PushDispatcher               {dispatcher_seconds:10.2f} s  x{loop_seconds / dispatcher_seconds:7.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--loop-users", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
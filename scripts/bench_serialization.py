@@ -0,0 +1,100 @@
+"""
+Benchmark: serialize một trang 100 transactions (kèm category) sang JSON
+
+So sánh các cách encode response:
+- jsonable_encoder + json (stdlib): đường cũ của FastAPI
+- FastJSONResponse (orjson): response class mặc định khi FastAPI chưa có fast path
+- pydantic-core dump_json: fast path của FastAPI cho route có response_model
+
+Chạy:
+python scripts/bench_serialization.py --items 100 --repeat 500
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from app.core.responses import FastJSONResponse, fastapi_serializes_to_json  # noqa: E402
+from app.schemas.category import Category  # noqa: E402
+from app.schemas.transaction import PaginatedTransactions, Transaction  # noqa: E402
+
+
+def build_page(items: int) -> PaginatedTransactions:
+    now = datetime.now(timezone.utc)
+    categories = [
+        Category(
+            id=uuid4(),
+            name=f"Category {index}",
+            description="Benchmark category",
+            type="expense",
+            color="#FF6B6B",
+            icon="🍔",
+            created_at=now,
+            updated_at=now,
+        )
+        for index in range(10)
+    ]
+    rows = []
+    for index in range(items):
+        category = categories[index % len(categories)]
+        rows.append(
+            Transaction(
+                id=uuid4(),
+                user_id=uuid4(),
+                amount=Decimal("125000.50") + index,
+                name=f"Transaction {index}",
+                type="expense",
+                description="Benchmark transaction",
+                date=now - timedelta(hours=index),
+                category_id=category.id,
+                category=category,
+                created_at=now,
+                updated_at=now,
+            )
+        )
+    return PaginatedTransactions(items=rows, next_cursor="cursor", has_next=True, limit=items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    page = build_page(args.items)
+    adapter = TypeAdapter(PaginatedTransactions)
+    response = FastJSONResponse(content=None)
+
+    # Each candidate validates the endpoint result first, like FastAPI does
+    candidates = {
+        "jsonable_encoder + json": lambda: json.dumps(
+            jsonable_encoder(adapter.validate_python(page))
+        ).encode("utf-8"),
+        "FastJSONResponse (orjson)": lambda: response.render(
+            adapter.dump_python(adapter.validate_python(page), mode="json")
+        ),
+        "pydantic-core dump_json": lambda: adapter.dump_json(adapter.validate_python(page)),
+    }
+
+    # Same document from every encoder
+    decoded = [json.loads(encode()) for encode in candidates.values()]
+    assert all(document == decoded[0] for document in decoded), "encoders disagree"
+
+    print(f"{args.items} items, {args.repeat} runs (FastAPI fast path: {fastapi_serializes_to_json()})")
+    baseline = None
+    for name, encode in candidates.items():
+        seconds = min(timeit.repeat(encode, number=args.repeat, repeat=3)) / args.repeat
+        baseline = baseline or seconds
+        print(f"  {name:<28} {seconds * 1000:8.3f} ms  x{baseline / seconds:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Benchmark: biểu đồ một năm giao dịch theo ngày/tuần/tháng
+
+So sánh hai cách lấy dữ liệu cho biểu đồ:
+- client-side: tải lần lượt từng trang GET /transactions (100 items/trang),
+  decode JSON và tự gom nhóm theo bucket trên thiết bị
+- GET /transactions/series: gom nhóm bằng SQL trên bảng rollup, một request
+
+Dữ liệu được tạo trong một SQLite tạm (hoặc DATABASE_URL nếu truyền --database-url).
+
+Chạy:
+python scripts/bench_series.py --transactions 20000 --granularity day --repeat 5
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from pydantic import TypeAdapter  # noqa: E402
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.crud import transaction as crud_transaction  # noqa: E402
+from app.crud import user as crud_user  # noqa: E402
+from app.crud.aio.transaction import transactions_from_rows  # noqa: E402
+from app.core.category_catalog import category_catalog  # noqa: E402
+from app.models import Category  # noqa: E402
+from app.models.enums import CategoryType  # noqa: E402
+from app.schemas.transaction import PaginatedTransactions, TransactionSeries  # noqa: E402
+from app.schemas.user import UserCreate  # noqa: E402
+
+PAGE_SIZE = 100
+
+
+def seed(db, transactions: int, end: date):
+    user = crud_user.create_user(
+        db,
+        UserCreate(
+            email=f"bench-{time.time_ns()}@example.com",
+            username=f"bench{time.time_ns()}",
+            password="benchpassword",
+            full_name="Bench",
+        ),
+    )
+    categories = [
+        Category(name=f"Bench {index} {time.time_ns()}", type=CategoryType.EXPENSE, is_global=True)
+        for index in range(10)
+    ]
+    db.add_all(categories)
+    db.commit()
+
+    rng = random.Random(42)
+    start = datetime.combine(end - timedelta(days=364), datetime.min.time(), tzinfo=timezone.utc)
+    rows = [
+        {
+            "amount": f"{rng.randint(1000, 500000)}.00",
+            "type": "expense" if rng.random() < 0.8 else "income",
+            "name": f"Transaction {index}",
+            "date": (start + timedelta(seconds=rng.randint(0, 365 * 86400 - 1))).isoformat(),
+            "category_id": str(rng.choice(categories).id),
+        }
+        for index in range(transactions)
+    ]
+    result = crud_transaction.import_transactions(db, rows, user.id)
+    assert result.imported == transactions, result.errors[:3]
+    return user
+
+
+def bucket_of(day: date, granularity: str) -> date:
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def client_side(db, user_id, granularity: str, start: date, end: date):
+    """Page through the list endpoint's query + encoding, bucket on the 'device'."""
+    page_adapter = TypeAdapter(PaginatedTransactions)
+    lower = datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc)
+    upper = datetime.combine(end, datetime.max.time(), tzinfo=timezone.utc)
+    totals = defaultdict(lambda: [Decimal("0"), Decimal("0")])
+    cursor, requests = None, 0
+    while True:
+        rows, cursor, has_next = crud_transaction.get_transaction_rows_cursor(
+            db, user_id, limit=PAGE_SIZE, cursor=cursor, start_date=lower, end_date=upper
+        )
+        categories = category_catalog.resolve(db, user_id, {row.category_id for row in rows})
+        page = PaginatedTransactions(
+            items=transactions_from_rows(rows, user_id, categories),
+            next_cursor=cursor,
+            has_next=has_next,
+            limit=PAGE_SIZE,
+        )
+        body = page_adapter.dump_json(page)
+        requests += 1
+        for item in json.loads(body)["items"]:
+            day = datetime.fromisoformat(item["date"].replace("Z", "+00:00")).date()
+            totals[bucket_of(day, granularity)][item["type"] == "expense"] += Decimal(item["amount"])
+        if not has_next:
+            return totals, requests
+
+
+def server_side(db, user_id, granularity: str, start: date, end: date):
+    series = crud_transaction.get_transaction_series(
+        db, user_id, granularity, start_date=start, end_date=end, today=end
+    )
+    body = TypeAdapter(TransactionSeries).dump_json(series)
+    return json.loads(body)["points"]
+
+
+def best_of(repeat: int, call):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = call()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--transactions", type=int, default=20000)
+    parser.add_argument("--granularity", choices=["day", "week", "month"], default="day")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    end = datetime.now(timezone.utc).date()
+    start = end - timedelta(days=364)
+    with SessionLocal() as db:
+        user = seed(db, args.transactions, end)
+
+        client_seconds, (totals, requests) = best_of(
+            args.repeat, lambda: client_side(db, user.id, args.granularity, start, end)
+        )
+        server_seconds, points = best_of(
+            args.repeat, lambda: server_side(db, user.id, args.granularity, start, end)
+        )
+
+    # Both approaches agree on every non-empty bucket
+    for point in points:
+        income, expense = totals.get(date.fromisoformat(point["period_start"]), (Decimal("0"), Decimal("0")))
+        assert (Decimal(point["income"]), Decimal(point["expense"])) == (income, expense), point
+
+    print(f"{args.transactions} transactions over one year, granularity={args.granularity} ({len(points)} points)")
+    print(f"  client-side ({requests} pages)   {client_seconds * 1000:10.2f} ms")
+    print(f"  /transactions/series        {server_seconds * 1000:10.2f} ms  x{client_seconds / server_seconds:7.1f}")
+
+
+if __name__ == "__main__":
+    main()
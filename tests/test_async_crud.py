@@ -0,0 +1,183 @@
+"""
+Tests for the async (AsyncSession) CRUD layer used by the API.
+"""
+import pytest
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from app.core.database import get_async_database_url
+from app.crud.aio import transaction as crud_transaction
+from app.crud.aio import user as crud_user
+from app.schemas.transaction import Transaction, TransactionCreate, TransactionUpdate
+
+
+def test_async_database_url():
+    """Test that sync URLs are mapped to their async drivers"""
+    assert get_async_database_url("postgresql://u:p@localhost/db") == "postgresql+asyncpg://u:p@localhost/db"
+    assert get_async_database_url("postgresql+psycopg2://u:p@localhost/db") == "postgresql+asyncpg://u:p@localhost/db"
+    assert get_async_database_url("sqlite:////tmp/app.db") == "sqlite+aiosqlite:////tmp/app.db"
+    assert get_async_database_url("sqlite+aiosqlite:///app.db") == "sqlite+aiosqlite:///app.db"
+
+
+@pytest.mark.asyncio
+async def test_async_transaction_crud(async_session_factory, test_user, test_category):
+    """Test that async CRUD returns fully loaded schemas (no lazy loads after the call)"""
+    async with async_session_factory() as db:
+        created = await crud_transaction.create_transaction(
+            db,
+            TransactionCreate(
+                amount=Decimal("12.00"),
+                type="expense",
+                name="Async",
+                date=datetime(2024, 3, 1, 9, 0, tzinfo=timezone.utc),
+                category_id=test_category.id,
+            ),
+            test_user.id,
+        )
+        assert isinstance(created, Transaction)
+        assert created.category.name == test_category.name
+
+        updated = await crud_transaction.update_transaction(
+            db, created.id, TransactionUpdate(amount=Decimal("15.00")), test_user.id
+        )
+        assert updated.amount == Decimal("15.00")
+
+        items, next_cursor, has_next = await crud_transaction.get_transaction_list_cursor(db, test_user.id)
+        assert [item.id for item in items] == [created.id]
+        assert items[0].category.id == test_category.id
+        assert has_next is False
+
+        batches = [
+            batch async for batch in crud_transaction.iter_transactions_for_export(db, test_user.id)
+        ]
+        assert [row.id for batch in batches for row in batch] == [created.id]
+
+        assert await crud_transaction.delete_transaction(db, created.id, test_user.id) is True
+        assert await crud_transaction.get_transaction(db, created.id, test_user.id) is None
+
+
+@pytest.mark.asyncio
+async def test_async_authenticate_user(async_session_factory, test_user):
+    """Test native async user lookups and password check"""
+    async with async_session_factory() as db:
+        assert (await crud_user.get_user_by_username(db, test_user.email)).id == test_user.id
+        assert (await crud_user.authenticate_user(db, test_user.username, "testpassword123")).id == test_user.id
+        assert await crud_user.authenticate_user(db, test_user.username, "wrong") is None
+
+
+@pytest.mark.asyncio
+async def test_async_authenticate_rehashes_outdated_hash(async_session_factory, db_session, test_user):
+    """Test a hash with other bcrypt rounds is upgraded on successful login"""
+    from app.core.security import pwd_context
+    from app.models import User
+
+    test_user.hashed_password = pwd_context.handler("bcrypt").using(rounds=4).hash("testpassword123")
+    db_session.commit()
+    assert pwd_context.needs_update(test_user.hashed_password)
+
+    async with async_session_factory() as db:
+        assert await crud_user.authenticate_user(db, test_user.username, "wrong") is None
+        assert (await crud_user.authenticate_user(db, test_user.username, "testpassword123")).id == test_user.id
+
+    db_session.expire_all()
+    stored = db_session.get(User, test_user.id).hashed_password
+    assert not pwd_context.needs_update(stored)
+    assert pwd_context.verify("testpassword123", stored)
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_does_not_block_event_loop():
+    """Test bcrypt runs off the event loop"""
+    import asyncio
+    from app.core.security import get_password_hash_async, verify_password
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    ticking = asyncio.create_task(ticker())
+    try:
+        hashed = await get_password_hash_async("secret")
+    finally:
+        ticking.cancel()
+    assert verify_password("secret", hashed)
+    # The loop kept serving other tasks while the hash was computed
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_import_validates_off_event_loop(async_session_factory, test_user, monkeypatch):
+    """Test import row validation and preparation run in a worker thread"""
+    import threading
+    from app.crud import transaction as sync_crud_transaction
+
+    loop_thread = threading.get_ident()
+    threads = {}
+    for name in ("validate_import_rows", "prepare_import_rows"):
+        original = getattr(sync_crud_transaction, name)
+
+        def recording(*args, _name=name, _original=original, **kwargs):
+            threads[_name] = threading.get_ident()
+            return _original(*args, **kwargs)
+
+        monkeypatch.setattr(sync_crud_transaction, name, recording)
+
+    rows = [
+        {"amount": "10.00", "type": "expense", "name": "Ok", "date": "2024-03-01T09:00:00Z"},
+        {"amount": "not a number", "type": "expense", "name": "Bad", "date": "2024-03-01T09:00:00Z"},
+    ]
+    async with async_session_factory() as db:
+        result = await crud_transaction.import_transactions(db, rows, test_user.id)
+    assert (result.received, result.imported, result.failed) == (2, 1, 1)
+    assert result.errors[0].row == 2
+    assert set(threads) == {"validate_import_rows", "prepare_import_rows"}
+    assert loop_thread not in threads.values()
+
+
+@pytest.mark.asyncio
+async def test_summaries_build_off_event_loop(async_session_factory, test_user, test_transactions, monkeypatch):
+    """Test the grouped breakdown and the timezone rollup rebuild aggregate in a worker thread"""
+    import threading
+    from app.crud import transaction as sync_crud_transaction
+    from app.schemas.user import UserUpdate
+
+    loop_thread = threading.get_ident()
+    threads = {}
+    for name in ("build_grouped_breakdown", "aggregate_rollup_rows"):
+        original = getattr(sync_crud_transaction, name)
+
+        def recording(*args, _name=name, _original=original, **kwargs):
+            threads[_name] = threading.get_ident()
+            return _original(*args, **kwargs)
+
+        monkeypatch.setattr(sync_crud_transaction, name, recording)
+
+    async with async_session_factory() as db:
+        grouped = await crud_transaction.get_grouped_transactions(db, test_user.id, include_breakdown=True)
+        assert grouped.timeframes is not None
+        await crud_user.update_user(db, test_user.id, UserUpdate(timezone="Asia/Ho_Chi_Minh"))
+    assert set(threads) == {"build_grouped_breakdown", "aggregate_rollup_rows"}
+    assert loop_thread not in threads.values()
+
+
+def test_transactions_from_rows_matches_validation(db_session, test_user, test_transactions):
+    """Test schemas built from list rows equal those validated from ORM rows"""
+    from app.core.category_catalog import category_catalog
+    from app.crud import transaction as sync_transaction
+    from app.crud.aio.transaction import transactions_from_rows
+
+    rows, _, _ = sync_transaction.get_transaction_rows_cursor(db_session, test_user.id, limit=100)
+    categories = category_catalog.resolve(db_session, test_user.id, {row.category_id for row in rows})
+    built = transactions_from_rows(rows, test_user.id, categories)
+
+    items, _, _ = sync_transaction.get_transactions_cursor(
+        db_session, test_user.id, limit=100, load_category=True
+    )
+    expected = [Transaction.model_validate(item) for item in items]
+    assert len(built) == len(test_transactions)
+    assert built == expected
+    assert [item.model_dump_json() for item in built] == [item.model_dump_json() for item in expected]
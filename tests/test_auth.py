@@ -127,3 +127,122 @@ def test_refresh_token_success(client, test_user):
     assert "access_token" in data
     assert "refresh_token" in data
     assert data["token_type"] == "bearer"
+
+
+def test_access_token_carries_claims(client, test_user, auth_headers):
+    """Test access tokens carry the user id, role and token version"""
+    from app.core.security import decode_access_token
+
+    payload = decode_access_token(auth_headers["Authorization"].split()[1])
+    assert payload["sub"] == "testuser"
+    assert payload["uid"] == str(test_user.id)
+    assert payload["role"] == "MEMBER"
+    assert payload["tv"] == 0
+
+
+def test_current_user_built_from_claims(client, auth_headers, test_category, sql_statements):
+    """Test authenticated requests don't read the user once versions are loaded"""
+    response = client.get("/api/v1/categories/", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    sql_statements.clear()
+    response = client.get("/api/v1/categories/", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert not [statement for statement in sql_statements if "FROM users" in statement]
+
+
+def test_legacy_token_without_claims(client, test_user):
+    """Test tokens carrying only the username still authenticate"""
+    from app.core.security import create_access_token
+
+    token = create_access_token(data={"sub": "testuser"})
+    response = client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["id"] == str(test_user.id)
+
+
+def test_role_change_revokes_tokens(client, test_user, auth_headers):
+    """Test changing a claimed field bumps the token version"""
+    login_response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "testuser", "password": "testpassword123"}
+    )
+    refresh_token = login_response.json()["refresh_token"]
+
+    response = client.put(
+        f"/api/v1/users/{test_user.id}",
+        headers=auth_headers,
+        json={"role": "ADMIN"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    response = client.get("/api/v1/auth/me", headers=auth_headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    login_response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "testuser", "password": "testpassword123"}
+    )
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    response = client.get("/api/v1/auth/me", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["role"] == "ADMIN"
+
+
+def test_token_versions_refreshed_in_bulk(client, test_user, auth_headers, db_session, monkeypatch):
+    """Test a version bumped by another worker is picked up on refresh"""
+    from datetime import datetime, timezone
+    from app.core.token_versions import token_versions
+
+    response = client.get("/api/v1/auth/me", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    # Simulate another worker revoking the tokens
+    test_user.token_version = 1
+    test_user.token_version_updated_at = datetime.now(timezone.utc)
+    db_session.commit()
+    response = client.get("/api/v1/categories/", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    # The next refresh only reads rows bumped since the previous one
+    monkeypatch.setattr(token_versions, "refresh_interval", 0)
+    response = client.get("/api/v1/categories/", headers=auth_headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_token_versions_skip_expired_bumps(client, test_user, auth_headers, db_session):
+    """Test bumps older than the access token lifetime are not loaded"""
+    from datetime import datetime, timedelta, timezone
+    from app.core.token_versions import token_versions
+
+    test_user.token_version = 1
+    test_user.token_version_updated_at = datetime.now(timezone.utc) - timedelta(days=1)
+    db_session.commit()
+    token_versions.clear()
+
+    client.get("/api/v1/auth/me", headers=auth_headers)
+    assert test_user.id not in token_versions._versions
+
+
+def test_token_versions_revoke_users_deleted_elsewhere(client, test_user, auth_headers, db_session, monkeypatch):
+    """Test tokens of a user deleted by another worker are rejected after refresh"""
+    from sqlalchemy.orm import sessionmaker
+    from app.core.token_versions import token_versions
+    from app.models import User
+
+    response = client.get("/api/v1/auth/me", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    # Another worker deletes the user without touching this process's map
+    other = sessionmaker(bind=db_session.get_bind())()
+    try:
+        other.delete(other.get(User, test_user.id))
+        other.commit()
+    finally:
+        other.close()
+
+    monkeypatch.setattr(token_versions, "refresh_interval", 0)
+    response = client.get("/api/v1/categories/", headers=auth_headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,327 @@
+"""
+Tests for the summary cache and its backends.
+"""
+import pytest
+from fastapi import status
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+from app.core.cache import (
+    CacheBackend,
+    LRUCacheBackend,
+    PrincipalCache,
+    RedisCacheBackend,
+    SummaryCache,
+    seconds_until_next_day,
+)
+from app.schemas.transaction import TransactionGroupedResponse
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for a Redis client (GET/SET/INCR)."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    def get(self, name):
+        value = self.data.get(name)
+        return value.encode("utf-8") if value is not None else None
+
+    def set(self, name, value, ex=None, nx=False):
+        if nx and name in self.data:
+            return None
+        self.data[name] = str(value)
+        self.ttls[name] = ex
+        return True
+
+    def incr(self, name):
+        self.data[name] = str(int(self.data.get(name, "0")) + 1)
+        return int(self.data[name])
+
+
+class FakeAsyncRedis:
+    """redis.asyncio-style wrapper around FakeRedis."""
+
+    def __init__(self, sync_client):
+        self.sync_client = sync_client
+
+    async def get(self, name):
+        return self.sync_client.get(name)
+
+    async def set(self, name, value, ex=None, nx=False):
+        return self.sync_client.set(name, value, ex=ex, nx=nx)
+
+    async def incr(self, name):
+        return self.sync_client.incr(name)
+
+
+class BlockingClient:
+    """Stands in for a blocking client that must not be used on the event loop."""
+
+    def __getattr__(self, name):
+        raise AssertionError(f"blocking Redis call {name!r} on the event loop")
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    if request.param == "memory":
+        return LRUCacheBackend(max_entries=2)
+    return RedisCacheBackend(FakeRedis())
+
+
+def test_backend_get_set(backend):
+    """Test basic get/set round trip"""
+    assert backend.get("missing") is None
+    backend.set("key", "value", ttl=60)
+    assert backend.get("key") == "value"
+
+
+def test_backend_versions_increase(backend):
+    """Test versions start from a time-based base and increase on bump"""
+    first = backend.get_version("ver:user")
+    assert first > 0
+    assert backend.get_version("ver:user") == first
+    assert backend.bump_version("ver:user") == first + 1
+    assert backend.get_version("ver:user") == first + 1
+
+
+def test_lru_backend_evicts_least_recently_used():
+    """Test LRU eviction order"""
+    backend = LRUCacheBackend(max_entries=2)
+    backend.set("a", "1")
+    backend.set("b", "2")
+    backend.get("a")
+    backend.set("c", "3")
+    assert backend.get("a") == "1"
+    assert backend.get("b") is None
+    assert backend.get("c") == "3"
+
+
+def test_lru_backend_expires_entries():
+    """Test expired entries are not returned"""
+    backend = LRUCacheBackend()
+    backend.set("key", "value", ttl=-1)
+    assert backend.get("key") is None
+
+
+def test_cache_backend_is_abstract():
+    """Test backends must implement the whole interface"""
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+def test_seconds_until_next_day_in_local_zone():
+    """Test the day boundary is local midnight, including on DST changes"""
+    assert seconds_until_next_day(datetime(2024, 5, 1, 23, 0, tzinfo=timezone.utc)) == 3600
+    assert seconds_until_next_day(datetime(2024, 5, 1, 23, 0)) == 3600  # Naive means UTC
+
+    new_york = ZoneInfo("America/New_York")
+    assert seconds_until_next_day(datetime(2024, 5, 1, 23, 0, tzinfo=new_york)) == 3600
+    # Clocks go forward on 2024-03-10: the day has 23 hours
+    assert seconds_until_next_day(datetime(2024, 3, 10, 0, 0, tzinfo=new_york)) == 23 * 3600
+    # And back on 2024-11-03: 25 hours
+    assert seconds_until_next_day(datetime(2024, 11, 3, 0, 0, tzinfo=new_york)) == 25 * 3600
+
+
+def test_summary_cache_hit_and_invalidation(backend):
+    """Test get_or_compute caches until the user's version is bumped"""
+    cache = SummaryCache(backend)
+    user_id = uuid4()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return TransactionGroupedResponse(total=Decimal(len(calls)), lasted_update_at=None)
+
+    params = {"type": "expense"}
+    first = cache.get_or_compute(user_id, "grouped", params, TransactionGroupedResponse, compute, ttl=60)
+    second = cache.get_or_compute(user_id, "grouped", params, TransactionGroupedResponse, compute, ttl=60)
+    assert first == second
+    assert len(calls) == 1
+
+    cache.bump_user(user_id)
+    third = cache.get_or_compute(user_id, "grouped", params, TransactionGroupedResponse, compute, ttl=60)
+    assert third.total == Decimal("2")
+    assert len(calls) == 2
+
+
+def test_period_summary_endpoint_cached_and_invalidated(client, auth_headers, test_category, monkeypatch):
+    """Test repeated summary requests hit the cache and writes invalidate it"""
+    from app.crud import transaction as crud_transaction
+
+    calls = []
+    original = crud_transaction.get_period_summary_rows
+
+    def counting_summary(*args, **kwargs):
+        calls.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(crud_transaction, "get_period_summary_rows", counting_summary)
+
+    for _ in range(3):
+        response = client.get("/api/v1/transactions/summary/timeframes/this_month", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert Decimal(response.json()["total_expense"]) == Decimal("0")
+    assert len(calls) == 1
+
+    from datetime import datetime, timezone
+    response = client.post(
+        "/api/v1/transactions/",
+        headers=auth_headers,
+        json={
+            "amount": "42.00",
+            "type": "expense",
+            "name": "Cache buster",
+            "date": datetime.now(timezone.utc).isoformat(),
+            "category_id": str(test_category.id),
+        }
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+    response = client.get("/api/v1/transactions/summary/timeframes/this_month", headers=auth_headers)
+    assert Decimal(response.json()["total_expense"]) == Decimal("42.00")
+    assert len(calls) == 2
+
+
+def test_summary_endpoint_not_stale_after_write_on_other_worker(client, auth_headers, monkeypatch):
+    """Test a write whose cache bump only reached another worker still shows up"""
+    from datetime import datetime, timezone
+    from app.core.cache import summary_cache
+
+    url = "/api/v1/transactions/summary/timeframes/this_month"
+    first = client.get(url, headers=auth_headers)
+    assert Decimal(first.json()["total_expense"]) == Decimal("0")
+
+    # The write is handled by a worker with its own in-process version counters
+    monkeypatch.setattr(summary_cache, "bump_user", lambda user_id: None)
+    response = client.post(
+        "/api/v1/transactions/",
+        headers=auth_headers,
+        json={
+            "amount": "42.00",
+            "type": "expense",
+            "name": "Other worker",
+            "date": datetime.now(timezone.utc).isoformat(),
+        }
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+    response = client.get(url, headers={**auth_headers, "If-None-Match": first.headers["ETag"]})
+    assert response.status_code == status.HTTP_200_OK
+    assert Decimal(response.json()["total_expense"]) == Decimal("42.00")
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_does_not_block_event_loop(async_session_factory):
+    """Test async callers and CRUD code inside run_sync use the asyncio client"""
+    store = FakeRedis()
+    backend = RedisCacheBackend(BlockingClient(), async_client=FakeAsyncRedis(store))
+    cache = SummaryCache(backend)
+    user_id = uuid4()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return TransactionGroupedResponse(total=Decimal(len(calls)), lasted_update_at=None)
+
+    params = {"type": "expense"}
+    await cache.get_or_compute_async(user_id, "grouped", params, TransactionGroupedResponse, compute)
+    cached = await cache.get_or_compute_async(user_id, "grouped", params, TransactionGroupedResponse, compute)
+    assert cached.total == Decimal("1")
+
+    # Sync CRUD functions bump versions from inside AsyncSession.run_sync
+    async with async_session_factory() as db:
+        await db.run_sync(lambda session: cache.bump_user(user_id))
+    fresh = await cache.get_or_compute_async(user_id, "grouped", params, TransactionGroupedResponse, compute)
+    assert fresh.total == Decimal("2")
+
+    principals = PrincipalCache(backend, ttl=60)
+    version = await principals.get_version_async("alice")
+    await principals.invalidate_async("alice")
+    assert await principals.get_version_async("alice") == version + 1
+
+
+def test_principal_cache_version_check():
+    """Test a cached principal is dropped once its subject is invalidated"""
+    backend = RedisCacheBackend(FakeRedis())
+    cache = PrincipalCache(backend, ttl=60)
+    version = cache.get_version("alice")
+    assert cache.get("alice", version) is None
+
+    cache.set("alice", "principal", version)
+    assert cache.get("alice", cache.get_version("alice")) == "principal"
+
+    # Another worker sharing the backend bumps the version
+    PrincipalCache(backend, ttl=60).invalidate("alice")
+    assert cache.get("alice", cache.get_version("alice")) is None
+
+
+def test_principal_cache_disabled_without_ttl(backend):
+    """Test TTL=0 disables the cache"""
+    cache = PrincipalCache(backend, ttl=0)
+    version = cache.get_version("alice")
+    cache.set("alice", "principal", version)
+    assert cache.get("alice", version) is None
+
+
+def test_principal_cache_needs_shared_backend():
+    """Test the in-process backend disables the cache (invalidation wouldn't reach other workers)"""
+    cache = PrincipalCache(LRUCacheBackend(), ttl=60)
+    assert not cache.enabled
+    version = cache.get_version("alice")
+    cache.set("alice", "principal", version)
+    assert cache.get("alice", version) is None
+    assert PrincipalCache(RedisCacheBackend(FakeRedis()), ttl=60).enabled
+
+
+def _count_user_selects(statements):
+    return sum(
+        1 for statement in statements
+        if statement.lstrip().upper().startswith("SELECT") and "FROM USERS" in statement.upper()
+    )
+
+
+def test_current_user_cached_and_invalidated(client, auth_headers, test_user, sql_statements, monkeypatch):
+    """Test authenticated requests reuse the principal until the user changes"""
+    from app.core.cache import principal_cache
+
+    monkeypatch.setattr(principal_cache, "backend", RedisCacheBackend(FakeRedis()))
+    response = client.get("/api/v1/auth/me", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    sql_statements.clear()
+    response = client.get("/api/v1/auth/me", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert _count_user_selects(sql_statements) == 0
+
+    response = client.put(
+        f"/api/v1/users/{test_user.id}",
+        headers=auth_headers,
+        json={"full_name": "Renamed User"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    response = client.get("/api/v1/auth/me", headers=auth_headers)
+    assert response.json()["full_name"] == "Renamed User"
+
+    response = client.delete(f"/api/v1/users/{test_user.id}", headers=auth_headers)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    response = client.get("/api/v1/auth/me", headers=auth_headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_profile_change_visible_without_shared_backend(client, auth_headers, db_session, test_user):
+    """Test a profile changed on another worker is used right away with the in-process backend"""
+    response = client.get("/api/v1/auth/me", headers=auth_headers)
+    assert response.json()["timezone"] == "UTC"
+
+    # Written by another worker: no invalidation reaches this one
+    test_user.timezone = "Asia/Ho_Chi_Minh"
+    db_session.commit()
+
+    response = client.get("/api/v1/auth/me", headers=auth_headers)
+    assert response.json()["timezone"] == "Asia/Ho_Chi_Minh"
@@ -97,3 +97,156 @@ def test_delete_category(client, auth_headers, test_category):
         headers=auth_headers
     )
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_categories_served_from_catalog(
+    client, auth_headers, auth_headers_user2, test_category, sql_statements
+):
+    """Test category reads come from the catalog and new categories show up at once"""
+    response = client.get("/api/v1/categories/", headers=auth_headers)
+    assert [item["id"] for item in response.json()["items"]] == [str(test_category.id)]
+
+    sql_statements.clear()
+    response = client.get(f"/api/v1/categories/{test_category.id}", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert not [statement for statement in sql_statements if "FROM categories" in statement]
+
+    response = client.post(
+        "/api/v1/categories/",
+        headers=auth_headers,
+        json={"name": "Rent", "type": "expense"}
+    )
+    new_id = response.json()["id"]
+
+    # Newest first, one per page
+    response = client.get("/api/v1/categories/", headers=auth_headers, params={"limit": 1})
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == [new_id]
+    assert data["has_next"] is True
+    response = client.get(
+        "/api/v1/categories/", headers=auth_headers, params={"limit": 1, "cursor": data["next_cursor"]}
+    )
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == [str(test_category.id)]
+    assert data["has_next"] is False
+
+    # Categories linked to another user stay hidden
+    response = client.get("/api/v1/categories/", headers=auth_headers_user2)
+    assert response.json()["items"] == []
+    response = client.get(f"/api/v1/categories/{new_id}", headers=auth_headers_user2)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_catalog_fresh_across_workers(
+    client, db_session, auth_headers, test_user, test_user2, test_category, sql_statements
+):
+    """Test catalog changes made on another worker show up without a shared cache backend"""
+    from app.core.category_catalog import category_catalog
+    from app.crud import category as crud_category
+    from app.schemas.category import CategoryCreate, CategoryUpdate
+
+    response = client.get("/api/v1/categories/", headers=auth_headers)
+    assert [item["name"] for item in response.json()["items"]] == ["Food"]
+
+    # Writes leave no in-process state behind: only the version rows change
+    salary = crud_category.create_category(db_session, CategoryCreate(name="Salary", type="income"))
+    crud_category.update_category(db_session, test_category.id, CategoryUpdate(name="Groceries"))
+    sql_statements.clear()
+    response = client.get("/api/v1/categories/", headers=auth_headers)
+    assert [item["name"] for item in response.json()["items"]] == ["Salary", "Groceries"]
+    assert crud_category.get_visible_category_ids(db_session, {salary.id}, test_user.id) == {salary.id}
+    # Versions are read by primary key, not by scanning categories
+    version_reads = [statement for statement in sql_statements if "category_catalog_versions" in statement]
+    assert version_reads and not [statement for statement in version_reads if "FROM categories" in statement]
+
+    crud_category.delete_category(db_session, salary.id)
+    response = client.get("/api/v1/categories/", headers=auth_headers)
+    assert [item["name"] for item in response.json()["items"]] == ["Groceries"]
+    assert crud_category.get_visible_category_ids(db_session, {salary.id}, test_user.id) == set()
+
+    # Another user's private categories leave this user's catalog alone
+    versions = category_catalog.get_versions(db_session, test_user.id)
+    private = crud_category.create_category(db_session, CategoryCreate(name="Pets", type="expense"), test_user2.id)
+    crud_category.update_category(db_session, private.id, CategoryUpdate(name="Dogs"), test_user2.id)
+    crud_category.delete_category(db_session, private.id, test_user2.id)
+    assert category_catalog.get_versions(db_session, test_user.id) == versions
+
+
+def test_catalog_shared_backend_bumped_after_commit(db_session, test_user):
+    """Test shared backend versions only move once the write is committed"""
+    from app.core.cache import LRUCacheBackend
+    from app.core.category_catalog import CategoryCatalog
+
+    class SharedBackend(LRUCacheBackend):
+        shared = True
+
+    catalog = CategoryCatalog(SharedBackend(), ttl=60)
+    versions = catalog.get_versions(db_session, test_user.id)
+    catalog.bump_user(db_session, test_user.id)
+    assert catalog.get_versions(db_session, test_user.id) == versions
+    catalog.publish_pending(db_session)
+    assert catalog.get_versions(db_session, test_user.id)[1] > versions[1]
+    catalog.publish_pending(db_session)  # Nothing left to publish
+
+
+def test_category_rename_reaches_transactions(client, auth_headers, test_category):
+    """Test renaming a category refreshes transaction lists and summaries"""
+    from datetime import datetime, timezone
+    response = client.post(
+        "/api/v1/transactions/",
+        headers=auth_headers,
+        json={
+            "amount": "12.00",
+            "type": "expense",
+            "name": "Lunch",
+            "date": datetime.now(timezone.utc).isoformat(),
+            "category_id": str(test_category.id),
+        }
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+    list_response = client.get("/api/v1/transactions/", headers=auth_headers)
+    assert list_response.json()["items"][0]["category"]["name"] == "Food"
+    summary_url = "/api/v1/transactions/summary/timeframes/today"
+    summary_response = client.get(summary_url, headers=auth_headers)
+    assert summary_response.json()["categories"][0]["category_name"] == "Food"
+
+    response = client.put(
+        f"/api/v1/categories/{test_category.id}",
+        headers=auth_headers,
+        json={"name": "Groceries"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    response = client.get(
+        "/api/v1/transactions/",
+        headers={**auth_headers, "If-None-Match": list_response.headers["ETag"]}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["items"][0]["category"]["name"] == "Groceries"
+    response = client.get(
+        summary_url,
+        headers={**auth_headers, "If-None-Match": summary_response.headers["ETag"]}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["categories"][0]["category_name"] == "Groceries"
+
+
+def test_global_categories_visible_to_everyone(client, db_session, auth_headers, auth_headers_user2, test_category):
+    """Test global categories are listed for every user, linked ones only for their owner"""
+    from app.models import Category
+    from app.models.enums import CategoryType
+    shared = Category(name="Salary", type=CategoryType.INCOME, is_global=True)
+    db_session.add(shared)
+    db_session.commit()
+
+    response = client.get("/api/v1/categories/", headers=auth_headers)
+    items = {item["id"]: item["is_global"] for item in response.json()["items"]}
+    assert items == {str(shared.id): True, str(test_category.id): False}
+
+    response = client.get("/api/v1/categories/", headers=auth_headers_user2)
+    assert [item["id"] for item in response.json()["items"]] == [str(shared.id)]
+
+    # Categories created by a user are linked to that user only
+    response = client.post("/api/v1/categories/", headers=auth_headers_user2, json={"name": "Rent", "type": "expense"})
+    assert response.json()["is_global"] is False
@@ -0,0 +1,96 @@
+"""
+Tests that the main transaction and category queries are served by indexes.
+"""
+import pytest
+from datetime import datetime, timezone
+from sqlalchemy import event
+from uuid import UUID
+
+from app.crud import category as crud_category
+from app.crud import transaction as crud_transaction
+
+
+CATEGORY_ID = UUID("0190a000-0000-7000-8000-000000000001")
+SINCE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _capture_transaction_selects(db_session, call, table="transactions"):
+    """Run call() and return the (statement, parameters) of SELECTs on a table."""
+    statements = []
+    bind = db_session.get_bind()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and f"FROM {table}" in statement:
+            statements.append((statement, parameters))
+
+    event.listen(bind, "before_cursor_execute", record)
+    try:
+        call()
+    finally:
+        event.remove(bind, "before_cursor_execute", record)
+    return statements
+
+
+def _explain(db_session, statement, parameters) -> str:
+    connection = db_session.connection()
+    if connection.dialect.name == "sqlite":
+        rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+        return "\n".join(row[3] for row in rows)
+
+    # The test tables are tiny, so make Postgres show its index choice
+    connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    rows = connection.exec_driver_sql("EXPLAIN " + statement, parameters)
+    return "\n".join(row[0] for row in rows)
+
+
+@pytest.mark.parametrize(
+    "call, index_name",
+    [
+        (
+            lambda db, user_id: crud_transaction.get_transaction_rows_cursor(db, user_id),
+            "ix_transactions_user_id_date_id",
+        ),
+        (
+            lambda db, user_id: crud_transaction.get_transaction_rows_cursor(
+                db, user_id, start_date=SINCE, end_date=datetime(2024, 2, 1, tzinfo=timezone.utc)
+            ),
+            "ix_transactions_user_id_date_id",
+        ),
+        (
+            lambda db, user_id: list(crud_transaction.iter_transactions_for_export(db, user_id)),
+            "ix_transactions_user_id_date_id",
+        ),
+        (
+            lambda db, user_id: crud_transaction.get_transactions_for_grouping(
+                db, user_id, start_date=SINCE, type="expense"
+            ),
+            "ix_transactions_user_id_type_date",
+        ),
+        (
+            lambda db, user_id: crud_transaction.get_transactions_for_grouping(
+                db, user_id, start_date=SINCE, category_id=CATEGORY_ID
+            ),
+            "ix_transactions_user_id_category_id_date",
+        ),
+    ],
+    ids=["list", "list_date_range", "export", "grouping_by_type", "grouping_by_category"],
+)
+def test_transaction_queries_use_indexes(db_session, test_user, call, index_name):
+    """Test that EXPLAIN shows the expected index for each access path"""
+    statements = _capture_transaction_selects(db_session, lambda: call(db_session, test_user.id))
+    assert statements
+
+    plan = _explain(db_session, *statements[0])
+    assert index_name in plan
+
+
+def test_category_visibility_uses_indexes(db_session, test_user):
+    """Test visible categories are a union of index lookups, not correlated subqueries"""
+    statements = _capture_transaction_selects(
+        db_session, lambda: crud_category.get_categories(db_session, test_user.id), table="categories"
+    )
+    assert statements
+
+    plan = _explain(db_session, *statements[0])
+    assert "ix_categories_global_id" in plan
+    assert "CORRELATED" not in plan.upper()
@@ -0,0 +1,140 @@
+"""
+Tests for monthly partitioning of the transactions table.
+"""
+import pytest
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from app.core.partitions import (
+    detach_transaction_partition,
+    ensure_transaction_partitions,
+    get_month_start,
+    get_next_month,
+    get_partition_name,
+)
+from app.crud import transaction as crud_transaction
+from app.models import Transaction
+from app.schemas.transaction import TransactionCreate
+
+
+def test_partition_names_and_bounds():
+    """Test month helpers used to name partitions"""
+    assert get_partition_name(date(2024, 5, 17)) == "transactions_p2024_05"
+    assert get_next_month(date(2024, 12, 1)) == date(2025, 1, 1)
+    assert get_next_month(date(2024, 1, 1)) == date(2024, 2, 1)
+
+    # Partitions are UTC months, so local times are converted first
+    local_time = datetime(2024, 6, 1, 1, 30, tzinfo=timezone(timedelta(hours=7)))
+    assert get_month_start(local_time) == date(2024, 5, 1)
+
+
+def test_transactions_table_is_partitioned_on_postgres():
+    """Test the PostgreSQL DDL for the transactions table"""
+    ddl = str(CreateTable(Transaction.__table__).compile(dialect=postgresql.dialect()))
+    assert "PARTITION BY RANGE (date)" in ddl
+    assert "PRIMARY KEY (id, date)" in ddl
+    # The ORM still identifies transactions by id alone
+    assert [column.name for column in Transaction.__mapper__.primary_key] == ["id"]
+
+
+def test_partition_maintenance_is_noop_without_partitioning(db_session):
+    """Test that SQLite keeps a plain table"""
+    engine = db_session.get_bind()
+    if engine.dialect.name == "postgresql":
+        pytest.skip("Partition maintenance is only a no-op on databases without partitioning")
+
+    assert ensure_transaction_partitions(engine) == []
+    assert detach_transaction_partition(engine, date(2024, 1, 1)) is None
+
+
+@pytest.fixture
+def pg_engine(db_session):
+    """The test engine; skips unless TEST_DATABASE_URL points at PostgreSQL."""
+    engine = db_session.get_bind()
+    if engine.dialect.name != "postgresql":
+        pytest.skip("Partitioning needs PostgreSQL (set TEST_DATABASE_URL)")
+    return engine
+
+
+def _create(db_session, user_id, when, amount="10.00"):
+    return crud_transaction.create_transaction(
+        db_session,
+        TransactionCreate(amount=Decimal(amount), type="expense", name="Partitioned", date=when),
+        user_id,
+    )
+
+
+def _partition_of(db_session, transaction_id):
+    return db_session.execute(
+        text("SELECT tableoid::regclass::text FROM transactions WHERE id = :id"),
+        {"id": str(transaction_id)},
+    ).scalar()
+
+
+def test_ensure_partitions_creates_upcoming_months(pg_engine):
+    """Test the current and next months get their partitions, once"""
+    now = datetime(2024, 12, 15, tzinfo=timezone.utc)
+    created = ensure_transaction_partitions(pg_engine, months_ahead=1, now=now)
+    assert created == ["transactions_p2024_12", "transactions_p2025_01"]
+    assert ensure_transaction_partitions(pg_engine, months_ahead=1, now=now) == []
+
+
+def test_inserts_across_month_boundary(pg_engine, db_session, test_user):
+    """Test rows are routed by UTC month, and moved out of DEFAULT when their partition is created"""
+    ensure_transaction_partitions(pg_engine, months_ahead=1, now=datetime(2024, 1, 10, tzinfo=timezone.utc))
+
+    last_of_january = _create(db_session, test_user.id, datetime(2024, 1, 31, 23, 59, tzinfo=timezone.utc))
+    # 2024-02-01 06:30 in Ho Chi Minh City is still January 31st in UTC
+    local_february = _create(
+        db_session, test_user.id, datetime(2024, 2, 1, 6, 30, tzinfo=timezone(timedelta(hours=7)))
+    )
+    first_of_february = _create(db_session, test_user.id, datetime(2024, 2, 1, 0, 0, tzinfo=timezone.utc))
+    march = _create(db_session, test_user.id, datetime(2024, 3, 2, tzinfo=timezone.utc))
+
+    assert _partition_of(db_session, last_of_january.id) == "transactions_p2024_01"
+    assert _partition_of(db_session, local_february.id) == "transactions_p2024_01"
+    assert _partition_of(db_session, first_of_february.id) == "transactions_p2024_02"
+    assert _partition_of(db_session, march.id) == "transactions_default"
+
+    db_session.commit()
+    assert ensure_transaction_partitions(
+        pg_engine, months_ahead=0, now=datetime(2024, 3, 1, tzinfo=timezone.utc)
+    ) == ["transactions_p2024_03"]
+    assert _partition_of(db_session, march.id) == "transactions_p2024_03"
+    # Lookups by id alone still find rows in any partition
+    assert crud_transaction.get_transaction(db_session, march.id, test_user.id) is not None
+
+
+def test_detach_partition_adjusts_rollups(pg_engine, db_session, test_user):
+    """Test detaching a month removes its rows from the table, rollups and monthly spend"""
+    ensure_transaction_partitions(pg_engine, months_ahead=1, now=datetime(2024, 1, 10, tzinfo=timezone.utc))
+    _create(db_session, test_user.id, datetime(2024, 1, 20, tzinfo=timezone.utc), "10.00")
+    kept = _create(db_session, test_user.id, datetime(2024, 2, 20, tzinfo=timezone.utc), "5.00")
+    version = crud_transaction.get_data_version(db_session, test_user.id)
+    db_session.commit()
+
+    try:
+        assert detach_transaction_partition(pg_engine, date(2024, 1, 1)) == "transactions_p2024_01"
+        db_session.expire_all()
+
+        remaining = db_session.execute(text("SELECT id::text FROM transactions")).scalars().all()
+        assert remaining == [str(kept.id)]
+        assert db_session.execute(
+            text("SELECT day, sum FROM transaction_daily_rollups WHERE user_id = :user_id"),
+            {"user_id": str(test_user.id)},
+        ).all() == [(date(2024, 2, 20), Decimal("5.00"))]
+        assert db_session.execute(
+            text("SELECT month, expense FROM user_monthly_spend WHERE user_id = :user_id"),
+            {"user_id": str(test_user.id)},
+        ).all() == [(date(2024, 2, 1), Decimal("5.00"))]
+        assert crud_transaction.get_data_version(db_session, test_user.id) > version
+        # The detached table keeps its rows
+        assert db_session.execute(text("SELECT count(*) FROM transactions_p2024_01")).scalar() == 1
+        assert detach_transaction_partition(pg_engine, date(2024, 1, 1)) is None
+    finally:
+        db_session.rollback()
+        with pg_engine.begin() as connection:
+            connection.execute(text("DROP TABLE IF EXISTS transactions_p2024_01"))
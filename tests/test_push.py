@@ -0,0 +1,258 @@
+"""
+Tests for push notification delivery.
+"""
+import json
+import pytest
+import httpx
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import jwt
+
+from app.core import push
+from app.core.budget import budget_alerts
+from app.core.push import APNsProvider, FCMProvider, FakePushProvider, PushDispatcher
+from app.crud import user as crud_user
+from app.crud.aio import transaction as aio_transaction
+from app.models import UserDeviceToken
+from app.schemas.budget import BudgetAlert
+from app.schemas.push import PushNotification
+from app.schemas.transaction import TransactionCreate
+from app.schemas.user import UserCreate, UserUpdate
+
+
+def _add_token(db, user, token, device_type="android", is_active=True):
+    row = UserDeviceToken(
+        user_id=user.id,
+        device_token=token,
+        device_id=f"device-{token}",
+        device_type=device_type,
+        is_active=is_active,
+    )
+    db.add(row)
+    db.commit()
+    return row
+
+
+def _pem(key):
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_batches_tokens_and_deactivates_invalid(async_session_factory, db_session, sql_statements):
+    """Test one token query per batch of users and bulk deactivation of rejected tokens"""
+    users = [
+        crud_user.create_user(
+            db_session,
+            UserCreate(email=f"push{i}@example.com", username=f"push{i}", password="testpassword123"),
+        )
+        for i in range(5)
+    ]
+    for i, user in enumerate(users):
+        _add_token(db_session, user, f"android-{i}")
+    _add_token(db_session, users[0], "ios-0", device_type="ios")
+    _add_token(db_session, users[1], "old-1", is_active=False)
+    _add_token(db_session, users[2], "web-2", device_type="web")
+    gone = _add_token(db_session, users[3], "gone-3")
+
+    android = FakePushProvider(invalid_tokens={"gone-3"})
+    ios = FakePushProvider()
+    dispatcher = PushDispatcher(
+        async_session_factory, {"android": android, "ios": ios}, batch_size=2, concurrency=3
+    )
+    notification = PushNotification(title="Hello", body="World", data={"kind": "test"})
+    sql_statements.clear()
+
+    result = await dispatcher.dispatch([user.id for user in users], notification)
+
+    assert (result.sent, result.failed, result.deactivated, result.skipped) == (6, 0, 1, 1)
+    assert sorted(token for token, _ in android.sent) == [f"android-{i}" for i in range(5)]
+    assert [token for token, _ in ios.sent] == ["ios-0"]
+    token_queries = [
+        s for s in sql_statements if s.lstrip().upper().startswith("SELECT") and "user_device_tokens" in s
+    ]
+    assert len(token_queries) == 3  # 5 users in batches of 2
+    db_session.refresh(gone)
+    assert gone.is_active is False
+
+    # Deactivated tokens are no longer loaded
+    android.sent.clear()
+    result = await dispatcher.dispatch([users[3].id], notification)
+    assert (result.sent, result.deactivated) == (1, 0)
+    assert [token for token, _ in android.sent] == ["android-3"]
+
+
+class FlakyPushProvider(FakePushProvider):
+    """Fails the first `failures` sends of each token."""
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+        self.attempts = {}
+
+    async def send(self, token, notification):
+        self.attempts[token] = self.attempts.get(token, 0) + 1
+        if self.attempts[token] <= self.failures:
+            return push.FAILED
+        return await super().send(token, notification)
+
+
+@pytest.mark.asyncio
+async def test_dispatch_retries_failed_sends(async_session_factory, db_session, test_user):
+    """Test failed sends are retried a bounded number of times"""
+    _add_token(db_session, test_user, "android-token")
+    notification = PushNotification(title="Hello", body="World")
+
+    flaky = FlakyPushProvider(failures=2)
+    dispatcher = PushDispatcher(async_session_factory, {"android": flaky}, max_retries=2, retry_backoff=0)
+    result = await dispatcher.dispatch([test_user.id], notification)
+    assert (result.sent, result.failed) == (1, 0)
+    assert flaky.attempts == {"android-token": 3}
+
+    down = FlakyPushProvider(failures=10)
+    dispatcher = PushDispatcher(async_session_factory, {"android": down}, max_retries=2, retry_backoff=0)
+    result = await dispatcher.dispatch([test_user.id], notification)
+    assert (result.sent, result.failed) == (0, 1)
+    assert down.attempts == {"android-token": 3}
+
+
+@pytest.mark.asyncio
+async def test_shared_device_gets_equal_notifications_once(async_session_factory, db_session, test_user, test_user2):
+    """Test a device registered by two users gets one copy of equal notifications queued for each"""
+    _add_token(db_session, test_user, "shared-token")
+    _add_token(db_session, test_user2, "shared-token")
+    provider = FakePushProvider()
+    dispatcher = PushDispatcher(async_session_factory, {"android": provider})
+
+    await dispatcher.start()
+    try:
+        # Separate but equal notifications, queued together
+        assert dispatcher.submit([test_user.id], PushNotification(title="Hi", body="b", data={"k": "v"}))
+        assert dispatcher.submit([test_user2.id], PushNotification(title="Hi", body="b", data={"k": "v"}))
+        assert dispatcher.submit([test_user2.id], PushNotification(title="Hi", body="other"))
+    finally:
+        await dispatcher.stop()
+
+    assert sorted(notification.body for _, notification in provider.sent) == ["b", "other"]
+
+
+@pytest.mark.asyncio
+async def test_budget_alert_queues_push(async_session_factory, db_session, test_user, monkeypatch):
+    """Test budget alerts being queued and delivered by the background dispatcher"""
+    crud_user.update_user(db_session, test_user.id, UserUpdate(limit_amount=Decimal("100.00")))
+    _add_token(db_session, test_user, "android-token")
+    provider = FakePushProvider()
+    dispatcher = PushDispatcher(async_session_factory, {"android": provider})
+    monkeypatch.setattr(push, "push_dispatcher", dispatcher)
+
+    assert dispatcher.submit([test_user.id], PushNotification(title="t", body="b")) is False  # Not started
+    await dispatcher.start()
+    budget_alerts.register(push.push_budget_alert)
+    try:
+        async with async_session_factory() as db:
+            await aio_transaction.create_transaction(
+                db,
+                TransactionCreate(
+                    amount=Decimal("100.00"),
+                    type="expense",
+                    name="Rent",
+                    date=datetime.now(timezone.utc),
+                ),
+                test_user.id,
+            )
+    finally:
+        budget_alerts.unregister(push.push_budget_alert)
+        await dispatcher.stop()  # Delivers the queued jobs
+
+    assert [notification.data["threshold"] for _, notification in provider.sent] == ["80", "100"]
+    assert {token for token, _ in provider.sent} == {"android-token"}
+    assert provider.sent[-1][1].title == "Monthly budget reached"
+
+
+@pytest.mark.asyncio
+async def test_fcm_and_apns_providers():
+    """Test the provider requests and how their errors map to outcomes"""
+    rsa_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    ec_key = ec.generate_private_key(ec.SECP256R1())
+    requests = []
+
+    def fcm_handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path == "/token":
+            assert b"jwt-bearer" in request.content
+            return httpx.Response(200, json={"access_token": "access", "expires_in": 3600})
+        assert request.url.path == "/v1/projects/demo/messages:send"
+        assert request.headers["authorization"] == "Bearer access"
+        message = json.loads(request.content)["message"]
+        if message["token"] == "gone":
+            return httpx.Response(
+                404, json={"error": {"status": "NOT_FOUND", "details": [{"errorCode": "UNREGISTERED"}]}}
+            )
+        if message["token"] == "busy":
+            return httpx.Response(503)
+        assert message["notification"] == {"title": "Hi", "body": "There"}
+        return httpx.Response(200, json={"name": "projects/demo/messages/1"})
+
+    fcm = FCMProvider(
+        "",
+        {
+            "project_id": "demo",
+            "client_email": "push@demo.iam.gserviceaccount.com",
+            "private_key": _pem(rsa_key),
+            "token_uri": "https://oauth2.example.com/token",
+        },
+        client=httpx.AsyncClient(transport=httpx.MockTransport(fcm_handler)),
+    )
+    notification = PushNotification(title="Hi", body="There", data={"kind": "test"})
+    assert [await fcm.send(token, notification) for token in ("ok", "gone", "busy", "ok")] == [
+        push.SENT, push.INVALID, push.FAILED, push.SENT,
+    ]
+    assert sum(request.url.path == "/token" for request in requests) == 1  # Access token reused
+    await fcm.aclose()
+
+    def apns_handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.host == "api.sandbox.push.apple.com"
+        assert request.headers["apns-topic"] == "com.example.finance"
+        provider_token = request.headers["authorization"].split(" ", 1)[1]
+        assert jwt.get_unverified_header(provider_token)["kid"] == "KEY123"
+        assert json.loads(request.content)["aps"]["alert"]["title"] == "Hi"
+        token = request.url.path.rsplit("/", 1)[1]
+        if token == "gone":
+            return httpx.Response(410, json={"reason": "Unregistered"})
+        if token == "bad":
+            return httpx.Response(400, json={"reason": "BadDeviceToken"})
+        if token == "large":
+            return httpx.Response(413, json={"reason": "PayloadTooLarge"})
+        return httpx.Response(200)
+
+    apns = APNsProvider(
+        "TEAM123",
+        "KEY123",
+        _pem(ec_key),
+        "com.example.finance",
+        use_sandbox=True,
+        client=httpx.AsyncClient(transport=httpx.MockTransport(apns_handler)),
+    )
+    assert [await apns.send(token, notification) for token in ("ok", "gone", "bad", "large")] == [
+        push.SENT, push.INVALID, push.INVALID, push.FAILED,
+    ]
+    await apns.aclose()
+
+
+def test_budget_alert_notification():
+    """Test the push text for budget alerts"""
+    alert = BudgetAlert(
+        user_id="00000000-0000-0000-0000-000000000001",
+        month=date(2024, 5, 1),
+        threshold=80,
+        spent=Decimal("850.00"),
+        limit_amount=Decimal("1000.00"),
+    )
+    notification = push.get_budget_alert_notification(alert)
+    assert notification.title == "80% of your monthly budget used"
+    assert notification.data == {"type": "budget_alert", "month": "2024-05-01", "threshold": "80"}
@@ -0,0 +1,120 @@
+"""
+Tests for login and registration throttling.
+"""
+import pytest
+from fastapi import status
+
+from app.core.config import settings
+from app.core.rate_limit import MemoryRateLimitBackend, RateLimit, RedisRateLimitBackend, parse_rate_limit
+
+
+def test_parse_rate_limit():
+    """Test parsing '<attempts>/<unit>' limits"""
+    assert parse_rate_limit("20/minute") == RateLimit(20, 60)
+    assert parse_rate_limit("5 / hours") == RateLimit(5, 3600)
+    assert parse_rate_limit("") is None
+    assert parse_rate_limit("0") is None
+    with pytest.raises(ValueError):
+        parse_rate_limit("twenty per minute")
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_token_bucket():
+    """Test a bucket allows bursts up to capacity and refills over time"""
+    backend = MemoryRateLimitBackend()
+    limit = RateLimit(2, 60)
+
+    assert await backend.hit("key", limit, now=0) == 0
+    assert await backend.hit("key", limit, now=0) == 0
+    assert await backend.hit("key", limit, now=0) == pytest.approx(30)
+    # Other keys have their own bucket
+    assert await backend.hit("other", limit, now=0) == 0
+
+    # One token back after 30s
+    assert await backend.hit("key", limit, now=30) == 0
+    assert await backend.hit("key", limit, now=30) > 0
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_awaits_script():
+    """Test the Redis backend runs its script through an asyncio client"""
+    calls = []
+
+    class FakeAsyncRedis:
+        def register_script(self, script):
+            async def run(keys, args):
+                calls.append((keys, args))
+                return b"1.5"
+            return run
+
+    backend = RedisRateLimitBackend(FakeAsyncRedis(), prefix="rl:")
+    assert await backend.hit("login:ip:1.2.3.4", RateLimit(2, 60)) == 1.5
+    assert calls == [(["rl:login:ip:1.2.3.4"], [2, 2 / 60, 1])]
+
+
+def test_login_throttled_per_username(client, test_user, monkeypatch):
+    """Test over-budget logins are rejected before the password is checked"""
+    from app.crud.aio import user as crud_user
+
+    calls = []
+    original = crud_user.authenticate_user
+
+    async def counting_authenticate(*args, **kwargs):
+        calls.append(1)
+        return await original(*args, **kwargs)
+
+    monkeypatch.setattr(crud_user, "authenticate_user", counting_authenticate)
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_PER_USERNAME", "2/minute")
+
+    for _ in range(2):
+        response = client.post("/api/v1/auth/login", data={"username": "testuser", "password": "wrong"})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = client.post("/api/v1/auth/login", data={"username": "TestUser", "password": "testpassword123"})
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response.headers["Retry-After"]) >= 1
+    assert len(calls) == 2
+
+    # Other usernames keep their own budget
+    response = client.post("/api/v1/auth/login", data={"username": "someoneelse", "password": "wrong"})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_login_throttled_per_ip(client, test_user, monkeypatch):
+    """Test one client can't spray many usernames"""
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_PER_IP", "3/minute")
+
+    for index in range(3):
+        response = client.post("/api/v1/auth/login", data={"username": f"user{index}", "password": "wrong"})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = client.post("/api/v1/auth/login", data={"username": "testuser", "password": "testpassword123"})
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+def test_registration_throttled_per_ip(client, monkeypatch):
+    """Test registration attempts are limited per IP"""
+    monkeypatch.setattr(settings, "REGISTER_RATE_LIMIT_PER_IP", "1/hour")
+
+    payload = {"email": "new@example.com", "username": "newuser", "password": "password123"}
+    response = client.post("/api/v1/users/", json=payload)
+    assert response.status_code == status.HTTP_201_CREATED
+
+    payload = {"email": "new2@example.com", "username": "newuser2", "password": "password123"}
+    response = client.post("/api/v1/users/", json=payload)
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+def test_unknown_user_checked_against_cached_dummy_hash(client, monkeypatch):
+    """Test unknown usernames cost one verification on a hash computed once"""
+    from app.core import security
+
+    hashes = []
+    original_hash = security.pwd_context.hash
+    monkeypatch.setattr(security, "_dummy_password_hash", None)
+    monkeypatch.setattr(security.pwd_context, "hash", lambda secret: hashes.append(1) or original_hash(secret))
+
+    for _ in range(2):
+        response = client.post("/api/v1/auth/login", data={"username": "ghost", "password": "wrong"})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert len(hashes) == 1
@@ -0,0 +1,40 @@
+"""
+Tests for the JSON response encoding.
+"""
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+from fastapi.datastructures import DefaultPlaceholder
+
+from app.core.responses import FastJSONResponse, fastapi_serializes_to_json, get_default_response_class
+from app.main import app
+from app.schemas.category import Category
+
+
+def test_fast_json_response_matches_pydantic_output():
+    """Test orjson renders Decimal, UUID and aware datetimes like the schemas do"""
+    category = Category(
+        id=uuid4(),
+        name="Food",
+        type="expense",
+        created_at=datetime(2024, 5, 1, 8, 30, 15, 120000, tzinfo=timezone.utc),
+    )
+    content = {"category": category.model_dump(), "amount": Decimal("1234.50")}
+
+    body = FastJSONResponse(content).body
+    assert json.loads(body) == {
+        "category": json.loads(category.model_dump_json()),
+        "amount": "1234.50",
+    }
+    assert b'"2024-05-01T08:30:15.120000Z"' in body
+
+
+def test_response_model_routes_keep_pydantic_fast_path():
+    """Test no explicit response class disables FastAPI's direct JSON serialization"""
+    if not fastapi_serializes_to_json():
+        assert get_default_response_class() is FastJSONResponse
+        return
+
+    assert isinstance(app.router.default_response_class, DefaultPlaceholder)
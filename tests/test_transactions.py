@@ -3,7 +3,7 @@ Tests for transaction endpoints including cursor pagination.
 """
 import pytest
 from fastapi import status
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 from uuid import UUID
 
@@ -16,6 +16,7 @@ def test_create_transaction(client, auth_headers, test_category):
         json={
             "amount": "150.50",
             "type": "expense",
+            "name": "Lunch",
             "description": "Test transaction",
             "date": "2024-01-15T12:00:00Z",
             "category_id": str(test_category.id)
@@ -89,6 +90,80 @@ def test_get_transactions_cursor_pagination_next_page(client, auth_headers, test
     assert len(first_page_ids.intersection(second_page_ids)) == 0
 
 
+def test_get_transactions_cursor_pagination_backdated(client, auth_headers, db_session, test_user):
+    """Test cursor pagination stays consistent when dates don't follow id order"""
+    from app.models import Transaction
+
+    # Inserted newest-id-last, but dated out of order (with a tie on the same date)
+    dates = [
+        datetime(2024, 3, 1, tzinfo=timezone.utc),
+        datetime(2024, 1, 1, tzinfo=timezone.utc),
+        datetime(2024, 2, 1, tzinfo=timezone.utc),
+        datetime(2024, 2, 1, tzinfo=timezone.utc),
+        datetime(2023, 12, 1, tzinfo=timezone.utc),
+        datetime(2024, 2, 1, tzinfo=timezone.utc),
+        datetime(2024, 1, 15, tzinfo=timezone.utc),
+    ]
+    transactions = []
+    for i, tx_date in enumerate(dates):
+        transaction = Transaction(
+            amount=Decimal("10.00"),
+            type="expense",
+            name=f"Backdated {i}",
+            date=tx_date,
+            user_id=test_user.id,
+        )
+        db_session.add(transaction)
+        db_session.flush()
+        transactions.append(transaction)
+    db_session.commit()
+
+    expected = [
+        str(tx.id)
+        for tx in sorted(
+            transactions,
+            key=lambda tx: (tx.date.replace(tzinfo=None), tx.id),
+            reverse=True,
+        )
+    ]
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/transactions/", headers=auth_headers, params=params)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        seen.extend(item["id"] for item in data["items"])
+        if not data["has_next"]:
+            assert data["next_cursor"] is None
+            break
+        cursor = data["next_cursor"]
+
+    assert seen == expected
+
+
+def test_get_transactions_tampered_cursor(client, auth_headers, test_transactions):
+    """Test that a modified or foreign cursor is rejected"""
+    response = client.get(
+        "/api/v1/transactions/",
+        headers=auth_headers,
+        params={"limit": 5}
+    )
+    next_cursor = response.json()["next_cursor"]
+    payload, signature = next_cursor.split(".")
+
+    for bad_cursor in (f"{payload}.{signature[::-1]}", "not-a-cursor", str(test_transactions[0].id)):
+        response = client.get(
+            "/api/v1/transactions/",
+            headers=auth_headers,
+            params={"limit": 5, "cursor": bad_cursor}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 def test_get_transactions_with_date_filter(client, auth_headers, test_transactions):
     """Test transactions with date filter"""
     start_dt = datetime(2024, 1, 15, tzinfo=timezone.utc)
@@ -117,6 +192,40 @@ def test_get_transactions_with_date_filter(client, auth_headers, test_transactio
         assert start_of_day <= item_date <= end_of_day
 
 
+def test_date_filters_use_the_users_days(client, auth_headers, db_session, test_user):
+    """Test list and export date filters cover the user's local days, like the summaries"""
+    import json
+    from app.crud import transaction as crud_transaction
+    from app.crud import user as crud_user
+    from app.schemas.transaction import TransactionCreate
+    from app.schemas.user import UserUpdate
+
+    crud_user.update_user(db_session, test_user.id, UserUpdate(timezone="Asia/Ho_Chi_Minh"))
+    # 2024-03-02 03:00 in Ho Chi Minh City (UTC+7)
+    late = crud_transaction.create_transaction(
+        db_session,
+        TransactionCreate(
+            amount=Decimal("5.00"),
+            type="expense",
+            name="Late",
+            date=datetime(2024, 3, 1, 20, 0, tzinfo=timezone.utc),
+        ),
+        test_user.id,
+    )
+
+    for day, expected in (("2024-03-01", []), ("2024-03-02", [str(late.id)])):
+        params = {"start_date": day, "end_date": day}
+        response = client.get("/api/v1/transactions/", headers=auth_headers, params=params)
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["id"] for item in response.json()["items"]] == expected
+
+        response = client.get(
+            "/api/v1/transactions/export", headers=auth_headers, params={**params, "format": "ndjson"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [json.loads(line)["id"] for line in response.text.splitlines() if line] == expected
+
+
 def test_get_transactions_with_type_filter(client, auth_headers, test_transactions):
     """Test transactions with type filter"""
     response = client.get(
@@ -192,6 +301,38 @@ def test_get_transactions_cursor_with_filters(client, auth_headers, test_transac
                 assert item["category_id"] == str(test_category.id)
 
 
+def test_get_transactions_single_projected_query(
+    client, auth_headers, test_transactions, test_category, sql_statements
+):
+    """Test the list loads transactions with one SELECT and categories from the catalog"""
+    category_id, category_name = str(test_category.id), test_category.name
+    user_id = str(test_transactions[0].user_id)
+    # First page loads the category catalog
+    client.get("/api/v1/transactions/", headers=auth_headers, params={"limit": 10})
+    sql_statements.clear()
+    response = client.get(
+        "/api/v1/transactions/", headers=auth_headers, params={"limit": 10, "type": "expense"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    items = response.json()["items"]
+
+    with_category = [item for item in items if item["category_id"]]
+    assert with_category
+    for item in with_category:
+        assert item["category"]["id"] == category_id
+        assert item["category"]["name"] == category_name
+    assert all(item["category"] is None for item in items if not item["category_id"])
+    assert all(item["user_id"] == user_id for item in items)
+
+    selects = [
+        statement for statement in sql_statements
+        if statement.lstrip().upper().startswith("SELECT") and "FROM transactions" in statement
+        and "LIMIT" in statement.upper()
+    ]
+    assert len(selects) == 1
+    assert not [statement for statement in sql_statements if "FROM categories" in statement]
+
+
 def test_get_transaction_by_id(client, auth_headers, test_transactions):
     """Test getting a specific transaction"""
     transaction_id = test_transactions[0].id
@@ -261,3 +402,763 @@ def test_delete_transaction(client, auth_headers, test_transactions):
     )
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
+
+def test_get_transaction_period_summary(client, auth_headers, db_session, test_user, test_category):
+    """Test timeframe summary totals and category breakdown"""
+    from app.crud import transaction as crud_transaction
+    from app.schemas.transaction import TransactionCreate
+
+    now = datetime.now(timezone.utc)
+    for amount, tx_type, category_id in [
+        ("30.00", "expense", test_category.id),
+        ("20.00", "expense", test_category.id),
+        ("25.00", "expense", None),
+        ("125.00", "income", None),
+    ]:
+        crud_transaction.create_transaction(
+            db_session,
+            TransactionCreate(
+                amount=Decimal(amount),
+                type=tx_type,
+                name="Summary item",
+                date=now,
+                category_id=category_id,
+            ),
+            user_id=test_user.id,
+        )
+
+    response = client.get(
+        "/api/v1/transactions/summary/timeframes/today",
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert Decimal(data["total_income"]) == Decimal("125.00")
+    assert Decimal(data["total_expense"]) == Decimal("75.00")
+    assert Decimal(data["net"]) == Decimal("50.00")
+
+    categories = data["categories"]
+    assert [(c["type"], Decimal(c["total"])) for c in categories] == [
+        ("expense", Decimal("50.00")),
+        ("expense", Decimal("25.00")),
+        ("income", Decimal("125.00")),
+    ]
+    assert categories[0]["category_name"] == "Food"
+    assert categories[0]["color"] == "#FF5733"
+    assert sum(c["percentage"] for c in categories) == 100
+
+
+def test_get_transaction_period_summary_invalid_timeframe(client, auth_headers):
+    """Test unknown timeframe keyword"""
+    response = client.get(
+        "/api/v1/transactions/summary/timeframes/last_decade",
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_get_transaction_series(client, auth_headers, db_session, test_user, test_category):
+    """Test gap-filled series per month, week and day"""
+    from app.crud import transaction as crud_transaction
+    from app.schemas.transaction import TransactionCreate
+
+    # Same data as the test_transactions fixture, written through the CRUD so rollups exist
+    base_date = datetime(2024, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
+    for i in range(10):
+        crud_transaction.create_transaction(
+            db_session,
+            TransactionCreate(
+                amount=Decimal(f"{100 + i * 10}.00"),
+                type="expense" if i % 2 == 0 else "income",
+                name=f"Transaction {i+1}",
+                date=base_date.replace(day=15 + i),
+                category_id=test_category.id if i % 2 == 0 else None,
+            ),
+            user_id=test_user.id,
+        )
+
+    def points(**params):
+        response = client.get("/api/v1/transactions/series", headers=auth_headers, params=params)
+        assert response.status_code == status.HTTP_200_OK
+        return [
+            (p["period_start"], Decimal(p["income"]), Decimal(p["expense"]), p["count"])
+            for p in response.json()["points"]
+        ]
+
+    assert points(granularity="month", start="2023-12-01", end="2024-02-29") == [
+        ("2023-12-01", Decimal("0"), Decimal("0"), 0),
+        ("2024-01-01", Decimal("750.00"), Decimal("700.00"), 10),
+        ("2024-02-01", Decimal("0"), Decimal("0"), 0),
+    ]
+    # Weeks start on Monday; the range ends mid-week
+    assert points(granularity="week", start="2024-01-17", end="2024-01-30") == [
+        ("2024-01-15", Decimal("280.00"), Decimal("420.00"), 5),
+        ("2024-01-22", Decimal("360.00"), Decimal("180.00"), 3),
+        ("2024-01-29", Decimal("0"), Decimal("0"), 0),
+    ]
+    assert points(
+        granularity="day", start="2024-01-15", end="2024-01-17", type="expense",
+        category_id=str(test_category.id),
+    ) == [
+        ("2024-01-15", Decimal("0"), Decimal("100.00"), 1),
+        ("2024-01-16", Decimal("0"), Decimal("0"), 0),
+        ("2024-01-17", Decimal("0"), Decimal("120.00"), 1),
+    ]
+
+    # Default range: the last 12 months up to today
+    response = client.get("/api/v1/transactions/series", headers=auth_headers, params={"granularity": "month"})
+    assert len(response.json()["points"]) == 12
+
+
+def test_get_transaction_series_invalid(client, auth_headers):
+    """Test series validation errors"""
+    url = "/api/v1/transactions/series"
+    response = client.get(url, headers=auth_headers, params={"granularity": "hour"})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    response = client.get(url, headers=auth_headers, params={"start": "2024-02-01", "end": "2024-01-01"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = client.get(url, headers=auth_headers, params={"start": "2000-01-01", "end": "2024-01-01"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_transactions_bucketed_in_user_timezone(client, auth_headers, db_session, test_user, test_category):
+    """Test rollups, series and grouping follow the user's timezone and week start"""
+    from app.crud import transaction as crud_transaction
+    from app.schemas.transaction import TransactionCreate
+
+    # 20:00 UTC on Monday 15 Jan is 03:00 on Tuesday 16 Jan in Vietnam (UTC+7)
+    tx_date = datetime(2024, 1, 15, 20, 0, 0, tzinfo=timezone.utc)
+    crud_transaction.create_transaction(
+        db_session,
+        TransactionCreate(amount=Decimal("50.00"), type="expense", name="Pho", date=tx_date),
+        user_id=test_user.id,
+    )
+
+    def days(**params):
+        response = client.get(
+            "/api/v1/transactions/series",
+            headers=auth_headers,
+            params={"start": "2024-01-14", "end": "2024-01-16", **params},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        return [point["period_start"] for point in response.json()["points"] if point["count"]]
+
+    assert days() == ["2024-01-15"]
+
+    url = f"/api/v1/users/{test_user.id}"
+    response = client.put(url, headers=auth_headers, json={"timezone": "Mars/Olympus_Mons"})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    # Changing timezone rebuilds the rollups on the new local days
+    response = client.put(url, headers=auth_headers, json={"timezone": "Asia/Ho_Chi_Minh", "week_start": 1})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["timezone"] == "Asia/Ho_Chi_Minh"
+    assert days() == ["2024-01-16"]
+    # Weeks start on Tuesday: the local day opens a new week
+    assert days(granularity="week") == ["2024-01-16"]
+
+    db_session.expire_all()
+    rows = crud_transaction.get_transactions_for_grouping(
+        db_session, test_user.id, timezone="Asia/Ho_Chi_Minh"
+    )
+    assert [day for _, day in rows] == [date(2024, 1, 16)]
+
+    # New writes land on local days too
+    crud_transaction.create_transaction(
+        db_session,
+        TransactionCreate(amount=Decimal("10.00"), type="expense", name="Tea", date=tx_date),
+        user_id=test_user.id,
+    )
+    response = client.get(
+        "/api/v1/transactions/series",
+        headers=auth_headers,
+        params={"start": "2024-01-16", "end": "2024-01-16"},
+    )
+    assert Decimal(response.json()["points"][0]["expense"]) == Decimal("60.00")
+
+
+def test_get_transaction_summary_totals(client, auth_headers, db_session, test_user, test_category):
+    """Test grouped summary totals with and without the nested breakdown"""
+    from app.crud import transaction as crud_transaction
+    from app.schemas.transaction import TransactionCreate
+
+    now = datetime.now(timezone.utc)
+    for amount, tx_date in [
+        ("40.00", now),
+        ("60.00", now),
+        ("999.00", now - timedelta(days=400)),  # Outside the current year
+    ]:
+        crud_transaction.create_transaction(
+            db_session,
+            TransactionCreate(
+                amount=Decimal(amount),
+                type="expense",
+                name="Grouped item",
+                date=tx_date,
+                category_id=test_category.id,
+            ),
+            user_id=test_user.id,
+        )
+
+    response = client.get("/api/v1/transactions/summary", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert Decimal(data["total"]) == Decimal("100.00")
+    assert data["lasted_update_at"] is not None
+    assert data["timeframes"] is None
+
+    response = client.get(
+        "/api/v1/transactions/summary",
+        headers=auth_headers,
+        params={"include_breakdown": True}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    detailed = response.json()
+    assert Decimal(detailed["total"]) == Decimal("100.00")
+    assert [group["label"] for group in detailed["timeframes"]] == ["today"]
+    assert len(detailed["timeframes"][0]["days"][0]["categories"][0]["transactions"]) == 2
+
+
+def test_transaction_writes_maintain_daily_rollups(client, auth_headers, db_session, test_user, test_category):
+    """Test create/update/delete keep the daily rollup table in sync"""
+    from app.models import Transaction, TransactionDailyRollup
+    from sqlalchemy import func
+
+    def assert_rollups_match_transactions():
+        expected = {
+            (day, tx_type): (Decimal(total), count)
+            for day, tx_type, total, count in db_session.query(
+                func.date(Transaction.date),
+                Transaction.type,
+                func.sum(Transaction.amount),
+                func.count(Transaction.id),
+            )
+            .filter(Transaction.user_id == test_user.id)
+            .group_by(func.date(Transaction.date), Transaction.type)
+        }
+        actual = {
+            (day.isoformat(), tx_type): (Decimal(total), count)
+            for day, tx_type, total, count in db_session.query(
+                TransactionDailyRollup.day,
+                TransactionDailyRollup.type,
+                func.sum(TransactionDailyRollup.sum),
+                func.sum(TransactionDailyRollup.count),
+            )
+            .filter(TransactionDailyRollup.user_id == test_user.id)
+            .group_by(TransactionDailyRollup.day, TransactionDailyRollup.type)
+        }
+        assert actual == expected
+
+    created = []
+    for amount, tx_date in [("10.00", "2024-02-01T08:00:00Z"), ("15.50", "2024-02-01T20:00:00Z"), ("7.25", "2024-02-02T09:00:00Z")]:
+        response = client.post(
+            "/api/v1/transactions/",
+            headers=auth_headers,
+            json={
+                "amount": amount,
+                "type": "expense",
+                "name": "Rollup item",
+                "date": tx_date,
+                "category_id": str(test_category.id),
+            }
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        created.append(response.json()["id"])
+    assert_rollups_match_transactions()
+
+    # Same day: amount-only change
+    client.put(f"/api/v1/transactions/{created[0]}", headers=auth_headers, json={"amount": "12.00"})
+    # Moves to a different day and type
+    client.put(
+        f"/api/v1/transactions/{created[2]}",
+        headers=auth_headers,
+        json={"date": "2024-02-05T09:00:00Z", "type": "income"},
+    )
+    db_session.expire_all()
+    assert_rollups_match_transactions()
+
+    client.delete(f"/api/v1/transactions/{created[1]}", headers=auth_headers)
+    db_session.expire_all()
+    assert_rollups_match_transactions()
+    assert db_session.query(TransactionDailyRollup).filter(TransactionDailyRollup.count <= 0).count() == 0
+
+
+def test_concurrent_writes_apply_rollup_deltas_once(db_session, test_user, test_category, monkeypatch):
+    """Test a transaction deleted by another request after it was read is not counted again"""
+    from app.crud import transaction as crud_transaction
+    from app.models import TransactionDailyRollup
+    from app.schemas.transaction import TransactionCreate, TransactionUpdate
+    from sqlalchemy import func
+    from sqlalchemy.orm import sessionmaker
+
+    other_session = sessionmaker(bind=db_session.get_bind())
+    ids = [
+        crud_transaction.create_transaction(
+            db_session,
+            TransactionCreate(amount=Decimal("10.00"), type="expense", name="Item", date=datetime(2024, 2, 1, 8, tzinfo=timezone.utc)),
+            test_user.id,
+        ).id
+        for _ in range(2)
+    ]
+
+    # The other request deletes the row between our read and our write
+    get_transaction = crud_transaction.get_transaction
+
+    def get_then_delete_elsewhere(db, transaction_id, user_id, **kwargs):
+        row = get_transaction(db, transaction_id, user_id, **kwargs)
+        if db is db_session:
+            with other_session() as other:
+                assert crud_transaction.delete_transaction(other, transaction_id, user_id)
+        return row
+
+    monkeypatch.setattr(crud_transaction, "get_transaction", get_then_delete_elsewhere)
+    assert crud_transaction.delete_transaction(db_session, ids[0], test_user.id) is False
+    assert crud_transaction.update_transaction(
+        db_session, ids[1], TransactionUpdate(amount=Decimal("99.00")), test_user.id
+    ) is None
+
+    db_session.expire_all()
+    total, count = db_session.query(
+        func.sum(TransactionDailyRollup.sum), func.sum(TransactionDailyRollup.count)
+    ).filter(TransactionDailyRollup.user_id == test_user.id).one()
+    assert (Decimal(total or 0), int(count or 0)) == (Decimal("0"), 0)
+
+
+def test_monthly_budget_tracking(client, auth_headers, test_user, test_category):
+    """Test the monthly spend counter, budget endpoint and threshold alerts"""
+    from app.core.budget import budget_alerts
+
+    alerts = []
+    budget_alerts.register(alerts.append)
+    try:
+        response = client.put(
+            f"/api/v1/users/{test_user.id}", headers=auth_headers, json={"limit_amount": "1000.00"}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        now = datetime.now(timezone.utc).isoformat()
+        last_year = (datetime.now(timezone.utc) - timedelta(days=400)).isoformat()
+
+        def create(amount, tx_type="expense", tx_date=now):
+            response = client.post(
+                "/api/v1/transactions/",
+                headers=auth_headers,
+                json={"amount": amount, "type": tx_type, "name": "Budget item", "date": tx_date},
+            )
+            assert response.status_code == status.HTTP_201_CREATED
+            return response.json()["id"]
+
+        def budget():
+            response = client.get("/api/v1/users/me/budget", headers=auth_headers)
+            assert response.status_code == status.HTTP_200_OK
+            return response.json()
+
+        create("700.00")
+        create("5000.00", tx_type="income")
+        create("900.00", tx_date=last_year)  # Another month
+        data = budget()
+        assert (Decimal(data["spent"]), data["count"], data["percent_used"]) == (Decimal("700.00"), 1, 70.0)
+        assert Decimal(data["remaining"]) == Decimal("300.00")
+        assert data["thresholds_reached"] == []
+        assert alerts == []
+
+        crossing = create("150.00")
+        assert [(alert.threshold, alert.spent) for alert in alerts] == [(80, Decimal("850.00"))]
+
+        response = client.post(
+            "/api/v1/transactions/batch",
+            headers=auth_headers,
+            json={"operations": [
+                {"op": "create", "data": {"amount": "200.00", "type": "expense", "name": "Over", "date": now}},
+            ]},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert [alert.threshold for alert in alerts] == [80, 100]
+        assert budget()["thresholds_reached"] == [80, 100]
+
+        # Dropping back below a threshold and crossing it again alerts again
+        client.delete(f"/api/v1/transactions/{crossing}", headers=auth_headers)
+        assert Decimal(budget()["spent"]) == Decimal("900.00")
+        create("100.00")
+        assert [alert.threshold for alert in alerts] == [80, 100, 100]
+
+        response = client.get("/api/v1/transactions/summary/timeframes/this_month", headers=auth_headers)
+        assert Decimal(response.json()["budget"]["spent"]) == Decimal("1000.00")
+        response = client.get("/api/v1/transactions/summary", headers=auth_headers)
+        assert response.json()["budget"]["thresholds_reached"] == [80, 100]
+    finally:
+        budget_alerts.unregister(alerts.append)
+
+
+def test_conditional_get_transactions_and_summaries(
+    client, auth_headers, test_category, monkeypatch, sql_statements
+):
+    """Test ETag / If-None-Match handling on list and summary endpoints"""
+    from app.crud import transaction as crud_transaction
+
+    def create(amount):
+        response = client.post(
+            "/api/v1/transactions/",
+            headers=auth_headers,
+            json={
+                "amount": amount,
+                "type": "expense",
+                "name": "ETag item",
+                "date": datetime.now(timezone.utc).isoformat(),
+                "category_id": str(test_category.id),
+            }
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+    create("10.00")
+    urls = [
+        "/api/v1/transactions/?limit=5",
+        "/api/v1/transactions/summary",
+        "/api/v1/transactions/summary/timeframes/this_month",
+    ]
+    etags = {}
+    for url in urls:
+        response = client.get(url, headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["etag"].startswith('W/"')
+        etags[url] = response.headers["etag"]
+
+    # Unchanged data: 304 without running the main queries
+    def fail(*args, **kwargs):
+        raise AssertionError("main query should not run for a matching ETag")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(crud_transaction, "get_transaction_rows_cursor", fail)
+        patched.setattr(crud_transaction, "get_grouped_transactions", fail)
+        patched.setattr(crud_transaction, "get_grouped_breakdown_rows", fail)
+        patched.setattr(crud_transaction, "get_transaction_period_summary", fail)
+        patched.setattr(crud_transaction, "get_period_summary_rows", fail)
+        sql_statements.clear()
+        for url in urls:
+            response = client.get(url, headers={**auth_headers, "If-None-Match": etags[url]})
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
+            assert response.headers["etag"] == etags[url]
+            assert response.content == b""
+    # The validator is the user's data version row, not an aggregate of the rollups
+    assert [statement for statement in sql_statements if "user_data_versions" in statement]
+    assert not [statement for statement in sql_statements if "transaction_daily_rollups" in statement]
+
+    # A write changes the data version, so the old ETags no longer match
+    create("5.00")
+    for url in urls:
+        response = client.get(url, headers={**auth_headers, "If-None-Match": etags[url]})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["etag"] != etags[url]
+
+
+def test_export_transactions_csv(client, auth_headers, test_transactions):
+    """Test streaming CSV export with filters"""
+    import csv
+    import io
+
+    response = client.get(
+        "/api/v1/transactions/export",
+        headers=auth_headers,
+        params={"format": "csv", "type": "expense"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "transactions.csv" in response.headers["content-disposition"]
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    expected = [tx for tx in test_transactions if tx.type == "expense"]
+    assert len(rows) == len(expected)
+    assert {row["id"] for row in rows} == {str(tx.id) for tx in expected}
+    assert all(row["category_name"] == "Food" for row in rows)
+    assert rows[0]["date"] > rows[-1]["date"]  # Newest first
+
+
+def test_export_transactions_ndjson(client, auth_headers, test_transactions, auth_headers_user2):
+    """Test streaming NDJSON export only contains the current user's rows"""
+    import json
+
+    response = client.get(
+        "/api/v1/transactions/export",
+        headers=auth_headers,
+        params={"format": "ndjson"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == len(test_transactions)
+    assert {"id", "amount", "date", "category_name"} <= set(lines[0])
+
+    response = client.get(
+        "/api/v1/transactions/export",
+        headers=auth_headers_user2,
+        params={"format": "ndjson"}
+    )
+    assert response.text == ""
+
+    response = client.get(
+        "/api/v1/transactions/export",
+        headers=auth_headers,
+        params={"format": "xml"}
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_import_transactions_json(
+    client, auth_headers, db_session, test_category, auth_headers_user2, sql_statements
+):
+    """Test bulk JSON import with per-row errors and batched inserts"""
+    from sqlalchemy import func
+    from app.models import Transaction, TransactionDailyRollup
+
+    payload = [
+        {"amount": "10.00", "type": "expense", "name": "Coffee", "date": "2024-03-01T08:00:00Z",
+         "category_id": str(test_category.id)},
+        {"type": "expense", "name": "Missing amount", "date": "2024-03-01T08:00:00Z"},
+        {"amount": "20.00", "type": "income", "name": "Refund", "date": "2024-03-02T08:00:00Z"},
+        {"amount": "5.50", "type": "expense", "name": "Snack", "date": "2024-03-02T09:00:00Z",
+         "category_id": "00000000-0000-0000-0000-000000000000"},
+        {"amount": "30.00", "type": "expense", "name": "Dinner", "date": "2024-03-03T19:00:00Z",
+         "category_id": str(test_category.id)},
+    ]
+
+    sql_statements.clear()
+    response = client.post("/api/v1/transactions/import", headers=auth_headers, json=payload)
+    inserts = [
+        statement for statement in sql_statements
+        if statement.lstrip().upper().startswith("INSERT INTO TRANSACTIONS")
+    ]
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["received"] == 5
+    assert data["imported"] == 3
+    assert data["failed"] == 2
+    assert [error["row"] for error in data["errors"]] == [2, 4]
+    assert "amount" in data["errors"][0]["errors"][0]
+    assert len(inserts) == 1  # One multi-row INSERT for the whole chunk
+
+    assert db_session.query(Transaction).filter(Transaction.name == "Dinner").count() == 1
+
+    # Rollups were updated, so summaries include the imported rows
+    expense_total = db_session.query(func.sum(TransactionDailyRollup.sum)).filter(
+        TransactionDailyRollup.type == "expense"
+    ).scalar()
+    assert Decimal(str(expense_total)) == Decimal("40.00")
+
+    # Another user's category is rejected like an unknown one
+    response = client.post(
+        "/api/v1/transactions/import",
+        headers=auth_headers_user2,
+        json=[payload[0]],
+    )
+    assert response.json()["imported"] == 0
+    assert response.json()["errors"][0]["errors"] == ["category_id: Category not found"]
+
+
+def test_import_transactions_csv(client, auth_headers, db_session, test_user):
+    """Test bulk CSV import, raw body and multipart upload"""
+    from app.models import Transaction, TransactionDailyRollup
+    from sqlalchemy import func
+
+    csv_data = (
+        "amount,type,name,description,date,category_id\n"
+        "12.50,expense,Bus,,2024-04-01T07:00:00Z,\n"
+        "not-a-number,expense,Broken,,2024-04-01T07:00:00Z,\n"
+        "100.00,income,Salary,April,2024-04-02T07:00:00Z,\n"
+    )
+    response = client.post(
+        "/api/v1/transactions/import",
+        headers={**auth_headers, "Content-Type": "text/csv"},
+        content=csv_data,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["imported"] == 2
+    assert [error["row"] for error in data["errors"]] == [2]
+
+    response = client.post(
+        "/api/v1/transactions/import",
+        headers=auth_headers,
+        files={"file": ("history.csv", csv_data, "text/csv")},
+    )
+    assert response.json()["imported"] == 2
+
+    assert db_session.query(Transaction).filter(Transaction.user_id == test_user.id).count() == 4
+    rollup_count = db_session.query(func.sum(TransactionDailyRollup.count)).filter(
+        TransactionDailyRollup.user_id == test_user.id
+    ).scalar()
+    assert rollup_count == 4
+
+    response = client.post(
+        "/api/v1/transactions/import",
+        headers=auth_headers,
+        json={"amount": "1.00"},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_batch_transactions(client, auth_headers, db_session, test_user, test_category, sql_statements):
+    """Test batch create/update/delete in one request"""
+    from sqlalchemy import func
+    from app.crud import transaction as crud_transaction
+    from app.models import Transaction, TransactionDailyRollup
+    from app.schemas.transaction import TransactionCreate
+
+    base_date = datetime(2024, 5, 10, 12, 0, 0, tzinfo=timezone.utc)
+    existing = [
+        crud_transaction.create_transaction(
+            db_session,
+            TransactionCreate(
+                amount=Decimal("10.00"),
+                type="expense",
+                name=f"Queued {i}",
+                date=base_date + timedelta(days=i),
+            ),
+            test_user.id,
+        )
+        for i in range(3)
+    ]
+    first, second, third = (str(transaction.id) for transaction in existing)
+    unknown = "0190a000-0000-7000-8000-000000000000"
+
+    operations = [
+        {"op": "create", "data": {"amount": "7.50", "type": "expense", "name": "Offline lunch",
+                                  "date": "2024-05-12T12:00:00Z", "category_id": str(test_category.id)}},
+        {"op": "update", "id": first, "data": {"amount": "15.00"}},
+        {"op": "update", "id": second, "data": {"category_id": str(test_category.id)}},
+        {"op": "update", "id": third, "data": {"category_id": str(test_category.id)}},
+        {"op": "update", "id": first, "data": {"name": "Renamed"}},
+        {"op": "delete", "id": third},
+        {"op": "update", "id": third, "data": {"amount": "1.00"}},
+        {"op": "delete", "id": unknown},
+    ]
+
+    sql_statements.clear()
+    response = client.post(
+        "/api/v1/transactions/batch",
+        headers=auth_headers,
+        json={"operations": operations},
+    )
+    statements = [" ".join(statement.split()[:3]).upper() for statement in sql_statements]
+
+    assert response.status_code == status.HTTP_200_OK
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [
+        "created", "updated", "updated", "updated", "updated", "deleted", "not_found", "not_found"
+    ]
+    assert [result["index"] for result in results] == list(range(len(operations)))
+    created_id = results[0]["id"]
+
+    # Writes are set-based: one INSERT, one UPDATE per distinct change set, one DELETE
+    assert statements.count("INSERT INTO TRANSACTIONS") == 1
+    assert statements.count("UPDATE TRANSACTIONS SET") == 2
+    assert statements.count("DELETE FROM TRANSACTIONS") == 1
+
+    db_session.expire_all()
+    renamed = db_session.query(Transaction).filter(Transaction.id == UUID(first)).one()
+    assert renamed.amount == Decimal("15.00")
+    assert renamed.name == "Renamed"
+    moved = db_session.query(Transaction).filter(Transaction.id == UUID(second)).one()
+    assert moved.category_id == test_category.id
+    assert db_session.query(Transaction).filter(Transaction.id == UUID(third)).first() is None
+    assert db_session.query(Transaction).filter(Transaction.id == UUID(created_id)).one().name == "Offline lunch"
+
+    rollups = db_session.query(
+        func.sum(TransactionDailyRollup.sum), func.sum(TransactionDailyRollup.count)
+    ).filter(TransactionDailyRollup.user_id == test_user.id).one()
+    assert Decimal(str(rollups[0])) == Decimal("32.50")
+    assert rollups[1] == 3
+
+    # Different values for the same columns go out as one executemany UPDATE
+    response = client.post(
+        "/api/v1/transactions/batch",
+        headers=auth_headers,
+        json={"operations": [
+            {"op": "update", "id": first, "data": {"amount": "1.00"}},
+            {"op": "update", "id": second, "data": {"amount": "2.00"}},
+        ]},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    db_session.expire_all()
+    amounts = {
+        str(transaction.id): transaction.amount
+        for transaction in db_session.query(Transaction).filter(Transaction.user_id == test_user.id)
+    }
+    assert amounts[first] == Decimal("1.00")
+    assert amounts[second] == Decimal("2.00")
+
+
+def test_batch_skips_rows_deleted_mid_batch(db_session, test_user, monkeypatch):
+    """Test rows deleted by another request during a batch are not_found and not counted"""
+    from app.crud import transaction as crud_transaction
+    from app.models import TransactionDailyRollup
+    from app.schemas.transaction import (
+        TransactionBatchDelete,
+        TransactionBatchUpdate,
+        TransactionCreate,
+        TransactionUpdate,
+    )
+    from sqlalchemy import func
+    from sqlalchemy.orm import sessionmaker
+
+    other_session = sessionmaker(bind=db_session.get_bind())
+    kept, updated, deleted = [
+        crud_transaction.create_transaction(
+            db_session,
+            TransactionCreate(amount=Decimal("10.00"), type="expense", name="Item", date=datetime(2024, 2, 1, 8, tzinfo=timezone.utc)),
+            test_user.id,
+        ).id
+        for _ in range(3)
+    ]
+
+    # The other request commits after the batch has read its rows
+    update_transactions = crud_transaction._update_transactions
+
+    def delete_elsewhere_then_update(db, user_id, changes):
+        with other_session() as other:
+            assert crud_transaction.delete_transaction(other, updated, user_id)
+            assert crud_transaction.delete_transaction(other, deleted, user_id)
+        return update_transactions(db, user_id, changes)
+
+    monkeypatch.setattr(crud_transaction, "_update_transactions", delete_elsewhere_then_update)
+    results = crud_transaction.apply_transaction_batch(
+        db_session,
+        [
+            TransactionBatchUpdate(op="update", id=kept, data=TransactionUpdate(amount=Decimal("5.00"))),
+            TransactionBatchUpdate(op="update", id=updated, data=TransactionUpdate(amount=Decimal("7.00"))),
+            TransactionBatchDelete(op="delete", id=deleted),
+        ],
+        test_user.id,
+    )
+    assert [result.status for result in results] == ["updated", "not_found", "not_found"]
+
+    db_session.expire_all()
+    total, count = db_session.query(
+        func.sum(TransactionDailyRollup.sum), func.sum(TransactionDailyRollup.count)
+    ).filter(TransactionDailyRollup.user_id == test_user.id).one()
+    assert (Decimal(total), count) == (Decimal("5.00"), 1)
+
+
+def test_batch_transactions_invalid_category(client, auth_headers, db_session, test_user):
+    """Test that an invalid operation rejects the whole batch"""
+    from app.models import Transaction
+
+    response = client.post(
+        "/api/v1/transactions/batch",
+        headers=auth_headers,
+        json={"operations": [
+            {"op": "create", "data": {"amount": "5.00", "type": "expense", "name": "Ok",
+                                      "date": "2024-05-12T12:00:00Z"}},
+            {"op": "create", "data": {"amount": "5.00", "type": "expense", "name": "Bad",
+                                      "date": "2024-05-12T12:00:00Z",
+                                      "category_id": "0190a000-0000-7000-8000-000000000000"}},
+        ]},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert db_session.query(Transaction).filter(Transaction.user_id == test_user.id).count() == 0
+
+    response = client.post(
+        "/api/v1/transactions/batch",
+        headers=auth_headers,
+        json={"operations": [{"op": "update", "data": {"amount": "1.00"}}]},
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY